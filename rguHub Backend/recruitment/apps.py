@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class RecruitmentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recruitment'
+
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
+        from .search import register_recruitment_kind
+
+        register_recruitment_kind()
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def backfill_recruitments(apps, schema_editor):
+    Activity = apps.get_model('resources', 'Activity')
+    Recruitment = apps.get_model('recruitment', 'Recruitment')
+    rows = (
+        Activity(
+            kind='recruitment',
+            object_id=posting_id,
+            program_id=program_id,
+            title=f'{position} at {company_name}'[:512],
+            created_at=posted_on,
+        )
+        for posting_id, program_id, position, company_name, posted_on in Recruitment.objects.values_list(
+            'id', 'program_id', 'position', 'company_name', 'posted_on'
+        ).iterator()
+    )
+    Activity.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0001_initial'),
+        ('resources', '0013_activity'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_recruitments, reverse_code=migrations.RunPython.noop),
+    ]
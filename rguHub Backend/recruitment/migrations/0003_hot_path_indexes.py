@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0002_backfill_activity'),
+        ('resources', '0014_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recruitment',
+            index=models.Index(fields=['program', '-posted_on', '-id'], name='recruitment_program_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='recruitment',
+            index=models.Index(fields=['-posted_on', '-id'], name='recruitment_recent'),
+        ),
+    ]
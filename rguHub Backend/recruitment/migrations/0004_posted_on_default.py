@@ -0,0 +1,17 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recruitment',
+            name='posted_on',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='When the job was posted'),
+        ),
+    ]
@@ -15,6 +15,7 @@ Last Updated: 2025
 """
 
 from django.db import models
+from django.utils import timezone
 from resources.models import Program
 
 class Recruitment(models.Model):
@@ -47,6 +48,10 @@ class Recruitment(models.Model):
     - FT: Full-Time positions
     - PT: Part-Time positions  
     - IN: Internship opportunities
+
+    Indexes (in keyset pagination order, see RecruitmentCursorPagination):
+    - (program, -posted_on, -id) for `?program=`
+    - (-posted_on, -id) for the unfiltered list
     """
     JOB_TYPES = [
         ('FT', 'Full-Time'),
@@ -64,12 +69,17 @@ class Recruitment(models.Model):
     salary = models.CharField(max_length=100, blank=True, null=True, help_text="Salary information")
     deadline = models.DateField(help_text="Application deadline")
     apply_link = models.URLField(max_length=500, help_text="URL to apply for the position")   
-    posted_on = models.DateTimeField(auto_now_add=True, help_text="When the job was posted")
+    # A default rather than auto_now_add, so bulk loaders can set the date
+    posted_on = models.DateTimeField(default=timezone.now, editable=False, help_text="When the job was posted")
 
     class Meta:
         ordering = ["-posted_on"]
         verbose_name = "Job Posting"
         verbose_name_plural = "Job Postings"
+        indexes = [
+            models.Index(fields=["program", "-posted_on", "-id"], name="recruitment_program_recent"),
+            models.Index(fields=["-posted_on", "-id"], name="recruitment_recent"),
+        ]
 
     def __str__(self):
         return f"{self.position} at {self.company_name}"
\ No newline at end of file
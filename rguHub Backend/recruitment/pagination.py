@@ -0,0 +1,60 @@
+"""
+RGU Hub Backend - Recruitment App Pagination
+
+Cursor pagination for job postings and the activity feed, built on the
+keyset paginator from the resources app.
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from rest_framework.response import Response
+
+from resources.pagination import KeysetPagination
+
+
+class RecruitmentCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for /recruitments/.
+
+    Newest postings first, matching Recruitment.Meta.ordering, with the id
+    as tie-breaker for postings created in the same instant.
+    """
+    ordering = ("-posted_on", "-id")
+
+
+class ActivityCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for /latest-updates/.
+
+    Newest entries first, matching the (program, -created_at, -id) and
+    (-created_at, -id) indexes on Activity. Legacy requests (no cursor or
+    page_size while API_PAGINATION_COMPAT is on) get the 6 newest entries
+    as a plain array, like the original homepage feed. Polling requests
+    (`since`) are always paginated, so no new entry is cut off.
+    """
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    legacy_size = 6
+    since_query_param = "since"
+
+    def is_legacy_request(self, request):
+        if self.since_query_param in request.query_params:
+            return False
+        return super().is_legacy_request(request)
+
+    def get_page_query(self, queryset, request):
+        self.legacy = self.is_legacy_request(request)
+        if self.legacy:
+            return queryset.order_by(*self.ordering)[: self.legacy_size]
+        return super().get_page_query(queryset, request)
+
+    def set_page(self, rows):
+        if self.legacy:
+            return rows
+        return super().set_page(rows)
+
+    def get_paginated_response(self, data):
+        if self.legacy:
+            return Response(data)
+        return super().get_paginated_response(data)
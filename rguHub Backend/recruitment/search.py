@@ -0,0 +1,26 @@
+"""
+RGU Hub Backend - Recruitment Search Registration
+
+Registers job postings with the full-text search index in resources.search.
+Called from RecruitmentConfig.ready().
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from resources.search import SearchKind, register
+
+
+def register_recruitment_kind():
+    from .models import Recruitment
+    from .serializers import RecruitmentSerializer
+
+    register(SearchKind(
+        name="recruitment",
+        code=3,
+        model=Recruitment,
+        document=lambda r: (r.position, f"{r.company_name} {r.location}"),
+        serializer_class=RecruitmentSerializer,
+        queryset=lambda: Recruitment.objects.select_related("program"),
+        search_fields=("position", "company_name", "location"),
+    ))
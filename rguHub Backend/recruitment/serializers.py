@@ -12,9 +12,11 @@ Last Updated: 2025
 """
 
 from rest_framework import serializers
+from resources.fieldsets import SparseFieldsetMixin
+from resources.serializers import ProgramSerializer
 from .models import Recruitment
 
-class RecruitmentSerializer(serializers.ModelSerializer):
+class RecruitmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Recruitment model with expanded program information.
     
@@ -35,6 +37,9 @@ class RecruitmentSerializer(serializers.ModelSerializer):
     - deadline: Application deadline
     - apply_link: Application URL
     - posted_on: When job was posted
+
+    Supports `?fields=`; `?expand=program` embeds the program object instead
+    of its primary key.
     """
     # Include program name for easier frontend consumption
     program_name = serializers.CharField(source="program.name", read_only=True)
@@ -42,3 +47,6 @@ class RecruitmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recruitment
         fields = "__all__"
+        expandable_fields = {
+            "program": lambda: ProgramSerializer(read_only=True),
+        }
@@ -0,0 +1,64 @@
+"""
+RGU Hub Backend - Recruitment App Signal Handlers
+
+Invalidates cached recruitment responses and static export files when job
+postings change and keeps the activity feed in sync. Connected in
+RecruitmentConfig.ready().
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from resources import activity, static_export
+from resources.caching import response_cache, scope
+from resources.models import Activity, Program
+from .models import Recruitment
+
+
+def program_short_name(program_id):
+    """Return a program's short name, or None if it no longer exists."""
+    return Program.objects.filter(pk=program_id).values_list("short_name", flat=True).first()
+
+
+@receiver(pre_save, sender=Recruitment, dispatch_uid="recruitment.remember_program")
+def remember_program(sender, instance, **kwargs):
+    """Remember the program a posting belonged to before an update."""
+    instance._cached_previous_program = None
+    if instance.pk is not None and not instance._state.adding:
+        instance._cached_previous_program = (
+            Recruitment.objects.filter(pk=instance.pk)
+            .values_list("program__short_name", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Recruitment, dispatch_uid="recruitment.saved.cache")
+@receiver(post_delete, sender=Recruitment, dispatch_uid="recruitment.deleted.cache")
+def recruitment_changed(sender, instance, **kwargs):
+    """
+    Bump the global and per-program recruitment generations, and mark the
+    same programs' exported posting lists and the feed as stale.
+    """
+    label = sender._meta.label_lower
+    programs = {program_short_name(instance.program_id), getattr(instance, "_cached_previous_program", None)}
+    response_cache.bump(label, *(scope(label, program) for program in programs if program))
+    static_export.mark_stale(
+        static_export.RECRUITMENTS,
+        static_export.LATEST_UPDATES,
+        *(static_export.recruitments_key(program) for program in programs if program),
+    )
+
+
+@receiver(post_save, sender=Recruitment, dispatch_uid="recruitment.activity.published")
+def recruitment_published(sender, instance, created=False, raw=False, **kwargs):
+    """Add newly created postings to the activity feed."""
+    if created and not raw:
+        activity.record_activities([activity.recruitment_activity(instance)])
+
+
+@receiver(post_delete, sender=Recruitment, dispatch_uid="recruitment.activity.unpublished")
+def recruitment_unpublished(sender, instance, **kwargs):
+    activity.remove_activity(Activity.Kind.RECRUITMENT, instance.pk)
@@ -1,3 +1,259 @@
-from django.test import TestCase
+import tempfile
+from datetime import date
+from pathlib import Path
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from resources.async_views import AsyncListURLConf
+from resources.indexes import plan_regressions
+from resources.static_export import export_static_api, static_path
+from resources.models import Activity, Program, Subject, SubjectMaterial, Syllabus, Term
+from resources.on_commit import discard_pending
+from .models import Recruitment
+
+
+class RecruitmentFixtureMixin:
+    """Creates two programs with a handful of job postings each."""
+
+    @classmethod
+    def setUpTestData(cls):
+        discard_pending()
+        # Run the fixture's on-commit work like a committed write would
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.nursing = Program.objects.create(name="B.Sc Nursing", short_name="BSCN", duration_years=4)
+            cls.physio = Program.objects.create(name="B.Sc Physiotherapy", short_name="BPT", duration_years=4)
+            for index in range(5):
+                for program in (cls.nursing, cls.physio):
+                    cls.make_posting(program, f"Position {index}")
+
+    def setUp(self):
+        super().setUp()
+        discard_pending()
+        caches[settings.API_CACHE_ALIAS].clear()
+
+    @staticmethod
+    def make_posting(program, position, **kwargs):
+        return Recruitment.objects.create(
+            program=program,
+            company_name=kwargs.pop("company_name", "Apollo Hospitals"),
+            position=position,
+            location=kwargs.pop("location", "Bangalore"),
+            description="Job description",
+            requirements="Requirements",
+            deadline=date(2030, 1, 1),
+            apply_link="https://example.com/apply",
+            **kwargs,
+        )
+
+
+class RecruitmentPaginationTests(RecruitmentFixtureMixin, TestCase):
+    def test_cursor_pages_follow_posted_on_order(self):
+        client = APIClient()
+        expected = list(
+            Recruitment.objects.filter(program=self.nursing).order_by("-posted_on", "-id").values_list("id", flat=True)
+        )
+        ids, url, params = [], "/recruitments/", {"program": "bscn", "page_size": 2}
+        while url:
+            body = client.get(url, params).json()
+            ids.extend(row["id"] for row in body["results"])
+            url, params = body["next"], None
+        self.assertEqual(ids, expected)
+
+    def test_legacy_response_is_a_list(self):
+        response = APIClient().get("/recruitments/", {"program": "BPT"})
+        self.assertEqual(len(response.json()), 5)
+
+
+class RecruitmentCacheTests(RecruitmentFixtureMixin, TestCase):
+    def test_posting_only_invalidates_its_program(self):
+        client = APIClient()
+        client.get("/recruitments/", {"program": "BSCN"})
+        client.get("/recruitments/", {"program": "BPT"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_posting(self.physio, "Physiotherapist")
+
+        self.assertEqual(client.get("/recruitments/", {"program": "BSCN"})["X-Cache"], "HIT")
+        response = client.get("/recruitments/", {"program": "BPT"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()[0]["position"], "Physiotherapist")
+
+
+class LatestUpdatesConditionalTests(RecruitmentFixtureMixin, TestCase):
+    def test_new_posting_changes_latest_updates_etag(self):
+        client = APIClient()
+        etag = client.get("/latest-updates/")["ETag"]
+        self.assertEqual(client.get("/latest-updates/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_posting(self.nursing, "Ward Nurse")
+
+        response = client.get("/latest-updates/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["title"], "Ward Nurse at Apollo Hospitals")
+
+
+class RecruitmentSearchTests(RecruitmentFixtureMixin, TestCase):
+    def test_postings_are_searchable_by_company_and_location(self):
+        posting = self.make_posting(self.nursing, "ICU Nurse", company_name="Manipal Hospitals", location="Mysuru")
+        response = APIClient().get("/search/", {"q": "manipal mysuru", "type": "recruitment"})
+        self.assertEqual([hit["object"]["id"] for hit in response.json()], [posting.pk])
+
+
+class LatestUpdatesFeedTests(RecruitmentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        term = Term.objects.create(
+            syllabus=Syllabus.objects.create(program=self.nursing, name="CBCS 2022"),
+            term_number=1, term_type=Term.TermType.SEMESTER, slug="bscn-cbcs-2022-semester-1",
+        )
+        self.subject = Subject.objects.create(term=term, code="BN101", name="Anatomy", subject_type="THEORY")
+
+    def test_legacy_feed_mixes_newest_materials_and_postings(self):
+        SubjectMaterial.objects.create(subject=self.subject, file="materials/Unit 1.pdf")
+        self.make_posting(self.physio, "Physiotherapist")
+        feed = self.client.get("/latest-updates/").json()
+        self.assertEqual(len(feed), 6)
+        self.assertEqual(
+            [(item["type"], item["title"], item["program"]) for item in feed[:2]],
+            [("Recruitment", "Physiotherapist at Apollo Hospitals", "BPT"), ("Material", "Unit 1", "BSCN")],
+        )
+
+    def test_program_feed_pages_with_one_query_per_page(self):
+        SubjectMaterial.objects.create(subject=self.subject, file="materials/Unit 1.pdf")
+        expected = list(
+            Activity.objects.filter(program=self.nursing).order_by("-created_at", "-id").values_list("title", flat=True)
+        )
+        titles, url, params = [], "/latest-updates/", {"program": "bscn", "page_size": 4}
+        while url:
+            with self.assertNumQueries(1):
+                body = self.client.get(url, params).json()
+            titles.extend(item["title"] for item in body["results"])
+            url, params = body["next"], None
+        self.assertEqual(titles, expected)
+        self.assertEqual(len(titles), 6)
+
+    def since(self, newest, **params):
+        """Every entry newer than `newest`, following the cursor pages."""
+        items, url, params = [], "/latest-updates/", {"since": newest, **params}
+        while url:
+            body = self.client.get(url, params).json()
+            items.extend(body["results"])
+            url, params = body["next"], None
+        return items
+
+    def test_since_returns_only_newer_entries_and_deletes_are_removed(self):
+        newest = self.client.get("/latest-updates/").json()[0]["created_at"]
+        self.assertEqual(self.since(newest), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            posting = self.make_posting(self.nursing, "Ward Nurse")
+        self.assertEqual([item["object_id"] for item in self.since(newest)], [posting.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            posting.delete()
+        self.assertEqual(self.since(newest), [])
+        self.assertEqual(self.client.get("/latest-updates/", {"since": "yesterday"}).status_code, 400)
+
+    def test_since_is_not_capped_at_the_legacy_feed_size(self):
+        newest = self.client.get("/latest-updates/").json()[0]["created_at"]
+        with self.captureOnCommitCallbacks(execute=True):
+            postings = [self.make_posting(self.nursing, f"Ward Nurse {index}") for index in range(9)]
+        expected = [posting.pk for posting in reversed(postings)]
+        self.assertEqual([item["object_id"] for item in self.since(newest)], expected)
+        self.assertEqual([item["object_id"] for item in self.since(newest, page_size=4)], expected)
+
+
+class RecruitmentFieldsetTests(RecruitmentFixtureMixin, TestCase):
+    def test_fields_and_program_expansion(self):
+        response = APIClient().get("/recruitments/", {"program": "BPT", "fields": "position,program", "expand": "program"})
+        self.assertEqual(response.json()[0], {
+            "position": "Position 4",
+            "program": {"id": self.physio.pk, "name": "B.Sc Physiotherapy", "short_name": "BPT", "duration_years": 4},
+        })
+
+
+class RecruitmentRowListParityTests(RecruitmentFixtureMixin, TestCase):
+    def get_content(self, fast, **params):
+        caches[settings.API_CACHE_ALIAS].clear()
+        with override_settings(API_FAST_LISTS=fast):
+            return APIClient().get("/recruitments/", params).content
+
+    def test_row_lists_match_serializer_output(self):
+        self.make_posting(self.nursing, "Ward Nurse", salary="₹25,000", job_type="PT")
+        for params in ({}, {"program": "bscn"}, {"page_size": 4}, {"fields": "id,program,posted_on", "expand": "program"}):
+            self.assertEqual(self.get_content(True, **params), self.get_content(False, **params))
+
+
+class RecruitmentStreamingTests(RecruitmentFixtureMixin, TestCase):
+    def test_stream_matches_unpaginated_response(self):
+        client = APIClient()
+        streamed = client.get("/recruitments/", {"program": "bpt", "stream": "1"})
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(b"".join(streamed.streaming_content), client.get("/recruitments/", {"program": "bpt"}).content)
+
+
+class RecruitmentQueryPlanTests(RecruitmentFixtureMixin, TestCase):
+    """Posting lists and the activity feed read their (program, newest) indexes in order."""
+
+    def assertIndexedPlan(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+        self.assertTrue(queries.captured_queries)
+        for query in queries.captured_queries:
+            self.assertEqual(plan_regressions(query["sql"]), [], query["sql"])
+
+    def test_lists_use_indexes_without_sorting(self):
+        self.client = APIClient()
+        for url in ("/recruitments/", "/latest-updates/"):
+            for params in ({"page_size": 3}, {"page_size": 3, "program": "bscn"}):
+                with self.subTest(url=url, params=params):
+                    self.assertIndexedPlan(url, params)
+
+
+@override_settings(ROOT_URLCONF=AsyncListURLConf())
+class RecruitmentAsyncListTests(RecruitmentFixtureMixin, TestCase):
+    def get(self, url, params=None):
+        async def get():
+            return await self.async_client.get(url, params or {})
+        return async_to_sync(get)()
+
+    def test_async_lists_page_like_the_sync_views(self):
+        for path in ("/recruitments/", "/latest-updates/"):
+            pages, url, params = [], path, {"program": "bscn", "page_size": 2}
+            while url:
+                with self.subTest(url=url), self.assertNumQueries(1):
+                    body = self.get(url, params).json()
+                pages.append(body["results"])
+                url, params = body["next"], None
+            self.assertEqual(sum(len(page) for page in pages), 5)
+
+            caches[settings.API_CACHE_ALIAS].clear()
+            expected, url, params = [], path, {"program": "bscn", "page_size": 2}
+            while url:
+                body = APIClient().get(url, params).json()
+                expected.append(body["results"])
+                url, params = body["next"], None
+            self.assertEqual(pages, expected)
+
+
+class RecruitmentStaticExportTests(RecruitmentFixtureMixin, TestCase):
+    def test_new_posting_refreshes_only_posting_lists_and_feed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            export_static_api(directory)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.make_posting(self.nursing, "Staff Nurse")
+            result = export_static_api(directory)
+            self.assertEqual(result["partitions"], 3)
+            for path, params in (("/recruitments/", {}), ("/recruitments/", {"program": "BSCN"}), ("/latest-updates/", {})):
+                content = (Path(directory) / static_path(path, params)).read_bytes()
+                self.assertEqual(content, APIClient().get(path, params).content)
+            self.assertIn(b"Staff Nurse", (Path(directory) / "recruitments" / "program=BSCN.json").read_bytes())
+            self.assertNotIn(b"Staff Nurse", (Path(directory) / "recruitments" / "program=BPT.json").read_bytes())
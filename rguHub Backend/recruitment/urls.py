@@ -18,12 +18,17 @@ Query Parameters:
 - GET /recruitments/?program=BSCN - Filter by program
 - GET /latest-updates/ - No parameters needed
 
+With API_ASYNC_VIEWS (off by default), both list routes are served by
+async views (resources.async_views).
+
 Author: RGU Hub Development Team
 Last Updated: 2025
 """
 
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from resources.async_views import async_list_urls
 from .views import RecruitmentViewSet, LatestUpdatesViewSet  
 
 # Create router instance
@@ -34,6 +39,10 @@ router.register(r"recruitments", RecruitmentViewSet, basename="recruitments")
 router.register(r"latest-updates", LatestUpdatesViewSet, basename="latest-updates")  
 
 # URL patterns
-urlpatterns = [
+urlpatterns = []
+if settings.API_ASYNC_VIEWS:
+    # List routes served by async views (resources.async_views)
+    urlpatterns += async_list_urls(router)
+urlpatterns += [
     path("", include(router.urls)),
 ]
@@ -6,26 +6,45 @@ related to job postings and recruitment opportunities.
 
 ViewSets Overview:
 - RecruitmentViewSet: Read-only access to job postings with program filtering
-- LatestUpdatesViewSet: Custom viewset for combining recent materials and jobs
+- LatestUpdatesViewSet: Activity feed of new materials and job postings
 
 API Endpoints:
 - GET /recruitments/ - List all job postings
 - GET /recruitments/?program=BSCN - Filter by program
+- GET /recruitments/?stream=1 - Stream every matching posting as one JSON array
 - GET /latest-updates/ - Get recent materials and job postings
+- GET /latest-updates/?program=BSCN&since=... - Filtered / incremental feed
+
+All endpoints support conditional GET (ETag / If-None-Match / 304) and
+the alternative formats of resources.renderers. Under ASGI, both lists
+are served by async views (resources.async_views).
 
 Author: RGU Hub Development Team
 Last Updated: 2025
 """
 
-from rest_framework import viewsets
-from itertools import chain
-from rest_framework.response import Response
-from rest_framework.decorators import api_view
-from resources.models import SubjectMaterial
+import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import mixins, viewsets
+from rest_framework.exceptions import ValidationError
+from resources.async_views import AsyncListMixin
+from resources.caching import CachedListMixin, scope
+from resources.conditional import ConditionalGetMixin
+from resources.fieldsets import SparseFieldsetViewMixin
+from resources.indexes import short_name_matches
+from resources.models import Activity
+from resources.renderers import VaryOnAcceptMixin
+from resources.request_log import RequestLogMixin
+from resources.rows import RowListMixin
+from resources.streaming import StreamingListMixin
+from resources.serializers import ActivitySerializer
 from .models import Recruitment
+from .pagination import ActivityCursorPagination, RecruitmentCursorPagination
 from .serializers import RecruitmentSerializer
 
-class RecruitmentViewSet(viewsets.ReadOnlyModelViewSet):
+class RecruitmentViewSet(AsyncListMixin, VaryOnAcceptMixin, RequestLogMixin, SparseFieldsetViewMixin, ConditionalGetMixin, StreamingListMixin, CachedListMixin, RowListMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only ViewSet for Recruitment model with program filtering.
     
@@ -39,6 +58,15 @@ class RecruitmentViewSet(viewsets.ReadOnlyModelViewSet):
     
     Query Parameters:
     - program: Program short name (case-insensitive, e.g., "BSCN", "BPT")
+    - cursor: Opaque cursor from a previous page's next/previous link
+    - page_size: Number of postings per page (max 200)
+    - stream: "1" streams every matching posting as one JSON array,
+      ignoring pagination
+
+    Pagination:
+    Cursor (keyset) pagination ordered by (-posted_on, -id). While
+    API_PAGINATION_COMPAT is enabled, requests without cursor/page_size get
+    the legacy unpaginated array.
     
     Response Format:
     {
@@ -59,6 +87,15 @@ class RecruitmentViewSet(viewsets.ReadOnlyModelViewSet):
     """
     queryset = Recruitment.objects.all().order_by("-posted_on")
     serializer_class = RecruitmentSerializer
+    pagination_class = RecruitmentCursorPagination
+    cache_scopes = ("resources.program",)
+    log_params = ("program", "page_size", "stream")
+    compact_intern_fields = ("program", "program_name", "company_name", "location", "job_type")
+
+    def get_cache_scopes(self, request):
+        """Filtered lists only depend on the requested program's postings."""
+        program = request.query_params.get("program") or None
+        return super().get_cache_scopes(request) + [scope("recruitment.recruitment", program)]
 
     def get_queryset(self):
         """
@@ -70,65 +107,76 @@ class RecruitmentViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = super().get_queryset()
         program_filter = self.request.query_params.get("program", None)
         if program_filter:
-            queryset = queryset.filter(program__short_name__iexact=program_filter)
+            queryset = queryset.filter(short_name_matches("program__short_name", program_filter))
         return queryset
 
-class LatestUpdatesViewSet(viewsets.ViewSet):
+class LatestUpdatesViewSet(AsyncListMixin, VaryOnAcceptMixin, RequestLogMixin, ConditionalGetMixin, CachedListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
     """
-    Custom ViewSet for combining recent materials and job postings.
-    
-    Provides a unified endpoint that returns the most recent study materials
-    and job postings, sorted by creation/posted date. Used for the homepage
-    "Latest Updates" section.
+    Activity feed of recently published study materials and job postings.
+
+    Reads the append-only Activity table (one row per created material or
+    posting), so every request is a single index range scan on
+    (program, created_at) or (created_at), whatever content types exist.
+    Used for the homepage "Latest Updates" section.
     
     Endpoints:
-    - GET /latest-updates/ - Get recent materials and job postings
+    - GET /latest-updates/ - The 6 newest entries (legacy array)
+    - GET /latest-updates/?page_size=20 - Cursor-paginated feed
+    - GET /latest-updates/?program=BSCN - Entries for one program
+    - GET /latest-updates/?since=2025-01-15T10:30:00Z - Entries newer than a timestamp
+      (always cursor-paginated: follow `next` until it is null)
+
+    Query Parameters:
+    - program: Program short name (case-insensitive)
+    - since: ISO 8601 timestamp; only strictly newer entries are returned
+      (poll with the newest created_at seen so far)
+    - cursor / page_size: Cursor pagination, newest first
     
     Response Format:
     [
         {
             "type": "Material",
             "title": "anatomy_notes.pdf",
-            "created_at": "2025-01-15T10:30:00Z"
+            "created_at": "2025-01-15T10:30:00Z",
+            "object_id": 12,
+            "program": "BSCN"
         },
         {
             "type": "Recruitment", 
             "title": "Staff Nurse at Apollo Hospitals",
-            "created_at": "2025-01-14T15:20:00Z"
+            "created_at": "2025-01-14T15:20:00Z",
+            "object_id": 3,
+            "program": "BSCN"
         }
     ]
+
+    Responses are cached and carry ETag validators derived from
+    the activity feed's change counters; matching conditional requests get 304.
     """
-    def list(self, request):
-        """
-        Combine recent materials and job postings into a unified response.
-        
-        Fetches the 6 most recent materials and 6 most recent job postings,
-        combines them, sorts by date, and returns the 6 most recent items.
-        """
-        # fetch last 5 subject materials
-        materials = SubjectMaterial.objects.order_by("-created_at")[:6]
-        recruitments = Recruitment.objects.order_by("-posted_on")[:6]
-
-        # combine and sort by date
-        combined = sorted(
-            list(materials) + list(recruitments),
-            key=lambda x: x.created_at if hasattr(x, "created_at") else x.posted_on,
-            reverse=True,
-        )[:6]
-
-        data = []
-        for obj in combined:
-            if isinstance(obj, SubjectMaterial):
-                data.append({
-                    "type": "Material",
-                    "title": obj.title,
-                    "created_at": obj.created_at,
-                })
-            else:
-                data.append({
-                    "type": "Recruitment",
-                    "title": f"{obj.position} at {obj.company_name}",
-                    "created_at": obj.posted_on,
-                })
-
-        return Response(data)
\ No newline at end of file
+    queryset = Activity.objects.select_related("program")
+    serializer_class = ActivitySerializer
+    pagination_class = ActivityCursorPagination
+    cache_scopes = ("resources.program",)
+    log_params = ("program", "since", "page_size")
+    compact_intern_fields = ("type", "program")
+
+    def get_cache_scopes(self, request):
+        program = request.query_params.get("program") or None
+        return super().get_cache_scopes(request) + [scope("resources.activity", program)]
+
+    def get_queryset(self):
+        """Apply the program and since filters."""
+        queryset = super().get_queryset()
+        program = self.request.query_params.get("program")
+        since = self.request.query_params.get("since")
+        if program:
+            queryset = queryset.filter(short_name_matches("program__short_name", program))
+        if since:
+            # An unencoded "+00:00" offset arrives as " 00:00"
+            parsed = parse_datetime(since.replace(" ", "+"))
+            if parsed is None:
+                raise ValidationError({"since": "Expected an ISO 8601 timestamp."})
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed, datetime.timezone.utc)
+            queryset = queryset.filter(created_at__gt=parsed)
+        return queryset
@@ -0,0 +1,74 @@
+"""
+RGU Hub Backend - Activity Feed
+
+Writes the append-only Activity rows served by /latest-updates/.
+
+Signal handlers (resources.signals, recruitment.signals) record one row per
+created material or job posting. Bulk writers (ingest_materials, data
+generators) call `record_activities` with the created objects instead.
+Every write bumps the feed's cache scopes, globally and per program.
+
+Functions Overview:
+- material_activity / recruitment_activity: Build the feed row for an object
+- record_activities: Insert feed rows in bulk
+- remove_activity: Delete the row of a deleted object
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from .caching import response_cache, scope
+from .models import Activity, Program, Subject
+
+LABEL = Activity._meta.label_lower
+
+
+def material_activity(material, program_id):
+    return Activity(
+        kind=Activity.Kind.MATERIAL,
+        object_id=material.pk,
+        program_id=program_id,
+        title=material.title,
+        created_at=material.created_at,
+    )
+
+
+def recruitment_activity(posting):
+    return Activity(
+        kind=Activity.Kind.RECRUITMENT,
+        object_id=posting.pk,
+        program_id=posting.program_id,
+        title=f"{posting.position} at {posting.company_name}"[:512],
+        created_at=posting.posted_on,
+    )
+
+
+def material_programs(materials):
+    """Return `{subject id: program id}` for the materials' subjects (one query)."""
+    return dict(
+        Subject.objects.filter(pk__in={material.subject_id for material in materials})
+        .values_list("id", "term__syllabus__program_id")
+    )
+
+
+def _bump(program_ids):
+    programs = Program.objects.filter(pk__in=program_ids).values_list("short_name", flat=True)
+    response_cache.bump(LABEL, *(scope(LABEL, program) for program in programs))
+
+
+def record_activities(rows):
+    """Insert Activity rows (already-recorded objects are ignored)."""
+    rows = [row for row in rows if row.program_id is not None]
+    if rows:
+        Activity.objects.bulk_create(rows, ignore_conflicts=True)
+        _bump({row.program_id for row in rows})
+
+
+def remove_activity(kind, object_id):
+    """Delete the feed row of a deleted object."""
+    program_ids = set(
+        Activity.objects.filter(kind=kind, object_id=object_id).values_list("program_id", flat=True)
+    )
+    if program_ids:
+        Activity.objects.filter(kind=kind, object_id=object_id).delete()
+        _bump(program_ids)
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .delivery import material_url
 from .models import Program, Syllabus, Term, Subject, SubjectMaterial, MaterialType
 from django.utils.html import format_html
 import os
@@ -60,12 +61,7 @@ class SubjectMaterialAdmin(admin.ModelAdmin):
             return format_html(f"<a href='{url}' target='_blank'>Open File</a>")
         return "-"
     def file_url(self, obj):
-        try:
-            if obj.file and hasattr(obj.file, 'url') and obj.file.url:
-                return obj.file.url
-        except Exception:
-            pass
-        return getattr(obj, 'url', None)
+        return material_url(obj)
     file_url.short_description = "Cloudinary URL"
     uploaded_link.short_description = "Cloudinary URL"
 
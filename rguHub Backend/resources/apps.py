@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ResourcesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resources'
+
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
+        from .search import register_resource_kinds
+
+        register_resource_kinds()
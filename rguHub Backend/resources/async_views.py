@@ -0,0 +1,177 @@
+"""
+RGU Hub Backend - Async List Views
+
+Async (ASGI) implementations of the hot read paths: /materials/,
+/subjects/, /recruitments/ and /latest-updates/.
+
+DRF viewsets are synchronous, so under ASGI every request to them holds a
+thread for its whole duration. AsyncListMixin adds an async view for a
+viewset's list route that reuses the viewset itself (negotiation,
+filters, FilterSets, sparse fieldsets, row plans, pagination, response
+cache, conditional GET, request logging) and awaits the I/O instead:
+
+1. One sync_to_async call runs initial() (content negotiation,
+   authentication, conditional GET validators) and the response cache
+   lookup. Cache hits and 304s are finalized and answered here.
+2. On a miss, the page's rows are fetched with the async ORM
+   (`async for`); keyset pagination builds the page query without
+   evaluating it (KeysetPagination.apaginate_queryset).
+3. One sync_to_async call finalizes the response (cache store,
+   validators, request log).
+
+Everything the sync view does is also done here, in the same order, so
+responses are byte for byte the same. Requests the async path does not
+handle (writes, `?stream=1` exports, other methods) are passed to the
+regular viewset view.
+
+/latest-updates/ reads the single Activity table (resources.activity), so
+its list is one query; there are no independent queries left to run
+concurrently.
+
+Django 4.2's async ORM still runs each query on a thread (database drivers
+are synchronous), one per request under ASGI. What the async path saves is
+the thread held while a request waits on the cache, the database and the
+client. Compare both stacks with `python manage.py benchmark_asgi`.
+
+Components Overview:
+- AsyncListMixin: ViewSet mixin providing `as_async_list_view()`
+- async_list_urls: URL patterns routing a router's list routes to the
+  async views (put them before the router's URLs)
+- AsyncListURLConf: rguHub.urls with every list route on the async views,
+  whatever API_ASYNC_VIEWS says (benchmarks, tests)
+
+Settings:
+- API_ASYNC_VIEWS: Route list requests to the async views (default: off,
+  also under ASGI; enable it only where benchmark_asgi shows a gain)
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from asgiref.sync import sync_to_async
+from django.urls import re_path
+from rest_framework.response import Response
+
+ASYNC_METHODS = ("GET", "HEAD")
+
+
+class AsyncListMixin:
+    """
+    ViewSet mixin serving list() from an async view.
+
+    List it first among a ViewSet's bases. The viewset's list() chain is
+    unchanged; the async view drives the same methods (see the module
+    docstring) and fetches rows with the async ORM.
+    """
+
+    @classmethod
+    def as_async_list_view(cls, actions, **initkwargs):
+        """Async counterpart of `as_view(actions, **initkwargs)` for a list route."""
+        sync_view = sync_to_async(cls.as_view(dict(actions), **initkwargs))
+        actions = dict(actions, head=actions["get"])
+
+        async def view(request, *args, **kwargs):
+            if request.method not in ASYNC_METHODS:
+                return await sync_view(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.action_map = actions
+            for method, action in actions.items():
+                setattr(self, method, getattr(self, action))
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.__name__ = cls.__name__
+        view.__doc__ = cls.__doc__
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        # csrf_exempt() would wrap the coroutine function in a sync function
+        view.csrf_exempt = True
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        """dispatch() for list requests, awaiting the database instead of blocking on it."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        self.response = await sync_to_async(self.start_list)(request, *args, **kwargs)
+        if self.response is None:
+            try:
+                response = await self.alist(request, *args, **kwargs)
+            except Exception as exc:
+                response = self.handle_exception(exc)
+            self.response = await sync_to_async(self.finalize_response)(request, response, *args, **kwargs)
+        return self.response
+
+    def start_list(self, request, *args, **kwargs):
+        """
+        Run initial() and the response cache lookup. Return the finalized
+        response when there is one already (cache hit, 304, error, sync-only
+        request), or None to fetch the rows with alist().
+        """
+        try:
+            self.initial(request, *args, **kwargs)
+            wants_stream = getattr(self, "wants_stream", None)
+            if wants_stream is not None and wants_stream(request):
+                response = self.list(request, *args, **kwargs)
+            else:
+                get_cached_response = getattr(self, "get_cached_response", None)
+                response = get_cached_response(request) if get_cached_response is not None else None
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        if response is None:
+            return None
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        """list() below the response cache, with the rows fetched by the async ORM."""
+        queryset = self.filter_queryset(self.get_queryset())
+        get_row_plan = getattr(self, "get_row_plan", None)
+        plan = get_row_plan() if get_row_plan is not None else None
+        if plan is not None:
+            queryset, render = plan.values(queryset), plan.render
+        else:
+            def render(instances):
+                return self.get_serializer(instances, many=True).data
+
+        paginator = self.paginator
+        if paginator is not None:
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                return self.get_paginated_response(render(page))
+        return Response(render([item async for item in queryset]))
+
+
+def async_list_urls(router):
+    """
+    URL patterns serving the list route of every AsyncListMixin viewset
+    registered with `router` through its async view.
+    """
+    route = router.routes[0]
+    patterns = []
+    for prefix, viewset, basename in router.registry:
+        if not issubclass(viewset, AsyncListMixin):
+            continue
+        actions = router.get_method_map(viewset, route.mapping)
+        initkwargs = dict(route.initkwargs, basename=basename, detail=route.detail)
+        regex = route.url.format(prefix=prefix, trailing_slash=router.trailing_slash)
+        view = viewset.as_async_list_view(actions, **initkwargs)
+        patterns.append(re_path(regex, view, name=route.name.format(basename=basename)))
+    return patterns
+
+
+class AsyncListURLConf:
+    """URL configuration under ASGI: the list routes go to the async views."""
+
+    def __init__(self):
+        from recruitment.urls import router as recruitment_router
+        from rguHub.urls import urlpatterns
+
+        from .urls import router
+
+        self.urlpatterns = async_list_urls(router) + async_list_urls(recruitment_router) + urlpatterns
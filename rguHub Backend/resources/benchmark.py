@@ -0,0 +1,671 @@
+"""
+RGU Hub Backend - Endpoint Benchmarks
+
+Times every public API endpoint against the current database, for the
+`benchmark_endpoints` management command.
+
+Each case is requested in-process with the Django test client:
+- once "cold", right after clearing the response cache
+- then `repeat` times "warm" (cached responses and snapshots are reused,
+  as in production)
+Wall-clock times and database query counts are recorded for both.
+
+Cases cover every route registered in resources/urls.py and
+recruitment/urls.py (list, detail and the common filters). Sample slugs
+and ids are taken from the data, preferring the busiest subject and
+program, so the same dataset always produces the same requests.
+
+Large unpaginated legacy listings (/materials/, /recruitments/) are
+benchmarked paginated; the legacy list of a single subject is included.
+
+Serialization benchmark:
+`run_serialization_benchmark` renders the /materials/ and /recruitments/
+lists (up to `rows` rows) both with the DRF serializers and from
+values_list() rows (resources.rows), and checks the JSON is identical.
+`run_renderer_benchmark` encodes the same lists with every renderer in
+resources.renderers and records encode time and wire size (raw and gzipped).
+
+SQLite concurrency benchmark:
+`run_sqlite_concurrency_benchmark` runs `readers` reader workers requesting
+/materials/ pages (response cache off) for `seconds` while `writers` writer
+workers create materials `write_batch` per transaction, as admin uploads and
+ingest_materials do, with the given connection PRAGMAs (see rguHub.db).
+Each write transaction reads the subject before inserting, like an admin
+save, so concurrent writers exercise the read-then-write lock upgrade that
+BEGIN IMMEDIATE (rguHub.sqlite) avoids; `immediate` selects BEGIN
+IMMEDIATE or Django's DEFERRED BEGIN.
+Workers are forked processes, like the worker processes of a deployment:
+threads would mostly measure the GIL rather than SQLite's locking.
+It records request and write throughput, latency percentiles and errors
+such as "database is locked". Written materials are deleted afterwards.
+
+ASGI versus WSGI benchmark:
+`run_server_benchmark` loads the hot list endpoints (/materials/,
+/subjects/, /recruitments/, /latest-updates/) through Django's own WSGI
+and ASGI handlers with the same number of forked worker processes and the
+same concurrency per worker: `concurrency` threads per WSGI worker (like
+gunicorn's gthread workers) and `concurrency` in-flight requests on one
+event loop per ASGI worker, where the lists are served by the async views
+(resources.async_views). Load is generated inside the workers, so both
+stacks pay the same client overhead and no network is involved. It records
+requests/sec, latency percentiles and errors per stack.
+
+Functions Overview:
+- benchmark_cases: Build the list of requests for the current data
+- run_benchmark: Time the cases and return JSON-serializable results
+- run_serialization_benchmark: Compare serializer and row-based lists
+- run_renderer_benchmark: Compare response formats
+- run_sqlite_concurrency_benchmark: Readers against a writer on SQLite
+- run_server_benchmark: Hot list endpoints under WSGI and ASGI
+- environment: Python/Django/database details recorded with the results
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import platform
+import multiprocessing
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import Error as DatabaseError, connection, connections, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.renderers import JSONRenderer
+
+from .async_views import AsyncListURLConf
+from .fieldsets import optimize_queryset
+from .models import MaterialType, Program, Subject, SubjectMaterial
+from .renderers import CompactJSONRenderer, MessagePackRenderer, ORJSONRenderer, msgpack, orjson
+from .rows import compile_row_plan
+from .serializers import SubjectMaterialSerializer
+
+
+@dataclass
+class Case:
+    """One benchmarked request."""
+    name: str
+    path: str
+    params: dict = field(default_factory=dict)
+    headers: dict = field(default_factory=dict)
+
+
+def _search_term(subject):
+    return subject.name.split()[0].lower() if subject is not None else "anatomy"
+
+
+def benchmark_cases():
+    """Return the Case list for the current data; detail cases need at least one row."""
+    Recruitment = apps.get_model("recruitment", "Recruitment")
+    subject = Subject.objects.order_by("-materials_active", "pk").select_related("term__syllabus__program").first()
+    program = subject.term.syllabus.program if subject is not None else Program.objects.order_by("pk").first()
+    material = SubjectMaterial.objects.filter(is_active=True).order_by("pk").first()
+    material_type = MaterialType.objects.order_by("pk").first()
+    posting = Recruitment.objects.order_by("pk").first()
+    course = program.short_name if program is not None else ""
+
+    cases = [
+        Case("material-types", "/material-types/"),
+        Case("subjects", "/subjects/"),
+        Case("subjects-by-course", "/subjects/", {"course": course, "sem": 1}),
+        Case("materials-page", "/materials/", {"page_size": 50}),
+        Case("materials-by-type", "/materials/", {"type": material_type.slug if material_type else "", "page_size": 50}),
+        Case("catalog", "/catalog/"),
+        Case("catalog-program", "/catalog/", {"program": course}),
+        Case("search", "/search/", {"q": _search_term(subject)}),
+        Case("recruitments-page", "/recruitments/", {"page_size": 20}),
+        Case("recruitments-by-program", "/recruitments/", {"program": course, "page_size": 20}),
+        Case("latest-updates", "/latest-updates/"),
+        Case("latest-updates-program", "/latest-updates/", {"program": course, "page_size": 20}),
+    ]
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token:
+        # Operator endpoint, closed without the metrics token
+        cases.append(Case("cache-stats", "/cache-stats/", headers={"Authorization": f"Bearer {token}"}))
+    if material_type is not None:
+        cases.append(Case("material-type-detail", f"/material-types/{material_type.pk}/"))
+    if subject is not None:
+        cases.append(Case("subject-detail", f"/subjects/{subject.pk}/"))
+        cases.append(Case("materials-by-subject", "/materials/", {"subject": subject.slug}))
+    if material is not None:
+        cases.append(Case("material-detail", f"/materials/{material.pk}/"))
+    if posting is not None:
+        cases.append(Case("recruitment-detail", f"/recruitments/{posting.pk}/"))
+    return cases
+
+
+def _clear_response_cache():
+    caches[getattr(settings, "API_CACHE_ALIAS", "default")].clear()
+
+
+def _timed(client, case):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = client.get(case.path, case.params, headers=case.headers)
+        elapsed = (time.perf_counter() - start) * 1000
+    body = b"".join(response.streaming_content) if response.streaming else response.content
+    return response.status_code, len(body), elapsed, len(queries)
+
+
+def _ms(value):
+    return round(value, 3)
+
+
+def run_benchmark(cases, repeat=5):
+    """
+    Request every case once cold and `repeat` times warm.
+
+    Returns one result dict per case with status, body size, cold timing and
+    warm timing statistics (milliseconds) and query counts.
+    """
+    client = Client()
+    # Import and URL resolver setup must not count against the first case
+    client.get("/material-types/")
+    results = []
+    for case in cases:
+        _clear_response_cache()
+        status, size, cold_ms, cold_queries = _timed(client, case)
+        warm = [_timed(client, case) for _ in range(max(repeat, 1))]
+        timings = sorted(elapsed for _, _, elapsed, _ in warm)
+        results.append({
+            "name": case.name,
+            "path": case.path,
+            "params": {name: str(value) for name, value in case.params.items()},
+            "status": status,
+            "bytes": size,
+            "cold": {"ms": _ms(cold_ms), "queries": cold_queries},
+            "warm": {
+                "runs": len(timings),
+                "min_ms": _ms(timings[0]),
+                "median_ms": _ms(statistics.median(timings)),
+                "p95_ms": _ms(timings[min(len(timings) - 1, int(len(timings) * 0.95))]),
+                "max_ms": _ms(timings[-1]),
+                "queries": max(queries for _, _, _, queries in warm),
+            },
+        })
+    return results
+
+
+def _timings(render, repeat):
+    timings, body = [], None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        body = render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings), body
+
+
+def run_serialization_benchmark(rows=10_000, repeat=5):
+    """
+    Time serializer-based and row-based rendering of the first `rows`
+    materials and job postings (query included, as in the list views).
+    """
+    from recruitment.serializers import RecruitmentSerializer
+
+    Recruitment = apps.get_model("recruitment", "Recruitment")
+    lists = [
+        ("materials", SubjectMaterial.objects.all(), SubjectMaterialSerializer),
+        ("recruitments", Recruitment.objects.order_by("-posted_on", "-id"), RecruitmentSerializer),
+    ]
+    renderer = JSONRenderer()
+    results = []
+    for name, queryset, serializer_class in lists:
+        serializer = serializer_class()
+        plan = compile_row_plan(serializer)
+
+        def serialized():
+            instances = optimize_queryset(queryset, serializer)[:rows]
+            return renderer.render(serializer_class(instances, many=True).data)
+
+        def from_rows():
+            return renderer.render(plan.render(plan.values(queryset)[:rows]))
+
+        serializer_median, serializer_min, expected = _timings(serialized, repeat)
+        rows_median, rows_min, actual = _timings(from_rows, repeat)
+        results.append({
+            "name": name,
+            "rows": len(json.loads(actual)),
+            "bytes": len(actual),
+            "identical": actual == expected,
+            "serializer": {"median_ms": _ms(serializer_median), "min_ms": _ms(serializer_min)},
+            "values_list": {"median_ms": _ms(rows_median), "min_ms": _ms(rows_min)},
+            "speedup": round(serializer_median / rows_median, 2) if rows_median else None,
+        })
+    return results
+
+
+def _list_data(rows):
+    """The /materials/ and /recruitments/ list data for the first `rows` rows."""
+    from recruitment.serializers import RecruitmentSerializer
+    from recruitment.views import RecruitmentViewSet
+    from .views import SubjectMaterialViewSet
+
+    Recruitment = apps.get_model("recruitment", "Recruitment")
+    lists = [
+        ("materials", SubjectMaterial.objects.all(), SubjectMaterialSerializer, SubjectMaterialViewSet),
+        ("recruitments", Recruitment.objects.order_by("-posted_on", "-id"), RecruitmentSerializer, RecruitmentViewSet),
+    ]
+    for name, queryset, serializer_class, view_class in lists:
+        plan = compile_row_plan(serializer_class())
+        yield name, plan.render(plan.values(queryset)[:rows]), view_class()
+
+
+def run_renderer_benchmark(rows=10_000, repeat=5):
+    """
+    Encode the first `rows` materials and job postings with every renderer.
+
+    Returns per list and format: median encode time (milliseconds) and the
+    body size, raw and gzipped. orjson and msgpack are left out when the
+    package is not installed.
+    """
+    renderers = [("json", JSONRenderer())]
+    if orjson is not None:
+        renderers.append(("orjson", ORJSONRenderer()))
+    if msgpack is not None:
+        renderers.append(("msgpack", MessagePackRenderer()))
+    renderers.append(("compact", CompactJSONRenderer()))
+    results = []
+    for name, data, view in _list_data(rows):
+        formats = {}
+        for format_name, renderer in renderers:
+            context = {"view": view}
+            median, _, body = _timings(lambda: renderer.render(data, renderer.media_type, context), repeat)
+            formats[format_name] = {
+                "encode_median_ms": _ms(median),
+                "bytes": len(body),
+                "gzip_bytes": len(gzip.compress(body, 6)),
+            }
+        results.append({"name": name, "rows": len(data), "formats": formats})
+    return results
+
+
+# SQLite's own defaults, with Python's 5 second lock timeout
+SQLITE_DEFAULT_PRAGMAS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "busy_timeout": 5000,
+    "cache_size": -2000,
+    "mmap_size": 0,
+    "temp_store": "DEFAULT",
+}
+
+
+def _percentiles(timings):
+    if not timings:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    timings = sorted(timings)
+
+    def at(fraction):
+        return _ms(timings[min(len(timings) - 1, int(len(timings) * fraction))])
+    return {"p50_ms": at(0.5), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": _ms(timings[-1])}
+
+
+def _error_name(exc):
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _read_loop(paths, deadline):
+    client = Client(raise_request_exception=False)
+    timings, errors = [], {}
+    try:
+        index = 0
+        while time.monotonic() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                response = client.get(path)
+                failed = None if response.status_code == 200 else f"HTTP {response.status_code}"
+            except DatabaseError as exc:
+                failed = _error_name(exc)
+            if failed:
+                errors[failed] = errors.get(failed, 0) + 1
+            else:
+                timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        connections.close_all()
+    return timings, errors, []
+
+
+def _write_loop(subject, material_type, batch, deadline):
+    timings, errors, written = [], {}, []
+    try:
+        number = 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    # Read first: a DEFERRED transaction must upgrade its lock to write
+                    subject = Subject.objects.get(pk=subject.pk)
+                    for _ in range(batch):
+                        number += 1
+                        material = SubjectMaterial.objects.create(
+                            subject=subject,
+                            material_type=material_type,
+                            file=f"materials/benchmark-{time.time_ns()}-{number}.pdf",
+                        )
+                        written.append(material.pk)
+                timings.append((time.perf_counter() - start) * 1000)
+            except DatabaseError as exc:
+                errors[_error_name(exc)] = errors.get(_error_name(exc), 0) + 1
+    finally:
+        connections.close_all()
+    return timings, errors, written
+
+
+def _worker(kind, target, args, queue):
+    queue.put((kind,) + target(*args))
+
+
+def run_sqlite_concurrency_benchmark(pragmas, readers=8, seconds=10.0, write_batch=1, writers=2, immediate=True):
+    """
+    Run `readers` /materials/ reader processes against `writers` writer
+    processes for `seconds`, with `pragmas` applied to every connection and
+    write transactions beginning with BEGIN IMMEDIATE when `immediate`.
+
+    Returns request and write counts, throughput, latency percentiles
+    (milliseconds) and error counts.
+    """
+    if connection.vendor != "sqlite":
+        raise ValueError("The concurrency benchmark needs an SQLite database")
+    subject = Subject.objects.order_by("-materials_total", "id").first()
+    if subject is None:
+        raise ValueError("The concurrency benchmark needs at least one subject")
+    paths = [
+        "/materials/?page_size=50",
+        f"/materials/?subject={subject.slug}&page_size=50",
+        "/materials/?page_size=50&type=pyq",
+    ]
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    read_results, write_results, written = [], [], []
+    with override_settings(
+        DATABASE_SQLITE_TUNED=True, SQLITE_PRAGMAS=pragmas, SQLITE_IMMEDIATE_TRANSACTIONS=immediate,
+        API_CACHE_ENABLED=False, API_LOG_SAMPLE_RATE=0,
+    ):
+        # New connections (one per worker) pick up the PRAGMAs; the journal mode sticks to the file
+        connections.close_all()
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            journal_mode = cursor.fetchone()[0]
+        material_type = MaterialType.objects.first()
+        # Forked workers must not share the parent's connection
+        connections.close_all()
+        deadline = time.monotonic() + seconds
+        workers = [
+            context.Process(target=_worker, args=("read", _read_loop, (paths, deadline), queue))
+            for _ in range(max(readers, 1))
+        ]
+        workers.extend(
+            context.Process(
+                target=_worker,
+                args=("write", _write_loop, (subject, material_type, max(write_batch, 1), deadline), queue),
+            )
+            for _ in range(max(writers, 1))
+        )
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+        for _ in workers:
+            kind, timings, errors, worker_written = queue.get()
+            (write_results if kind == "write" else read_results).append((timings, errors))
+            written.extend(worker_written)
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - started
+
+        # Signals keep counters, the activity feed and the search index in step
+        for start in range(0, len(written), 500):
+            for material in SubjectMaterial.objects.filter(pk__in=written[start:start + 500]):
+                material.delete()
+        connections.close_all()
+
+    def summary(results, unit):
+        timings = [timing for thread_timings, _ in results for timing in thread_timings]
+        errors = {}
+        for _, thread_errors in results:
+            for name, count in thread_errors.items():
+                errors[name] = errors.get(name, 0) + count
+        return dict(
+            {unit: len(timings), "per_second": round(len(timings) / elapsed, 2), "errors": errors},
+            **_percentiles(timings),
+        )
+
+    return {
+        "pragmas": dict(pragmas),
+        "journal_mode": journal_mode,
+        "begin": "IMMEDIATE" if immediate else "DEFERRED",
+        "readers": max(readers, 1),
+        "writers": max(writers, 1),
+        "seconds": round(elapsed, 3),
+        "reads": summary(read_results, "requests"),
+        "writes": dict(summary(write_results, "transactions"), materials=len(written), batch=max(write_batch, 1)),
+    }
+
+
+SERVER_CASES = (
+    "subjects-by-course",
+    "materials-page",
+    "materials-by-subject",
+    "recruitments-page",
+    "recruitments-by-program",
+    "latest-updates",
+    "latest-updates-program",
+)
+
+
+def server_cases():
+    """The hot list endpoint cases of benchmark_cases()."""
+    return [case for case in benchmark_cases() if case.name in SERVER_CASES]
+
+
+def _wsgi_get(handler, path, query):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    status = []
+    body = handler(environ, lambda line, headers, exc_info=None: status.append(line))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    return int(status[0].split()[0])
+
+
+async def _asgi_get(handler, path, query):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    response = {}
+    finished = asyncio.Event()
+
+    async def receive():
+        if "requested" in response:
+            # Django may listen for a disconnect while the view runs
+            await finished.wait()
+            return {"type": "http.disconnect"}
+        response["requested"] = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif not message.get("more_body"):
+            finished.set()
+
+    await handler(scope, receive, send)
+    finished.set()
+    return response["status"]
+
+
+def _record(timings, errors, status, start, error=None):
+    if error is None and status != 200:
+        error = f"HTTP {status}"
+    if error:
+        errors[error] = errors.get(error, 0) + 1
+    else:
+        timings.append((time.perf_counter() - start) * 1000)
+
+
+def _wsgi_worker(requests, concurrency, deadline):
+    handler = WSGIHandler()
+    timings, errors = [], {}
+
+    def run(offset):
+        index = offset
+        while time.monotonic() < deadline:
+            path, query = requests[index % len(requests)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                status, error = _wsgi_get(handler, path, query), None
+            except DatabaseError as exc:
+                status, error = None, _error_name(exc)
+            with lock:
+                _record(timings, errors, status, start, error)
+
+    lock = threading.Lock()
+    threads = [threading.Thread(target=run, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    connections.close_all()
+    return timings, errors
+
+
+def _asgi_worker(requests, concurrency, deadline):
+    timings, errors = [], {}
+
+    async def run(handler, offset):
+        index = offset
+        while time.monotonic() < deadline:
+            path, query = requests[index % len(requests)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                _record(timings, errors, await _asgi_get(handler, path, query), start)
+            except DatabaseError as exc:
+                _record(timings, errors, None, start, _error_name(exc))
+
+    async def main():
+        handler = ASGIHandler()
+        await asyncio.gather(*(run(handler, offset) for offset in range(concurrency)))
+
+    with override_settings(ROOT_URLCONF=AsyncListURLConf()):
+        asyncio.run(main())
+    connections.close_all()
+    return timings, errors
+
+
+def _server_worker(target, args, queue):
+    queue.put(target(*args))
+
+
+def run_server_benchmark(workers=2, concurrency=8, seconds=10.0, cache=True):
+    """
+    Load the hot list endpoints for `seconds` under WSGI, then under ASGI,
+    with `workers` processes of `concurrency` concurrent requests each.
+
+    Returns requests/sec, latency percentiles (milliseconds) and error
+    counts per stack. With `cache=False` the response cache is off, so
+    every request reaches the database.
+    """
+    if getattr(settings, "API_ASYNC_VIEWS", False):
+        raise ValueError("Unset API_ASYNC_VIEWS: the WSGI run must serve the sync viewsets")
+    cases = server_cases()
+    requests = [(case.path, urlencode(case.params)) for case in cases]
+    workers, concurrency = max(workers, 1), max(concurrency, 1)
+
+    context = multiprocessing.get_context("fork")
+    runs = {}
+    with override_settings(API_CACHE_ENABLED=cache, API_LOG_SAMPLE_RATE=0):
+        for name, target in (("wsgi", _wsgi_worker), ("asgi", _asgi_worker)):
+            _clear_response_cache()
+            # Forked workers must not share the parent's connection
+            connections.close_all()
+            queue = context.Queue()
+            deadline = time.monotonic() + seconds
+            processes = [
+                context.Process(target=_server_worker, args=(target, (requests, concurrency, deadline), queue))
+                for _ in range(workers)
+            ]
+            started = time.monotonic()
+            for process in processes:
+                process.start()
+            results = [queue.get() for _ in processes]
+            for process in processes:
+                process.join()
+            elapsed = time.monotonic() - started
+
+            timings = [timing for worker_timings, _ in results for timing in worker_timings]
+            errors = {}
+            for _, worker_errors in results:
+                for error, count in worker_errors.items():
+                    errors[error] = errors.get(error, 0) + count
+            runs[name] = dict(
+                {"requests": len(timings), "per_second": round(len(timings) / elapsed, 2), "errors": errors},
+                **_percentiles(timings),
+            )
+
+    return {
+        "workers": workers,
+        "concurrency": concurrency,
+        "seconds": seconds,
+        "response_cache": cache,
+        "cases": [case.name for case in cases],
+        "runs": runs,
+    }
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "debug": settings.DEBUG,
+        "response_cache": getattr(settings, "API_CACHE_ENABLED", True),
+    }
@@ -0,0 +1,335 @@
+"""
+RGU Hub Backend - Versioned Response Cache
+
+This module caches rendered list responses for the read-mostly catalog
+endpoints (/subjects/, /material-types/, /materials/, /recruitments/).
+
+How it works:
+- Every model (and, for program-scoped data, every program) has a
+  generation counter stored in the cache backend.
+- A cache key is built from the view, the normalized query parameters,
+  the negotiated renderer and the current generations of everything the
+  response depends on.
+- Signal handlers bump the generations after a write commits, so old keys
+  are simply never looked up again and age out of the bounded cache.
+- Compressed variants (resources.compression) are stored under the entry's
+  key plus the encoding, so hot responses are compressed only once.
+
+Components Overview:
+- ResponseCache: Generation bookkeeping, entry storage and hit/miss stats
+- response_cache: Module-level ResponseCache used by views and signals
+- VersionedViewMixin: Declares the scopes a view's responses depend on
+- CachedListMixin: ViewSet mixin that serves list() from the cache
+- scope: Helper building a generation scope name
+
+Settings:
+- API_CACHE_ENABLED: Turn response caching on/off (default True)
+- API_CACHE_ALIAS: Cache alias from CACHES used for entries and generations
+- API_CACHE_TIMEOUT: Seconds an entry may live (default 3600)
+- API_CACHE_MAX_BODY_BYTES: Larger responses are not cached
+
+Size is bounded by the cache backend (MAX_ENTRIES for LocMemCache,
+maxmemory for Redis). Use a shared backend when running several workers so
+invalidations reach all of them.
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.response import Response
+from rguHub.db import pin_after_recent_write
+
+from .compression import accepted_encoding, compression_enabled
+
+
+def normalize_params(params):
+    """Return a QueryDict as sorted (name, value) pairs without blank values."""
+    return sorted(
+        (name, value)
+        for name in params
+        for value in params.getlist(name)
+        if value != ""
+    )
+
+
+def scope(model_label, program=None):
+    """
+    Return the generation scope name for a model, optionally per program.
+
+    Programs are identified by their lower-cased short name, which is what
+    the API filters on (`?course=`, `?program=`).
+    """
+    if program is None:
+        return model_label
+    return f"{model_label}:program:{program.lower()}"
+
+
+class ResponseCache:
+    """
+    Generation-versioned cache for rendered API responses.
+
+    Entries are `(content_type, body)` tuples. Stats are kept per process.
+    """
+    key_prefix = "api-response"
+    generation_prefix = "api-generation"
+    modified_prefix = "api-modified"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    # ----------------- Configuration -----------------
+
+    @property
+    def enabled(self):
+        return getattr(settings, "API_CACHE_ENABLED", True)
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+    @property
+    def timeout(self):
+        return getattr(settings, "API_CACHE_TIMEOUT", 3600)
+
+    @property
+    def max_body_bytes(self):
+        return getattr(settings, "API_CACHE_MAX_BODY_BYTES", 1024 * 1024)
+
+    # ----------------- Generations -----------------
+
+    def _generation_key(self, name):
+        return f"{self.generation_prefix}:{name}"
+
+    def _modified_key(self, name):
+        return f"{self.modified_prefix}:{name}"
+
+    @staticmethod
+    def _fresh_generation():
+        # A time-based start value guarantees that a counter lost to eviction
+        # never comes back at a value some stale entry was stored under
+        return time.time_ns()
+
+    def versions(self, scopes):
+        """
+        Return `(generation, modified)` for each scope.
+
+        `modified` is the UNIX time of the scope's last bump. Scopes seen for
+        the first time (or evicted) start at a fresh generation and count as
+        modified now.
+        """
+        keys = []
+        for name in scopes:
+            keys += [self._generation_key(name), self._modified_key(name)]
+        found = self.cache.get_many(keys)
+        result = []
+        for name in scopes:
+            generation_key, modified_key = self._generation_key(name), self._modified_key(name)
+            if generation_key not in found:
+                self.cache.add(modified_key, time.time(), timeout=None)
+                self.cache.add(generation_key, self._fresh_generation(), timeout=None)
+                found[generation_key] = self.cache.get(generation_key)
+                found[modified_key] = self.cache.get(modified_key)
+            result.append((found[generation_key], found.get(modified_key) or time.time()))
+        return result
+
+    def generations(self, scopes):
+        """Return the current generation of each scope."""
+        return [generation for generation, _ in self.versions(scopes)]
+
+    def bump(self, *scopes):
+        """
+        Invalidate every entry depending on the given scopes.
+
+        The bump is deferred until the current transaction commits, so a
+        concurrent reader cannot cache pre-commit data under the new
+        generation.
+        """
+        scopes = tuple(name for name in scopes if name)
+        if scopes:
+            transaction.on_commit(lambda: self._bump_now(scopes))
+
+    def _bump_now(self, scopes):
+        now = time.time()
+        for name in scopes:
+            self.cache.set(self._modified_key(name), now, timeout=None)
+            key = self._generation_key(name)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, self._fresh_generation(), timeout=None)
+        self._count("invalidations", len(scopes))
+
+    # ----------------- Entries -----------------
+
+    def build_key(self, view_name, params, variant, generations):
+        """
+        Build the cache key for a request.
+
+        `params` is a QueryDict; blank values are dropped and keys/values are
+        sorted so equivalent URLs share an entry. `generations` are the
+        current generations of every scope the response depends on.
+        """
+        parts = [view_name, variant, repr(normalize_params(params))]
+        parts.extend(str(generation) for generation in generations)
+        digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{view_name}:{digest}"
+
+    def get(self, key):
+        entry = self.cache.get(key)
+        self._count("hits" if entry is not None else "misses")
+        return entry
+
+    def set(self, key, content_type, body):
+        if len(body) > self.max_body_bytes:
+            self._count("skipped")
+            return False
+        self.cache.set(key, (content_type, body), timeout=self.timeout)
+        self._count("stores")
+        return True
+
+    def get_variant(self, key, encoding):
+        """Return the `encoding`-compressed entry for `key`; only hits are counted."""
+        entry = self.cache.get(f"{key}|{encoding}")
+        if entry is not None:
+            self._count("hits")
+        return entry
+
+    def set_variant(self, key, encoding, content_type, body):
+        return self.set(f"{key}|{encoding}", content_type, body)
+
+    # ----------------- Statistics -----------------
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = dict.fromkeys(("hits", "misses", "stores", "skipped", "invalidations"), 0)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+response_cache = ResponseCache()
+
+
+class VersionedViewMixin:
+    """
+    Describe which generation scopes a view's responses depend on.
+
+    Set `cache_scopes` to the model labels the response depends on, or
+    override `get_cache_scopes()` for program-scoped dependencies. The scope
+    versions are looked up once per request and shared by the response
+    cache and conditional GET handling. Reads stay on the primary database
+    while a scope was modified within the replica lag window (rguHub.db).
+    """
+    cache_scopes = ()
+
+    def get_cache_scopes(self, request):
+        return list(self.cache_scopes)
+
+    def get_cache_view_name(self):
+        return f"{self.basename}-{self.action}"
+
+    def get_cache_variant(self, request):
+        # Paginated bodies embed absolute next/previous links
+        return f"{request.get_host()}|{request.accepted_renderer.format}"
+
+    def get_scope_versions(self, request):
+        versions = getattr(self, "_scope_versions", None)
+        if versions is None:
+            versions = self._scope_versions = response_cache.versions(self.get_cache_scopes(request))
+            # A replica may not have caught up with a recent write yet
+            pin_after_recent_write(max((modified for _, modified in versions), default=None))
+        return versions
+
+
+class CachedListMixin(VersionedViewMixin):
+    """
+    Serve `list()` responses from the versioned response cache.
+
+    Hits skip the ORM and serialization entirely and are marked
+    `X-Cache: HIT`. Clients accepting gzip/Brotli get the cached compressed
+    variant once CompressionMiddleware has stored one.
+
+    Requests flagged with `bypass_response_cache` (the static export,
+    resources.static_export) are neither served from nor stored in the cache.
+    """
+    # The browsable API embeds per-user CSRF tokens, so it is never cached
+    uncached_formats = ("api",)
+
+    def list(self, request, *args, **kwargs):
+        response = self.get_cached_response(request)
+        if response is not None:
+            return response
+        return super().list(request, *args, **kwargs)
+
+    def get_cached_response(self, request):
+        """
+        Return the cached list response, or None after remembering the key
+        the response built by list() is stored under.
+        """
+        self._response_cache_key = None
+        if not response_cache.enabled or request.accepted_renderer.format in self.uncached_formats:
+            return None
+        if getattr(request, "bypass_response_cache", False):
+            return None
+
+        key = response_cache.build_key(
+            self.get_cache_view_name(),
+            request.query_params,
+            self.get_cache_variant(request),
+            [generation for generation, _ in self.get_scope_versions(request)],
+        )
+        encoding = accepted_encoding(request) if compression_enabled() else None
+        entry = response_cache.get_variant(key, encoding) if encoding else None
+        if entry is not None:
+            content_type, body = entry
+            response = HttpResponse(body, content_type=content_type)
+            response["Content-Encoding"] = encoding
+            patch_vary_headers(response, ("Accept-Encoding",))
+            response["X-Cache"] = "HIT"
+            return response
+
+        entry = response_cache.get(key)
+        if entry is not None:
+            content_type, body = entry
+            response = HttpResponse(body, content_type=content_type)
+            response["X-Cache"] = "HIT"
+            response.store_compressed = self._variant_store(key, content_type)
+            return response
+
+        self._response_cache_key = key
+        return None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "_response_cache_key", None)
+        if key and isinstance(response, Response) and response.status_code == 200:
+            self._response_cache_key = None
+            response.render()
+            response_cache.set(key, response["Content-Type"], response.rendered_content)
+            response["X-Cache"] = "MISS"
+            response.store_compressed = self._variant_store(key, response["Content-Type"])
+        return response
+
+    @staticmethod
+    def _variant_store(key, content_type):
+        def store(encoding, body):
+            response_cache.set_variant(key, encoding, content_type, body)
+        return store
@@ -0,0 +1,243 @@
+"""
+RGU Hub Backend - Catalog Tree
+
+Builds the Program -> Syllabus -> Term -> Subject navigation tree served by
+/catalog/, with active material counts by MaterialType on every node.
+
+Building:
+- A tree is assembled in Python from four flat queries (syllabi, terms,
+  subjects, grouped material counts), however many programs are built.
+
+Snapshots:
+- Each program's tree is stored in a CatalogSnapshot row.
+- Writes anywhere in a program's hierarchy call invalidate_catalog() (see
+  resources.signals). Once the write commits, the affected programs'
+  revisions are incremented and their trees rebuilt, outside the writer's
+  transaction; a transaction invalidating many programs triggers one
+  rebuild.
+- A rebuilt tree is stored with a conditional UPDATE on the revision it was
+  built from, so a write that races with a rebuild is never lost.
+- Reads never write: /catalog/ serves fresh snapshots and builds stale or
+  missing ones in memory (`rebuild_catalog` stores them, e.g. after deploys
+  or writes that bypass signals).
+
+Functions Overview:
+- build_trees: Build fresh trees for the given programs
+- get_catalog: Return snapshot trees, building stale ones without storing
+- rebuild_snapshots: Rebuild and store stale or missing snapshots
+- invalidate_catalog: Refresh programs' snapshots after the write commits
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .indexes import short_name_matches
+from .models import CatalogSnapshot, Program, Subject, SubjectMaterial, Syllabus, Term
+from .on_commit import CommitBatch
+
+
+def _counts():
+    return {"total": 0, "by_type": {}}
+
+
+def _add_counts(target, source):
+    target["total"] += source["total"]
+    for slug, count in source["by_type"].items():
+        target["by_type"][slug] = target["by_type"].get(slug, 0) + count
+
+
+def _date(value):
+    return value.isoformat() if value else None
+
+
+def build_trees(programs):
+    """
+    Build the catalog tree of each program.
+
+    `programs` is an iterable of Program instances. Returns a
+    `{program id: tree}` dict. Uses four queries in total.
+    """
+    programs = list(programs)
+    program_ids = [program.pk for program in programs]
+    if not program_ids:
+        return {}
+
+    syllabi = list(
+        Syllabus.objects.filter(program_id__in=program_ids)
+        .order_by("name")
+        .values("id", "program_id", "name", "effective_from", "effective_to")
+    )
+    terms = list(
+        Term.objects.filter(syllabus__program_id__in=program_ids)
+        .order_by("term_number", "id")
+        .values("id", "syllabus_id", "term_number", "term_type", "name", "slug")
+    )
+    subjects = list(
+        Subject.objects.filter(term__syllabus__program_id__in=program_ids)
+        .order_by("code")
+        .values("id", "term_id", "code", "name", "subject_type", "slug")
+    )
+    counts = (
+        SubjectMaterial.objects.filter(is_active=True, subject__term__syllabus__program_id__in=program_ids)
+        .values("subject_id", type_slug=F("material_type__slug"))
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    subject_counts = defaultdict(_counts)
+    for row in counts:
+        node = subject_counts[row["subject_id"]]
+        node["total"] += row["count"]
+        if row["type_slug"]:
+            node["by_type"][row["type_slug"]] = row["count"]
+
+    subjects_by_term = defaultdict(list)
+    for row in subjects:
+        term_id = row.pop("term_id")
+        subjects_by_term[term_id].append(dict(row, materials=subject_counts.get(row["id"], _counts())))
+
+    terms_by_syllabus = defaultdict(list)
+    for row in terms:
+        syllabus_id = row.pop("syllabus_id")
+        node = dict(row, materials=_counts(), subjects=subjects_by_term.get(row["id"], []))
+        for subject in node["subjects"]:
+            _add_counts(node["materials"], subject["materials"])
+        terms_by_syllabus[syllabus_id].append(node)
+
+    syllabi_by_program = defaultdict(list)
+    for row in syllabi:
+        node = {
+            "id": row["id"],
+            "name": row["name"],
+            "effective_from": _date(row["effective_from"]),
+            "effective_to": _date(row["effective_to"]),
+            "materials": _counts(),
+            "terms": terms_by_syllabus.get(row["id"], []),
+        }
+        for term in node["terms"]:
+            _add_counts(node["materials"], term["materials"])
+        syllabi_by_program[row["program_id"]].append(node)
+
+    trees = {}
+    for program in programs:
+        tree = {
+            "id": program.pk,
+            "name": program.name,
+            "short_name": program.short_name,
+            "duration_years": program.duration_years,
+            "materials": _counts(),
+            "syllabi": syllabi_by_program.get(program.pk, []),
+        }
+        for syllabus in tree["syllabi"]:
+            _add_counts(tree["materials"], syllabus["materials"])
+        trees[program.pk] = tree
+    return trees
+
+
+def get_catalog(program=None):
+    """
+    Return the catalog trees of all programs (or the one with short name
+    `program`), ordered by program name.
+
+    Fresh snapshots cost a single query. Stale or missing ones are built
+    together with build_trees() but not stored: a read never writes (the
+    snapshots are refreshed by invalidate_catalog after each write).
+    """
+    programs = Program.objects.select_related("catalog_snapshot").order_by("name")
+    if program:
+        programs = programs.filter(short_name_matches("short_name", program))
+    programs = list(programs)
+
+    trees, stale = {}, []
+    for item in programs:
+        snapshot = getattr(item, "catalog_snapshot", None)
+        if snapshot is not None and snapshot.is_fresh:
+            trees[item.pk] = snapshot.tree
+        else:
+            stale.append(item)
+    if stale:
+        trees.update(build_trees(stale))
+    return [trees[item.pk] for item in programs]
+
+
+def rebuild_snapshots(names=None):
+    """
+    Rebuild and store the stale or missing snapshots of the programs with
+    the given short names (default: all programs). Returns the number of
+    snapshots stored.
+    """
+    programs = Program.objects.select_related("catalog_snapshot")
+    if names is not None:
+        programs = programs.filter(short_name__in=names)
+
+    stale = []
+    for item in programs:
+        snapshot = getattr(item, "catalog_snapshot", None)
+        if snapshot is None or not snapshot.is_fresh:
+            stale.append((item, snapshot.revision if snapshot is not None else None))
+    if not stale:
+        return 0
+
+    missing = [item for item, revision in stale if revision is None]
+    if missing:
+        CatalogSnapshot.objects.bulk_create(
+            [CatalogSnapshot(program=item) for item in missing], ignore_conflicts=True
+        )
+    built = build_trees(item for item, _ in stale)
+    now, stored = timezone.now(), 0
+    for item, revision in stale:
+        revision = revision or 0
+        # No-op if the hierarchy changed while we were building
+        stored += CatalogSnapshot.objects.filter(pk=item.pk, revision=revision).update(
+            tree=built[item.pk], built_revision=revision, built_at=now
+        )
+    return stored
+
+
+class _Refresh(CommitBatch):
+    """Refresh of the snapshots invalidated by one transaction."""
+
+    def __init__(self):
+        super().__init__()
+        self.names = set()
+        self.everything = False
+
+    def add(self, names):
+        if names is None:
+            self.everything = True
+        else:
+            self.names.update(names)
+
+    def run(self):
+        names = None if self.everything else self.names
+        snapshots = CatalogSnapshot.objects.all()
+        if names is not None:
+            snapshots = snapshots.filter(program__short_name__in=names)
+        # Increment after the commit, so any build that reads the new
+        # revision sees the committed write
+        snapshots.update(revision=F("revision") + 1)
+        rebuild_snapshots(names)
+
+
+def invalidate_catalog(*programs):
+    """
+    Refresh catalog snapshots once the current transaction commits.
+
+    `programs` are program short names; with no arguments every snapshot is
+    refreshed. All invalidations of one transaction share a single refresh
+    (resources.on_commit). A rolled-back write refreshes nothing on its own;
+    its programs are refreshed along with the next committed invalidation.
+    """
+    names = None
+    if programs:
+        names = {name for name in programs if name}
+        if not names:
+            return
+    refresh = _Refresh.pending()
+    refresh.add(names)
+    refresh.schedule()
@@ -0,0 +1,225 @@
+"""
+RGU Hub Backend - Response Compression
+
+Negotiated gzip and Brotli compression for API responses.
+
+How it works:
+- CompressionMiddleware compresses 200 responses with a compressible
+  content type (JSON, compact JSON, MessagePack, text) using the best
+  encoding in the request's Accept-Encoding: Brotli when the `brotli`
+  package is installed and accepted, else gzip
+- Bodies smaller than the first size threshold are sent as they are;
+  larger bodies use the level of the largest threshold they reach, so big
+  responses trade some ratio for CPU time
+- Streamed exports are compressed chunk by chunk with the level of the
+  largest threshold; async streaming bodies (ASGI) stay async, with each
+  chunk compressed in a thread
+- Compressed bodies get `Vary: Accept-Encoding` and a weak ETag
+
+Cached responses:
+Responses that went through the response cache carry a `store_compressed`
+callback (set by resources.caching.CachedListMixin). The middleware hands
+it the compressed body, which is cached next to the raw one, and later
+hits are served pre-compressed without compressing again.
+
+Components Overview:
+- CompressionMiddleware: Compress responses (list it right after
+  MetricsMiddleware)
+- accepted_encoding: Best supported encoding for a request
+- compress: Compress a body with an encoding and level
+
+Settings:
+- API_COMPRESSION_ENABLED: Turn compression on/off (default True)
+- API_COMPRESSION_LEVELS: `[(minimum size, gzip level, brotli quality), ...]`
+- API_COMPRESSION_VIEW_LEVELS: Per view name overrides of the levels,
+  e.g. {"material-list": [(512, 6, 5)]}
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import gzip
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+DEFAULT_LEVELS = ((1024, 6, 5), (256 * 1024, 5, 4), (4 * 1024 * 1024, 4, 3))
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/vnd.rguhub.compact+json",
+    "application/msgpack",
+    "text/",
+)
+
+_ACCEPT_RE = re.compile(r"^\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def compression_enabled():
+    return getattr(settings, "API_COMPRESSION_ENABLED", True)
+
+
+def supported_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accepted_encoding(request):
+    """Return the preferred supported encoding the request accepts, or None."""
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    weights = {}
+    for part in header.split(","):
+        match = _ACCEPT_RE.match(part)
+        if not match:
+            continue
+        try:
+            weights[match.group(1).lower()] = float(match.group(2) or 1)
+        except ValueError:
+            continue
+    best, best_weight = None, 0.0
+    # Server preference (br before gzip) breaks ties
+    for encoding in supported_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compression_levels(view_name):
+    overrides = getattr(settings, "API_COMPRESSION_VIEW_LEVELS", None) or {}
+    if view_name in overrides:
+        return overrides[view_name]
+    return getattr(settings, "API_COMPRESSION_LEVELS", DEFAULT_LEVELS)
+
+
+def level_for(levels, encoding, size):
+    """Level of the largest threshold `size` reaches, or None below the first (size None: streamed)."""
+    chosen = None
+    for minimum, gzip_level, brotli_quality in sorted(levels):
+        if size is None or size >= minimum:
+            chosen = brotli_quality if encoding == "br" else gzip_level
+    return chosen
+
+
+def compress(body, encoding, level):
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    # mtime=0 keeps the output deterministic, so cached variants are stable
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _stream_compressor(encoding, level):
+    """Return `(compress_chunk, finish)` functions for a streamed body."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    # Sync flush: every chunk reaches the client as soon as it is rendered
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+def _compress_stream(chunks, encoding, level):
+    compress_chunk, finish = _stream_compressor(encoding, level)
+    for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def _acompress_stream(chunks, encoding, level):
+    compress_chunk, finish = _stream_compressor(encoding, level)
+    compress_chunk = sync_to_async(compress_chunk, thread_sensitive=False)
+    async for chunk in chunks:
+        data = await compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return response.status_code == 200 and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses for clients that accept gzip or Brotli.
+
+    Runs natively in sync and async stacks; under ASGI the compression
+    itself (CPU work, plus storing the cached variant) runs in a thread so
+    it does not block the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.needs_compression(response):
+            self.compress_response(request, response)
+        return self.finish_response(response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.needs_compression(response):
+            await sync_to_async(self.compress_response)(request, response)
+        return self.finish_response(response)
+
+    @staticmethod
+    def needs_compression(response):
+        return compression_enabled() and is_compressible(response) and not response.has_header("Content-Encoding")
+
+    @staticmethod
+    def finish_response(response):
+        if not compression_enabled() or not is_compressible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if response.has_header("Content-Encoding"):
+            etag = response.get("ETag", "")
+            if etag.startswith('"'):
+                # The compressed bytes differ from the identity representation
+                response["ETag"] = "W/" + etag
+        return response
+
+    def compress_response(self, request, response):
+        encoding = accepted_encoding(request)
+        if encoding is None:
+            return
+        match = getattr(request, "resolver_match", None)
+        levels = compression_levels(match.view_name if match else None)
+
+        if response.streaming:
+            level = level_for(levels, encoding, None)
+            if level is None:
+                return
+            compress_stream = _acompress_stream if response.is_async else _compress_stream
+            response.streaming_content = compress_stream(response.streaming_content, encoding, level)
+            del response["Content-Length"]
+        else:
+            body = response.content
+            level = level_for(levels, encoding, len(body))
+            if level is None:
+                return
+            compressed = compress(body, encoding, level)
+            if len(compressed) >= len(body):
+                return
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+            store = getattr(response, "store_compressed", None)
+            if store is not None:
+                store(encoding, compressed)
+        response["Content-Encoding"] = encoding
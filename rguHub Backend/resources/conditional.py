@@ -0,0 +1,89 @@
+"""
+RGU Hub Backend - Conditional GET Support
+
+This module adds ETag validators and 304 Not Modified responses to read
+endpoints.
+
+The ETag is derived from the generation counters in resources.caching,
+which change whenever any model a response depends on is written. It is
+computed from a single cache lookup, before the queryset is evaluated or
+anything is serialized: a strong tag hashed from the view, URL kwargs,
+query parameters, negotiated format and the scope generations.
+
+No Last-Modified is sent: the only timestamps available are the times of
+generation bumps, rounded to whole seconds and recorded per cache, so an
+If-Modified-Since check could answer 304 for a change made in the same
+second. If-Modified-Since is therefore ignored (resources.downloads keeps
+it for files, whose modification time is stored).
+
+Components Overview:
+- ConditionalGetMixin: ViewSet mixin answering If-None-Match with 304 for
+  list and retrieve actions
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .caching import VersionedViewMixin, normalize_params
+
+
+class _ConditionalResponse(Exception):
+    """Carries a 304/412 response out of APIView.initial()."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin(VersionedViewMixin):
+    """
+    Answer conditional GET/HEAD requests without building the response.
+
+    Works for any viewset (including plain ViewSets with a custom list()),
+    because validation happens in initial(), right after content
+    negotiation. 200 responses carry the ETag header and
+    `Cache-Control: no-cache` so browsers always revalidate instead of
+    guessing a freshness lifetime.
+    """
+    conditional_actions = ("list", "retrieve")
+
+    def get_etag(self, request):
+        parts = [
+            self.get_cache_view_name(),
+            self.get_cache_variant(request),
+            repr(sorted(self.kwargs.items())),
+            repr(normalize_params(request.query_params)),
+        ]
+        parts.extend(str(generation) for generation, _ in self.get_scope_versions(request))
+        return quote_etag(hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32])
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if request.method not in ("GET", "HEAD") or self.action not in self.conditional_actions:
+            return
+
+        etag = self.get_etag(request)
+        self._validators = (etag,)
+        response = get_conditional_response(request._request, etag=etag)
+        if response is not None:
+            raise _ConditionalResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _ConditionalResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "_validators", None)
+        if validators and response.status_code in (200, 304):
+            (etag,) = validators
+            response.setdefault("ETag", etag)
+            patch_cache_control(response, no_cache=True)
+        return response
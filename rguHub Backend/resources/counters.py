@@ -0,0 +1,99 @@
+"""
+RGU Hub Backend - Subject Material Counters
+
+Helpers for maintaining the denormalized `materials_total` and
+`materials_active` counters on Subject.
+
+The counters are adjusted with F() expressions so concurrent writers never
+overwrite each other's increments. Anything that bypasses model save/delete
+(QuerySet.update, bulk_create, raw SQL) must call `rebuild_material_counters`
+for the affected subjects afterwards.
+
+Functions Overview:
+- apply_material_transition: Adjust counters for a material state change
+- rebuild_material_counters: Recompute counters from SubjectMaterial rows
+- find_counter_drift: Report subjects whose stored counters are wrong
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.db.models import Count, F, Q
+
+from .caching import response_cache
+from .models import Subject
+
+
+def _adjust(subject_id, total, active):
+    if subject_id is None or (total == 0 and active == 0):
+        return
+    Subject.objects.filter(pk=subject_id).update(
+        materials_total=F("materials_total") + total,
+        materials_active=F("materials_active") + active,
+    )
+
+
+def apply_material_transition(previous, current):
+    """
+    Adjust subject counters for a material moving between two states.
+
+    Each state is a `(subject_id, is_active)` tuple, or None when the
+    material did not exist before (create) or no longer exists (delete).
+    Handles creates, deletes, `is_active` flips and re-parenting.
+    """
+    if previous == current:
+        return
+    if previous is not None and current is not None and previous[0] == current[0]:
+        # Same subject, only the active flag changed
+        _adjust(current[0], 0, int(current[1]) - int(previous[1]))
+        return
+    if previous is not None:
+        _adjust(previous[0], -1, -int(previous[1]))
+    if current is not None:
+        _adjust(current[0], 1, int(current[1]))
+
+
+def _counted_subjects(subject_ids=None):
+    qs = Subject.objects.order_by().annotate(
+        actual_total=Count("materials"),
+        actual_active=Count("materials", filter=Q(materials__is_active=True)),
+    )
+    if subject_ids is not None:
+        qs = qs.filter(pk__in=subject_ids)
+    return qs.only("id", "materials_total", "materials_active")
+
+
+def find_counter_drift(subject_ids=None):
+    """
+    Return subjects whose stored counters differ from the real counts.
+
+    Each subject in the result carries `actual_total` and `actual_active`
+    annotations next to the stored `materials_total`/`materials_active`.
+    Runs a single aggregate query.
+    """
+    return [
+        subject
+        for subject in _counted_subjects(subject_ids)
+        if subject.materials_total != subject.actual_total
+        or subject.materials_active != subject.actual_active
+    ]
+
+
+def rebuild_material_counters(subject_ids=None, batch_size=500):
+    """
+    Recompute counters from SubjectMaterial rows and fix any drift.
+
+    Only subjects whose counters are wrong are written back, in batches of
+    `batch_size`. Returns the number of subjects that were corrected.
+    """
+    drifted = find_counter_drift(subject_ids)
+    for subject in drifted:
+        subject.materials_total = subject.actual_total
+        subject.materials_active = subject.actual_active
+    Subject.objects.bulk_update(
+        drifted, ["materials_total", "materials_active"], batch_size=batch_size
+    )
+    if drifted:
+        # bulk_update sends no signals, so expire cached subject listings here
+        response_cache.bump("resources.subject")
+    return len(drifted)
@@ -0,0 +1,59 @@
+"""
+RGU Hub Backend - Material Delivery URLs
+
+Resolves the public download URL of a SubjectMaterial from its stored
+metadata (file name / public_id, resource_type, version).
+
+URLs are built by the storage backend's `delivery_url()` with plain string
+formatting and memoized in a bounded LRU cache. The cache key contains the
+public_id and version, so replacing a material's file resolves a fresh URL
+while the stale entry simply ages out.
+
+Functions Overview:
+- material_url: Delivery URL for a material (or None)
+- stored_material_url: The same from stored column values (values_list rows)
+
+Settings:
+- MATERIAL_URL_CACHE_SIZE: Maximum number of memoized URLs (default 4096)
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+
+
+@lru_cache(maxsize=getattr(settings, "MATERIAL_URL_CACHE_SIZE", 4096))
+def _resolve(storage, public_id, resource_type, version):
+    delivery_url = getattr(storage, "delivery_url", None)
+    if delivery_url is None:
+        return storage.url(public_id)
+    return delivery_url(public_id, resource_type or None, version)
+
+
+def stored_material_url(storage, name, resource_type, version, url):
+    """
+    Return the delivery URL for a material's stored column values.
+
+    Falls back to the stored `url` column when there is no file name.
+    """
+    if not name:
+        return url or None
+    return _resolve(storage, name, resource_type, version)
+
+
+def material_url(material):
+    """
+    Return the delivery URL for a material.
+
+    Falls back to the stored `url` field when the material has no file.
+    """
+    return stored_material_url(
+        material.file.storage, material.file.name, material.resource_type, material.version, material.url
+    )
+
+
+material_url.cache_info = _resolve.cache_info
+material_url.cache_clear = _resolve.cache_clear
@@ -0,0 +1,214 @@
+"""
+RGU Hub Backend - Streaming Material Downloads
+
+Serves SubjectMaterial files as attachments for
+GET /materials/{id}/download/, streamed in fixed-size chunks so memory per
+download stays flat whatever the file size.
+
+Sources:
+- Storages with local paths (LocalMaterialStorage): the file is opened and
+  read chunk by chunk from the requested offset
+- Remote storages (Cloudinary): the delivery URL is fetched with a pooled
+  urllib3 connection, forwarding the Range header, and the upstream body is
+  relayed chunk by chunk
+Under ASGI the chunks are read through an async iterator
+(resources.streaming.stream_body), so files are never buffered whole.
+
+Range Support:
+- A single `Range: bytes=...` range is answered with 206 Partial Content;
+  unsatisfiable ranges get 416, multi-range requests get the full file
+- `If-Range` (ETag or Last-Modified) drops the Range if the file changed
+- The ETag is derived from the stored public_id and version, so
+  If-None-Match / If-Modified-Since revalidation gets 304 without touching
+  storage
+
+Functions Overview:
+- download_filename: Sanitized attachment filename for a material
+- download_response: Build the streaming (or 304/416) response
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import hashlib
+import os
+import re
+
+import urllib3
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from .delivery import material_url
+from .streaming import stream_body
+
+CHUNK_SIZE = 64 * 1024
+
+# Same character policy as the old /api/download proxy
+_UNSAFE_FILENAME = re.compile(r"[^a-zA-Z0-9._-]+")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+_http = urllib3.PoolManager(retries=urllib3.Retry(total=2, redirect=3))
+
+
+def download_filename(material):
+    """Return `<title>.<ext>` with unsafe characters replaced by "_"."""
+    ext = os.path.splitext(material.file.name)[1].lstrip(".").lower() or "pdf"
+    base = material.title or "file"
+    return _UNSAFE_FILENAME.sub("_", f"{base}.{ext}")
+
+
+def _validators(material):
+    stamp = f"{material.file.name}|{material.version or ''}|{material.created_at.timestamp()}"
+    etag = quote_etag(hashlib.sha256(stamp.encode("utf-8")).hexdigest()[:32])
+    last_modified = int(material.version or material.created_at.timestamp())
+    return etag, last_modified
+
+
+def _range_allowed(request, etag, last_modified):
+    """Return False if If-Range names an older version of the file."""
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/"')):
+        # Weak tags never match (strong comparison)
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range `Range` header against a file of `size` bytes.
+
+    Returns `(start, end)` (inclusive), None to serve the whole file, or
+    raises ValueError for an unsatisfiable range.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            # An empty file has no last bytes to send
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+class _FileChunks:
+    """Iterate `length` bytes of an open file from `start`, then close it."""
+
+    def __init__(self, handle, start, length):
+        self.handle, self.remaining = handle, length
+        handle.seek(start)
+
+    def __iter__(self):
+        while self.remaining > 0:
+            chunk = self.handle.read(min(CHUNK_SIZE, self.remaining))
+            if not chunk:
+                break
+            self.remaining -= len(chunk)
+            yield chunk
+
+    def close(self):
+        self.handle.close()
+
+
+class _UpstreamChunks:
+    """Relay an upstream urllib3 response body, releasing the connection at the end."""
+
+    def __init__(self, upstream):
+        self.upstream = upstream
+
+    def __iter__(self):
+        return self.upstream.stream(CHUNK_SIZE)
+
+    def close(self):
+        self.upstream.release_conn()
+
+
+def _local_path(material):
+    try:
+        return material.file.storage.path(material.file.name)
+    except NotImplementedError:
+        return None
+
+
+def _local_response(request, path, use_range):
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        raise Http404("File not found")
+    try:
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), size) if use_range else None
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    length = max(end - start + 1, 0)
+    chunks = _FileChunks(open(path, "rb"), start, length)
+    response = StreamingHttpResponse(stream_body(request, chunks), status=206 if byte_range else 200)
+    response["Content-Length"] = str(length)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+def _remote_response(request, url, use_range):
+    headers = {}
+    if use_range and request.META.get("HTTP_RANGE"):
+        headers["Range"] = request.META["HTTP_RANGE"]
+    try:
+        upstream = _http.request("GET", url, headers=headers, preload_content=False, timeout=urllib3.Timeout(connect=5, read=30))
+    except urllib3.exceptions.HTTPError:
+        return HttpResponse("Upstream unavailable", status=502, content_type="text/plain")
+    if upstream.status not in (200, 206, 416):
+        upstream.release_conn()
+        return HttpResponse(f"Upstream error {upstream.status}", status=502, content_type="text/plain")
+
+    if upstream.status == 416:
+        upstream.release_conn()
+        response = HttpResponse(status=416)
+    else:
+        response = StreamingHttpResponse(stream_body(request, _UpstreamChunks(upstream)), status=upstream.status)
+    for header in ("Content-Length", "Content-Range"):
+        if upstream.headers.get(header):
+            response[header] = upstream.headers[header]
+    return response
+
+
+def download_response(request, material):
+    """
+    Return the download response for `material`.
+
+    `request` is the Django HttpRequest. Handles conditional requests (304),
+    Range/If-Range (206/416) and streams the body from local or remote
+    storage.
+    """
+    etag, last_modified = _validators(material)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        use_range = _range_allowed(request, etag, last_modified)
+        path = _local_path(material)
+        if path is not None:
+            response = _local_response(request, path, use_range)
+        else:
+            response = _remote_response(request, material_url(material), use_range)
+        if response.status_code in (200, 206):
+            response["Content-Type"] = "application/octet-stream"
+            response["Content-Disposition"] = f'attachment; filename="{download_filename(material)}"'
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,224 @@
+"""
+RGU Hub Backend - Sparse Fieldsets and Expansion
+
+Lets list and detail endpoints return only the fields a client asks for,
+and load only those columns.
+
+Query Parameters:
+- fields: Comma-separated field names; nested objects take dotted names
+  (`?fields=id,title,url,material_type.slug`)
+- expand: Comma-separated names of optional related objects to embed
+  (`?expand=subject`); listing an expandable name in `fields` expands it too
+
+Without either parameter the responses are unchanged.
+
+ORM side:
+The serializer fields that will actually be rendered decide the query:
+their sources become `select_related()` joins (relations that are not
+rendered are not joined) and `only()` columns. The view's pagination keys
+are always loaded, since cursors are built from them.
+
+Components Overview:
+- Fieldset: Parsed `fields`/`expand` parameters
+- SparseFieldsetMixin: ModelSerializer mixin applying a Fieldset
+- SparseFieldsetViewMixin: ViewSet mixin parsing the parameters and
+  optimizing get_queryset()
+- optimize_queryset: Restrict a queryset to what a serializer renders
+
+Serializer options (on Meta):
+- expandable_fields: `{name: factory}`, where `factory()` returns the
+  nested serializer embedded when `name` is expanded
+- field_dependencies: `{name: (model paths, ...)}` for fields without a
+  model source, such as SerializerMethodFields
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from dataclasses import dataclass, field
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+SPARSE_ACTIONS = ("list", "retrieve")
+
+
+@dataclass
+class Fieldset:
+    """
+    Requested fields and expansions for one serializer level.
+
+    `fields` maps field names to the Fieldset of a nested serializer (None
+    for "all of it"); `fields` itself is None when every field is wanted.
+    """
+    fields: dict = None
+    expand: set = field(default_factory=set)
+
+    @classmethod
+    def parse(cls, fields=None, expand=None):
+        """Parse the raw `fields`/`expand` parameter values; None if both are blank."""
+        names = [name.strip() for name in (fields or "").split(",") if name.strip()]
+        expanded = {name.strip() for name in (expand or "").split(",") if name.strip()}
+        if not names and not expanded:
+            return None
+        root = cls(fields={} if names else None, expand=expanded)
+        # Whole objects first, so "material_type,material_type.slug" keeps all of it
+        for name in sorted(names, key=lambda name: name.count(".")):
+            level = root
+            head, *rest = name.split(".")
+            while rest and level is not None:
+                if head in level.fields and level.fields[head] is None:
+                    level = None
+                    break
+                nested = level.fields.setdefault(head, cls(fields={}))
+                level, (head, *rest) = nested, rest
+            if level is not None:
+                level.fields.setdefault(head, None)
+        return root
+
+    def nested(self, name):
+        if self.fields is None:
+            return None
+        return self.fields.get(name)
+
+
+class SparseFieldsetMixin:
+    """
+    ModelSerializer mixin that renders only the fields of a Fieldset.
+
+    The Fieldset is read from `context["fieldset"]` for the top-level
+    serializer and handed down to nested SparseFieldsetMixin serializers.
+    Unknown names raise a ValidationError (400).
+    """
+    fieldset = None
+
+    def _current_fieldset(self):
+        parent = getattr(self, "parent", None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is None:
+            return self.context.get("fieldset")
+        return self.fieldset
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self._current_fieldset()
+        if fieldset is None:
+            return fields
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        wanted = set(fieldset.expand) | {name for name in (fieldset.fields or ()) if name in expandable}
+        unknown = wanted - set(expandable)
+        if unknown:
+            raise ValidationError({"expand": f"Cannot expand: {', '.join(sorted(unknown))}"})
+        for name in wanted:
+            fields[name] = expandable[name]()
+
+        if fieldset.fields is not None:
+            unknown = set(fieldset.fields) - set(fields)
+            if unknown:
+                raise ValidationError({"fields": f"Unknown field(s): {', '.join(sorted(unknown))}"})
+            fields = {name: value for name, value in fields.items() if name in fieldset.fields}
+
+        for name, value in fields.items():
+            nested = fieldset.nested(name)
+            if nested is not None:
+                if not isinstance(value, SparseFieldsetMixin):
+                    raise ValidationError({"fields": f"{name} has no nested fields"})
+                value.fieldset = nested
+        return fields
+
+
+def _model_paths(serializer, prefix, paths, joins):
+    """
+    Collect the `only()` paths and `select_related()` joins `serializer`
+    needs. Returns False if some field's requirements are unknown.
+    """
+    model = serializer.Meta.model
+    dependencies = getattr(serializer.Meta, "field_dependencies", {})
+    paths.add(prefix + model._meta.pk.name)
+    complete = True
+    for name, value in serializer.fields.items():
+        if name in dependencies:
+            paths.update(prefix + path for path in dependencies[name])
+            continue
+        if isinstance(value, serializers.BaseSerializer):
+            if not isinstance(value, serializers.ModelSerializer) or len(value.source_attrs) != 1:
+                complete = False
+                continue
+            relation = value.source_attrs[0]
+            joins.add(prefix + relation)
+            paths.add(prefix + relation)
+            complete &= _model_paths(value, f"{prefix}{relation}__", paths, joins)
+            continue
+
+        if not value.source_attrs:
+            # source="*" (e.g. SerializerMethodField) without declared dependencies
+            complete = False
+            continue
+        current, path = model, prefix
+        for index, attr in enumerate(value.source_attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                complete = False
+                break
+            if model_field.is_relation and index + 1 < len(value.source_attrs):
+                joins.add(path + attr)
+                paths.add(path + attr)
+                current, path = model_field.related_model, f"{path}{attr}__"
+            else:
+                paths.add(path + attr)
+                break
+    return complete
+
+
+def optimize_queryset(queryset, serializer, extra_fields=()):
+    """
+    Join and load only what `serializer` (an unbound instance with its
+    context) renders. `extra_fields` are always loaded, e.g. ordering keys.
+
+    Falls back to loading every column, with the joins, if a field's model
+    requirements are unknown.
+    """
+    paths, joins = set(extra_fields), set()
+    complete = _model_paths(serializer, "", paths, joins)
+    if complete:
+        # Joins the response does not render are dropped
+        queryset = queryset.select_related(None).only(*sorted(paths))
+    if joins:
+        queryset = queryset.select_related(*sorted(joins))
+    return queryset
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin for `?fields=` / `?expand=`.
+
+    For list and retrieve, passes the parsed Fieldset to the serializer
+    and restricts get_queryset() to the columns and joins the response
+    needs. Other actions (writes, downloads) are left alone.
+    """
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            params = self.request.query_params
+            self._fieldset = Fieldset.parse(params.get(self.fields_query_param), params.get(self.expand_query_param))
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request is not None and self.action in SPARSE_ACTIONS:
+            context["fieldset"] = self.get_fieldset()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request is None or self.action not in SPARSE_ACTIONS:
+            return queryset
+        ordering = getattr(self.pagination_class, "ordering", ())
+        keys = [name.lstrip("-") for name in ordering]
+        return optimize_queryset(queryset, self.get_serializer(), extra_fields=keys)
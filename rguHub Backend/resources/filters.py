@@ -1,30 +1,101 @@
+"""
+RGU Hub Backend - Query Filters
+
+FilterSets behind the /subjects/ and /materials/ query parameters, so
+clients can fetch exactly the slice they render instead of filtering the
+whole list client-side. Applied by DjangoFilterBackend (the default filter
+backend) on top of the views' own `course`/`sem`/`year` and
+`subject`/`type` parameters.
+
+Indexes:
+Id and number filters resolve through indexed columns: the foreign key
+indexes along Program -> Syllabus -> Term -> Subject -> SubjectMaterial,
+`term_syllabus_type_number` for term type/number, the `material_*_recent`
+indexes for subject, material type and year ranges, `subject_type_idx`,
+and the unique UPPER(short_name) index for program short names. `month`
+and `is_active` are checked on the rows those indexes select.
+
+Components Overview:
+- SubjectFilter: Filters for SubjectViewSet
+- SubjectMaterialFilter: Filters for SubjectMaterialViewSet
+
+Invalid values (e.g. `?term_id=abc`) return 400 with the offending fields.
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
 import django_filters
-from .models import Subject, SubjectMaterial
 
+from .indexes import short_name_matches
+from .models import Subject, SubjectMaterial, Term
 
-class SubjectFilter(django_filters.FilterSet):
-    program_id = django_filters.UUIDFilter(field_name="term_syllabus_program_id")
-    syllabus_id = django_filters.UUIDFilter(field_name="term__syllabus_id")
-    term_id = django_filters.UUIDFilter(field_name="term_id")
-    subject_type = django_filters.CharFilter(field_name="subject_type")
+
+class ProgramFilterMixin:
+    """`?program=BSCN`: case-insensitive program short name."""
+    program_path = None
+
+    def filter_program(self, queryset, name, value):
+        return queryset.filter(short_name_matches(self.program_path, value))
+
+
+class SubjectFilter(ProgramFilterMixin, django_filters.FilterSet):
+    """
+    Query Parameters:
+    - program / program_id: Program short name (case-insensitive) or id
+    - syllabus_id, term_id: Syllabus or term id
+    - term_number, term_type: e.g. `term_number=2&term_type=SEMESTER`
+    - subject_type: THEORY, PRACTICAL or CLINICAL
+    - code: Subject code (e.g. BN101)
+    """
+    program_path = "term__syllabus__program__short_name"
+
+    program = django_filters.CharFilter(method="filter_program")
+    program_id = django_filters.NumberFilter(field_name="term__syllabus__program_id")
+    syllabus_id = django_filters.NumberFilter(field_name="term__syllabus_id")
+    term_id = django_filters.NumberFilter(field_name="term_id")
+    term_number = django_filters.NumberFilter(field_name="term__term_number")
+    term_type = django_filters.ChoiceFilter(field_name="term__term_type", choices=Term.TermType.choices)
+    subject_type = django_filters.ChoiceFilter(field_name="subject_type", choices=Subject.SubjectType.choices)
 
     class Meta:
         model = Subject
-        fields = ["program_id", "syllabus_id", "term_id", "subject_type", "code", "name"]
+        fields = [
+            "program", "program_id", "syllabus_id", "term_id", "term_number", "term_type", "subject_type", "code",
+        ]
+
 
+class SubjectMaterialFilter(ProgramFilterMixin, django_filters.FilterSet):
+    """
+    Query Parameters:
+    - program / program_id: Program short name (case-insensitive) or id
+    - syllabus_id, term_id, subject_id, material_type_id: Ids along the catalog
+    - term_number, term_type: e.g. `term_number=2&term_type=SEMESTER`
+    - subject_type: THEORY, PRACTICAL or CLINICAL
+    - year, year_min, year_max: Exact year or inclusive year range
+    - month: Month name as stored (e.g. July)
+    - is_active: true / false
+    """
+    program_path = "subject__term__syllabus__program__short_name"
 
-class SubjectMaterialFilter(django_filters.FilterSet):
-    program_id = django_filters.UUIDFilter(field_name="subject_termsyllabus_program_id")
-    syllabus_id = django_filters.UUIDFilter(field_name="subject_term_syllabus_id")
-    term_number = django_filters.NumberFilter(field_name="subject_term_term_number")
-    term_type = django_filters.ChoiceFilter(
-        field_name="subject_term_term_type",
-        choices=(
-            ("SEMESTER", "Semester"),
-            ("YEAR", "Year"),
-        ),
-    )
+    program = django_filters.CharFilter(method="filter_program")
+    program_id = django_filters.NumberFilter(field_name="subject__term__syllabus__program_id")
+    syllabus_id = django_filters.NumberFilter(field_name="subject__term__syllabus_id")
+    term_id = django_filters.NumberFilter(field_name="subject__term_id")
+    term_number = django_filters.NumberFilter(field_name="subject__term__term_number")
+    term_type = django_filters.ChoiceFilter(field_name="subject__term__term_type", choices=Term.TermType.choices)
+    subject_id = django_filters.NumberFilter(field_name="subject_id")
+    subject_type = django_filters.ChoiceFilter(field_name="subject__subject_type", choices=Subject.SubjectType.choices)
+    material_type_id = django_filters.NumberFilter(field_name="material_type_id")
+    year = django_filters.NumberFilter(field_name="year")
+    year_min = django_filters.NumberFilter(field_name="year", lookup_expr="gte")
+    year_max = django_filters.NumberFilter(field_name="year", lookup_expr="lte")
+    month = django_filters.CharFilter(field_name="month")
+    is_active = django_filters.BooleanFilter(field_name="is_active")
 
     class Meta:
         model = SubjectMaterial
-        fields = ["program_id", "syllabus_id", "term_number", "term_type"]
\ No newline at end of file
+        fields = [
+            "program", "program_id", "syllabus_id", "term_id", "term_number", "term_type", "subject_id",
+            "subject_type", "material_type_id", "year", "year_min", "year_max", "month", "is_active",
+        ]
@@ -0,0 +1,90 @@
+"""
+RGU Hub Backend - Portable Index Definitions
+
+Index and filter helpers for the hot API access paths, working the same on
+SQLite and PostgreSQL.
+
+Components Overview:
+- OrderedIndex: Index over ordering expressions with NULLS FIRST/LAST
+- short_name_matches: Index-friendly case-insensitive program filter
+- plan_regressions: Unindexed scans and sorts in a query's plan
+
+NULL ordering:
+Keyset pagination sorts nullable keys with NULLS LAST (resources.pagination).
+PostgreSQL needs the same modifier on the index to walk it in that order
+(its descending indexes put NULLs first). SQLite rejects the modifier in
+CREATE INDEX but already sorts NULLs last in descending order (and first in
+ascending order), so OrderedIndex drops modifiers that match that default.
+
+Case-insensitive program filters:
+`short_name__iexact` compiles to LIKE on SQLite, which cannot use an
+expression index. short_name_matches() compares UPPER(short_name) instead,
+which the unique `program_short_name_upper` index covers on both backends.
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.db import connections, models
+from django.db.models.expressions import OrderBy
+from django.db.models.functions import Upper
+from django.db.models.lookups import Exact
+
+
+def _sqlite_order(expression):
+    if not isinstance(expression, OrderBy) or not (expression.nulls_first or expression.nulls_last):
+        return expression
+    if expression.nulls_last != expression.descending:
+        raise ValueError(f"SQLite indexes cannot express {expression!r}")
+    return OrderBy(expression.expression, descending=expression.descending)
+
+
+class OrderedIndex(models.Index):
+    """
+    Index over ordering expressions, e.g.
+    `OrderedIndex(F("year").desc(nulls_last=True), F("created_at").desc(), "id", name=...)`.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor == "sqlite":
+            _, args, options = self.deconstruct()
+            index = models.Index(*[_sqlite_order(expression) for expression in args], **options)
+            return index.create_sql(model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
+def short_name_matches(path, short_name):
+    """
+    Filter expression for a case-insensitive program short name match, e.g.
+    `Recruitment.objects.filter(short_name_matches("program__short_name", "bscn"))`.
+    """
+    return Exact(Upper(path), short_name.upper())
+
+
+def plan_regressions(sql, params=None, using="default", allow_sort=False):
+    """
+    Return the steps of a query plan that read a whole table without an
+    index, or (unless `allow_sort`) sort rows because no index matches the
+    ordering. Uses EXPLAIN QUERY PLAN on SQLite and EXPLAIN on PostgreSQL.
+    Used by the query plan regression tests.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Small tables are cheaper to scan; ask for the indexed plan, then
+            # restore the setting for the rest of the transaction (a failed
+            # EXPLAIN aborts the transaction, which rolls the SET LOCAL back)
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql, params)
+            steps = [row[0].strip() for row in cursor.fetchall()]
+            cursor.execute("RESET enable_seqscan")
+            return [
+                step for step in steps
+                if "Seq Scan" in step or (not allow_sort and step.lstrip("-> ").startswith(("Sort", "Incremental Sort")))
+            ]
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        steps = [row[-1] for row in cursor.fetchall()]
+    return [
+        step for step in steps
+        if (step.startswith("SCAN ") and " INDEX " not in step) or (not allow_sort and "TEMP B-TREE" in step)
+    ]
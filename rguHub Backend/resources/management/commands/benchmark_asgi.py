@@ -0,0 +1,97 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from resources.benchmark import environment, run_server_benchmark
+from resources.synthetic import dataset_counts, generate, remove_synthetic_data
+
+from .generate_synthetic_data import add_scale_arguments, scale_from_options
+
+
+class Command(BaseCommand):
+    help = (
+        'Load the hot list endpoints (/materials/, /subjects/, /recruitments/, /latest-updates/) '
+        'through the WSGI handler (sync viewsets, threads) and the ASGI handler (async views), '
+        'with the same worker and concurrency counts, and compare requests/sec and latency. '
+        'With --scale, synthetic data is generated first (and removed afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        add_scale_arguments(parser, default=None)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Worker processes per stack (default: 2)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Concurrent requests per worker: WSGI threads / ASGI in-flight requests (default: 8)',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=10.0,
+            help='Duration of each run in seconds (default: 10)',
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Turn the response cache off, so every request reaches the database',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON results to this file (default: stdout)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the generated synthetic data',
+        )
+
+    def handle(self, *args, **options):
+        if options['scale']:
+            remove_synthetic_data()
+            self.stderr.write(f'Generating {options["scale"]} dataset...')
+            generate(scale_from_options(options), seed=options['seed'], batch_size=max(options['batch_size'], 1))
+
+        self.stderr.write(
+            f'Running WSGI and ASGI for {options["seconds"]:g}s each '
+            f'({options["workers"]} workers x {options["concurrency"]} concurrent requests)...'
+        )
+        try:
+            result = run_server_benchmark(
+                workers=options['workers'],
+                concurrency=options['concurrency'],
+                seconds=options['seconds'],
+                cache=not options['no_cache'],
+            )
+            dataset = dataset_counts()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if options['scale'] and not options['keep']:
+                remove_synthetic_data()
+
+        for name, run in result['runs'].items():
+            self.stderr.write(
+                f'  {name:<5} {run["requests"]:>7} requests ({run["per_second"]:>8.1f}/s)  '
+                f'p50 {run["p50_ms"] or 0:>8.2f}ms  p99 {run["p99_ms"] or 0:>8.2f}ms  '
+                f'errors {sum(run["errors"].values())}'
+            )
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": environment(),
+            "dataset": dataset,
+            "result": result,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,89 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from resources.benchmark import benchmark_cases, environment, run_benchmark
+from resources.synthetic import SCALES, dataset_counts, generate, remove_synthetic_data
+
+from .generate_synthetic_data import add_scale_arguments, scale_from_options
+
+
+class Command(BaseCommand):
+    help = (
+        'Time every API endpoint (cold and warm) and record query counts as JSON. '
+        'With --scale, synthetic data of each scale is generated first (and removed afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        add_scale_arguments(parser, default=None)
+        parser.add_argument(
+            '--scales',
+            help='Comma-separated scale presets to run in turn, e.g. "small,medium,large"',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of warm requests per endpoint',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON results to this file (default: stdout)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the synthetic data of the last scale',
+        )
+
+    def handle(self, *args, **options):
+        scales = [name.strip() for name in (options['scales'] or '').split(',') if name.strip()]
+        if options['scale']:
+            scales.append(options['scale'])
+        unknown = set(scales) - set(SCALES)
+        if unknown:
+            raise CommandError(f'Unknown scale(s): {", ".join(sorted(unknown))}')
+
+        runs = []
+        if not scales:
+            runs.append(self.run(None, None, options))
+        for index, name in enumerate(scales):
+            remove_synthetic_data()
+            scale = scale_from_options(dict(options, scale=name))
+            self.stderr.write(f'Generating {name} dataset...')
+            seconds = generate(scale, seed=options['seed'], batch_size=max(options['batch_size'], 1))
+            runs.append(self.run(name, seconds, options))
+            if index == len(scales) - 1 and not options['keep']:
+                remove_synthetic_data()
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": environment(),
+            "runs": runs,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+    def run(self, scale, generation_seconds, options):
+        self.stderr.write(f'Benchmarking {scale or "current"} dataset...')
+        started = time.monotonic()
+        endpoints = run_benchmark(benchmark_cases(), repeat=options['repeat'])
+        for result in endpoints:
+            self.stderr.write(
+                f'  {result["name"]:<28} {result["status"]}  cold {result["cold"]["ms"]:>9.2f}ms '
+                f'({result["cold"]["queries"]} queries)  warm median {result["warm"]["median_ms"]:>9.2f}ms '
+                f'({result["warm"]["queries"]} queries)'
+            )
+        return {
+            "scale": scale,
+            "dataset": dataset_counts(),
+            "generation_seconds": round(generation_seconds, 3) if generation_seconds is not None else None,
+            "benchmark_seconds": round(time.monotonic() - started, 3),
+            "endpoints": endpoints,
+        }
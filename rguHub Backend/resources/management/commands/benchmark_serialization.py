@@ -0,0 +1,83 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from resources.benchmark import environment, run_renderer_benchmark, run_serialization_benchmark
+from resources.synthetic import dataset_counts, generate, remove_synthetic_data
+
+from .generate_synthetic_data import add_scale_arguments, scale_from_options
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare serializer-based and values_list() row-based rendering of the /materials/ and '
+        '/recruitments/ lists (and check both produce identical JSON), and the encode time and '
+        'size of every response format. '
+        'With --scale, synthetic data is generated first (and removed afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        add_scale_arguments(parser, default=None)
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10_000,
+            help='Number of rows rendered per list (default: 10000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of timed renders per path',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON results to this file (default: stdout)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the generated synthetic data',
+        )
+
+    def handle(self, *args, **options):
+        if options['scale']:
+            remove_synthetic_data()
+            self.stderr.write(f'Generating {options["scale"]} dataset...')
+            generate(scale_from_options(options), seed=options['seed'], batch_size=max(options['batch_size'], 1))
+        try:
+            results = run_serialization_benchmark(rows=max(options['rows'], 1), repeat=options['repeat'])
+            renderers = run_renderer_benchmark(rows=max(options['rows'], 1), repeat=options['repeat'])
+            dataset = dataset_counts()
+        finally:
+            if options['scale'] and not options['keep']:
+                remove_synthetic_data()
+
+        for result in results:
+            self.stderr.write(
+                f'  {result["name"]:<14} {result["rows"]:>7} rows  serializer {result["serializer"]["median_ms"]:>9.2f}ms  '
+                f'values_list {result["values_list"]["median_ms"]:>9.2f}ms  x{result["speedup"]}'
+                f'{"" if result["identical"] else "  OUTPUT DIFFERS"}'
+            )
+
+        for result in renderers:
+            for format_name, timing in result["formats"].items():
+                self.stderr.write(
+                    f'  {result["name"]:<14} {format_name:<8} encode {timing["encode_median_ms"]:>9.2f}ms  '
+                    f'{timing["bytes"]:>10} bytes  {timing["gzip_bytes"]:>9} gzipped'
+                )
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": environment(),
+            "dataset": dataset,
+            "results": results,
+            "renderers": renderers,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        else:
+            self.stdout.write(output)
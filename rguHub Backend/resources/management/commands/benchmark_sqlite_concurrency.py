@@ -0,0 +1,118 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+from resources.benchmark import SQLITE_DEFAULT_PRAGMAS, environment, run_sqlite_concurrency_benchmark
+from resources.synthetic import dataset_counts, generate, remove_synthetic_data
+from rguHub.db import sqlite_pragmas
+
+from .generate_synthetic_data import add_scale_arguments, scale_from_options
+
+
+class Command(BaseCommand):
+    help = (
+        'Run reader processes against /materials/ while writer processes create materials in '
+        'read-then-write transactions: with SQLite defaults, with the tuned SQLite mode (WAL, '
+        'synchronous=NORMAL, busy timeout, page cache, mmap) and DEFERRED transactions, and with the '
+        'tuned mode and BEGIN IMMEDIATE. Compares throughput, latency and "database is locked" '
+        'errors. With --scale, synthetic data is generated first (and removed afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        add_scale_arguments(parser, default=None)
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=8,
+            help='Number of concurrent reader processes (default: 8)',
+        )
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=2,
+            help='Number of concurrent writer processes (default: 2)',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=10.0,
+            help='Duration of each run in seconds (default: 10)',
+        )
+        parser.add_argument(
+            '--write-batch',
+            type=int,
+            default=1,
+            help='Materials created per write transaction (default: 1, like admin uploads)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON results to this file (default: stdout)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the generated synthetic data',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark needs the SQLite database (unset DATABASE_URL)')
+        if options['scale']:
+            remove_synthetic_data()
+            self.stderr.write(f'Generating {options["scale"]} dataset...')
+            generate(scale_from_options(options), seed=options['seed'], batch_size=max(options['batch_size'], 1))
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            original_journal_mode = cursor.fetchone()[0]
+        runs = {}
+        try:
+            settings_runs = (
+                ('default', SQLITE_DEFAULT_PRAGMAS, False),
+                ('deferred', sqlite_pragmas(), False),
+                ('tuned', sqlite_pragmas(), True),
+            )
+            for name, pragmas, immediate in settings_runs:
+                self.stderr.write(f'Running {name} settings for {options["seconds"]:g}s...')
+                runs[name] = run_sqlite_concurrency_benchmark(
+                    pragmas,
+                    readers=options['readers'],
+                    seconds=options['seconds'],
+                    write_batch=options['write_batch'],
+                    writers=options['writers'],
+                    immediate=immediate,
+                )
+            dataset = dataset_counts()
+        finally:
+            if not getattr(settings, 'DATABASE_SQLITE_TUNED', False):
+                # WAL mode persists in the file; put back what the deployment uses
+                connections.close_all()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'PRAGMA journal_mode = {original_journal_mode}')
+            if options['scale'] and not options['keep']:
+                remove_synthetic_data()
+
+        for name, result in runs.items():
+            reads, writes = result['reads'], result['writes']
+            self.stderr.write(
+                f'  {name:<8} reads {reads["requests"]:>7} ({reads["per_second"]:>8.1f}/s, '
+                f'p95 {reads["p95_ms"] or 0:>8.2f}ms, errors {sum(reads["errors"].values())})  '
+                f'writes {writes["materials"]:>6} ({writes["per_second"]:>6.1f} tx/s, '
+                f'p95 {writes["p95_ms"] or 0:>8.2f}ms, errors {sum(writes["errors"].values())})'
+            )
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": environment(),
+            "dataset": dataset,
+            "runs": runs,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        else:
+            self.stdout.write(output)
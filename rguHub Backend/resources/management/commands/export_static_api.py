@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from resources.static_export import export_static_api
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the public read endpoints (/subjects/, /materials/, /material-types/, /recruitments/, '
+        '/latest-updates/) and their filter combinations into static JSON files for CDN/edge serving. '
+        'Only the files affected by changes since the last export are re-rendered'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Export directory (created if missing)')
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Re-render every file, e.g. after writes that bypass model signals',
+        )
+
+    def handle(self, *args, **options):
+        result = export_static_api(options['directory'], full=options['full'])
+        for failure in result['failed']:
+            self.stderr.write(
+                f'Skipped {failure["path"]} {failure["params"]}: HTTP {failure["status"]}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Full" if result["full"] else "Incremental"} export to {options["directory"]}: '
+            f'{result["partitions"]} partitions rendered, {result["written"]} files written, '
+            f'{result["unchanged"]} unchanged, {result["deleted"]} deleted'
+        ))
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from resources.synthetic import SCALES, Scale, dataset_counts, generate, remove_synthetic_data, synthetic_programs
+
+
+def scale_from_options(options):
+    """The named --scale preset with any explicit count overrides applied."""
+    preset = SCALES[options['scale']]
+    return Scale(**{
+        name: options[name] if options.get(name) is not None else getattr(preset, name)
+        for name in preset.__dataclass_fields__
+    })
+
+
+def add_scale_arguments(parser, default='small'):
+    parser.add_argument(
+        '--scale',
+        choices=sorted(SCALES),
+        default=default,
+        help='Dataset size preset' + (f' (default: {default})' if default else ''),
+    )
+    for name, help_text in (
+        ('programs', 'Number of programs'),
+        ('syllabi', 'Syllabi per program'),
+        ('terms', 'Terms per syllabus'),
+        ('subjects', 'Subjects per term'),
+        ('materials', 'Total number of materials'),
+        ('recruitments', 'Total number of job postings'),
+    ):
+        parser.add_argument(f'--{name}', type=int, help=f'{help_text} (overrides the preset)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same data)')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=5000,
+        help='Number of materials/postings inserted per transaction',
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic dataset (programs, syllabi, terms, subjects, materials, job postings) '
+        'for load testing and benchmarks; synthetic programs are flagged is_synthetic'
+    )
+
+    def add_arguments(self, parser):
+        add_scale_arguments(parser)
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Delete existing synthetic data first',
+        )
+        parser.add_argument(
+            '--remove',
+            action='store_true',
+            help='Only delete existing synthetic data',
+        )
+
+    def handle(self, *args, **options):
+        if options['flush'] or options['remove']:
+            removed = remove_synthetic_data()
+            self.stdout.write(f'Removed {removed} synthetic programs and their data')
+            if options['remove']:
+                return
+        elif synthetic_programs().exists():
+            raise CommandError('Synthetic data already exists; use --flush to replace it')
+
+        scale = scale_from_options(options)
+        self.stdout.write(
+            f'Generating {scale.programs} programs, {scale.subject_total} subjects, '
+            f'{scale.materials} materials and {scale.recruitments} job postings'
+        )
+        seconds = generate(
+            scale,
+            seed=options['seed'],
+            batch_size=max(options['batch_size'], 1),
+            on_progress=lambda label, done, total: self.stdout.write(f'  {label}: {done}/{total}'),
+        )
+        for label, count in dataset_counts().items():
+            self.stdout.write(f'  {label}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Synthetic data generated in {seconds:.1f}s'))
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from resources.ingest import IngestError, ProgressLog, ingest, read_source, resolve_entries
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-upload study materials from a directory (<subject>/[<type>/]<file>) '
+        'or a CSV/JSON manifest (file, subject, type, year, month, description, is_active)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Directory or .csv/.json manifest')
+        parser.add_argument(
+            '--type',
+            dest='default_type',
+            help='Material type slug for directory files not inside a <type> folder',
+        )
+        parser.add_argument(
+            '--program',
+            help='Only match subject codes within this program short name',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of concurrent uploads',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of materials uploaded and inserted per batch',
+        )
+        parser.add_argument(
+            '--progress-file',
+            help='Progress log used to resume interrupted runs '
+                 '(default: .ingest-progress.jsonl in the source directory)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only validate the source and report what would be ingested',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            root, rows = read_source(options['source'], options['default_type'])
+        except (IngestError, OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        entries, errors = resolve_entries(root, rows, program=options['program'])
+        for key, reason in errors:
+            self.stderr.write(f'Skipping {key or "<blank>"}: {reason}')
+        self.stdout.write(f'{len(entries)} files to ingest, {len(errors)} rejected')
+        if options['dry_run'] or not entries:
+            return
+
+        progress_path = options['progress_file'] or Path(root) / '.ingest-progress.jsonl'
+        progress = ProgressLog(progress_path)
+        if progress.records:
+            self.stdout.write(f'Resuming from {progress_path} ({len(progress.records)} files recorded)')
+
+        stats = ingest(
+            entries,
+            progress,
+            workers=options['workers'],
+            batch_size=max(options['batch_size'], 1),
+            on_batch=lambda stats: self.stdout.write(f'  {stats.summary()}'),
+        )
+        for key, reason in stats.failed:
+            self.stderr.write(f'Failed {key}: {reason}')
+
+        if stats.failed:
+            raise CommandError(f'{stats.summary()}; rerun the command to retry failed files')
+        self.stdout.write(self.style.SUCCESS(f'Done: {stats.summary()}'))
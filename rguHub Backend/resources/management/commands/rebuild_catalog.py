@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from resources.catalog import rebuild_snapshots
+from resources.models import CatalogSnapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the stored /catalog/ trees (CatalogSnapshot) that are stale or missing, '
+        'e.g. after deploying or after writes that bypass model signals'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--program',
+            action='append',
+            dest='programs',
+            help='Only rebuild the given program short name; may be repeated',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild the snapshots even if they look fresh',
+        )
+
+    def handle(self, *args, **options):
+        names = set(options['programs']) if options['programs'] else None
+        if options['force']:
+            snapshots = CatalogSnapshot.objects.all()
+            if names is not None:
+                snapshots = snapshots.filter(program__short_name__in=names)
+            snapshots.update(built_revision=None)
+        stored = rebuild_snapshots(names)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {stored} catalog snapshots'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from resources.counters import find_counter_drift, rebuild_material_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized material counters on Subject, or check them for drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drifted subjects; exit with an error if any are found',
+        )
+        parser.add_argument(
+            '--subject',
+            action='append',
+            type=int,
+            dest='subject_ids',
+            help='Limit to the given subject id (may be repeated)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of subjects written per UPDATE batch',
+        )
+
+    def handle(self, *args, **options):
+        subject_ids = options['subject_ids']
+
+        if options['check']:
+            drifted = find_counter_drift(subject_ids)
+            for subject in drifted:
+                self.stdout.write(
+                    f'Subject {subject.pk}: total {subject.materials_total} != {subject.actual_total} '
+                    f'or active {subject.materials_active} != {subject.actual_active}'
+                )
+            if drifted:
+                raise CommandError(f'{len(drifted)} subjects have drifted material counters')
+            self.stdout.write(self.style.SUCCESS('Material counters are consistent'))
+            return
+
+        fixed = rebuild_material_counters(subject_ids, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt material counters for {fixed} subjects'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from resources.search import rebuild_index, registered_kinds
+
+
+class Command(BaseCommand):
+    help = 'Rebuild (backfill) the full-text search index for materials, subjects and recruitments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            action='append',
+            dest='kinds',
+            help='Only rebuild the given kind (material, subject, recruitment); may be repeated',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of documents written per batch',
+        )
+
+    def handle(self, *args, **options):
+        kinds = registered_kinds()
+        if options['kinds']:
+            unknown = set(options['kinds']) - {kind.name for kind in kinds}
+            if unknown:
+                raise CommandError(f'Unknown kind(s): {", ".join(sorted(unknown))}')
+            kinds = [kind for kind in kinds if kind.name in options['kinds']]
+
+        counts = rebuild_index(batch_size=options['batch_size'], kinds=kinds)
+        for name, count in counts.items():
+            self.stdout.write(f'Indexed {count} {name} documents')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
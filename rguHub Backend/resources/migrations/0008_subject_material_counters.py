@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_counters(apps, schema_editor):
+    Subject = apps.get_model('resources', 'Subject')
+    subjects = Subject.objects.order_by().annotate(
+        actual_total=Count('materials'),
+        actual_active=Count('materials', filter=Q(materials__is_active=True)),
+    )
+    updated = []
+    for subj in subjects:
+        subj.materials_total = subj.actual_total
+        subj.materials_active = subj.actual_active
+        updated.append(subj)
+    Subject.objects.bulk_update(updated, ['materials_total', 'materials_active'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0007_alter_subjectmaterial_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='materials_total',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of linked materials'),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='materials_active',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active linked materials'),
+        ),
+        migrations.RunPython(populate_counters, reverse_code=migrations.RunPython.noop),
+    ]
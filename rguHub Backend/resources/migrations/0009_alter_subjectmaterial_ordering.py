@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0008_subject_material_counters'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='subjectmaterial',
+            options={'ordering': ['-year', '-created_at', 'id']},
+        ),
+    ]
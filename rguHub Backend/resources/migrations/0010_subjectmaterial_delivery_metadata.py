@@ -0,0 +1,27 @@
+from django.db import migrations, models
+import resources.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0009_alter_subjectmaterial_ordering'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subjectmaterial',
+            name='file',
+            field=models.FileField(storage=resources.storage.material_storage, upload_to='materials/'),
+        ),
+        migrations.AddField(
+            model_name='subjectmaterial',
+            name='resource_type',
+            field=models.CharField(blank=True, editable=False, help_text='Cloudinary resource type (image/raw/video)', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='subjectmaterial',
+            name='version',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, help_text='Cloudinary version of the uploaded file', null=True),
+        ),
+    ]
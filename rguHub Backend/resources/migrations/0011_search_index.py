@@ -0,0 +1,48 @@
+"""Create the full-text search index table (FTS5 on SQLite, tsvector/GIN on PostgreSQL).
+
+Run `python manage.py rebuild_search_index` afterwards to backfill existing rows.
+"""
+from django.db import migrations
+
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS resources_searchindex USING fts5("
+    "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS resources_searchindex ("
+    "id bigint PRIMARY KEY, "
+    "title text NOT NULL DEFAULT '', "
+    "body text NOT NULL DEFAULT '', "
+    "document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(body, '')), 'B')) STORED)",
+    "CREATE INDEX IF NOT EXISTS resources_searchindex_document_gin "
+    "ON resources_searchindex USING gin (document)",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == 'postgresql':
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS resources_searchindex")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0010_subjectmaterial_delivery_metadata'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, reverse_code=drop_index),
+    ]
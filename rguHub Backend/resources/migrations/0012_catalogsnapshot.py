@@ -0,0 +1,26 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0011_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogSnapshot',
+            fields=[
+                ('program', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='catalog_snapshot', serialize=False, to='resources.program')),
+                ('tree', models.JSONField(blank=True, null=True)),
+                ('revision', models.PositiveBigIntegerField(default=0)),
+                ('built_revision', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Catalog Snapshot',
+                'verbose_name_plural': 'Catalog Snapshots',
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_materials(apps, schema_editor):
+    Activity = apps.get_model('resources', 'Activity')
+    SubjectMaterial = apps.get_model('resources', 'SubjectMaterial')
+    rows = (
+        Activity(
+            kind='material',
+            object_id=material_id,
+            program_id=program_id,
+            title=title,
+            created_at=created_at,
+        )
+        for material_id, program_id, title, created_at in SubjectMaterial.objects.values_list(
+            'id', 'subject__term__syllabus__program_id', 'title', 'created_at'
+        ).iterator()
+    )
+    Activity.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0012_catalogsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Activity',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('material', 'Material'), ('recruitment', 'Recruitment')], max_length=16)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=512)),
+                ('created_at', models.DateTimeField()),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='resources.program')),
+            ],
+            options={
+                'verbose_name': 'Activity Feed Entry',
+                'verbose_name_plural': 'Activity Feed',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [
+                    models.Index(fields=['program', '-created_at', '-id'], name='activity_program_recent'),
+                    models.Index(fields=['-created_at', '-id'], name='activity_recent'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('kind', 'object_id'), name='activity_unique_object'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_materials, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations, models
+import django.db.models.functions.text
+import resources.indexes
+
+
+def dedupe_short_names(apps, schema_editor):
+    """
+    Rename short names that differ from an older program's only in case
+    ("BSCN" and "bscn"), so the unique UPPER(short_name) constraint can be
+    added. The oldest program keeps its short name; each later one gets
+    "<short_name>-<n>", with the first free n from its id up.
+    """
+    Program = apps.get_model('resources', 'Program')
+    programs = list(Program.objects.order_by('id'))
+    taken = {program.short_name.upper() for program in programs}
+    seen = set()
+    renamed = []
+    for program in programs:
+        key = program.short_name.upper()
+        if key in seen:
+            counter = program.pk
+            while True:
+                suffix = f'-{counter}'
+                short_name = program.short_name[:50 - len(suffix)] + suffix
+                if short_name.upper() not in taken:
+                    break
+                counter += 1
+            taken.add(short_name.upper())
+            program.short_name = short_name
+            renamed.append(program)
+        seen.add(key)
+    Program.objects.bulk_update(renamed, ['short_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0013_activity'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_short_names, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='program',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('short_name'), name='program_short_name_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='term',
+            index=models.Index(fields=['syllabus', 'term_type', 'term_number'], name='term_syllabus_type_number'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectmaterial',
+            index=resources.indexes.OrderedIndex(models.OrderBy(models.F('year'), descending=True, nulls_last=True), models.OrderBy(models.F('created_at'), descending=True), models.F('id'), name='material_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectmaterial',
+            index=resources.indexes.OrderedIndex(models.F('subject'), models.OrderBy(models.F('year'), descending=True, nulls_last=True), models.OrderBy(models.F('created_at'), descending=True), models.F('id'), name='material_subject_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectmaterial',
+            index=resources.indexes.OrderedIndex(models.F('material_type'), models.OrderBy(models.F('year'), descending=True, nulls_last=True), models.OrderBy(models.F('created_at'), descending=True), models.F('id'), name='material_type_recent'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0015_subject_type_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaticExportPartition',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('revision', models.PositiveBigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Static Export Partition',
+                'verbose_name_plural': 'Static Export Partitions',
+            },
+        ),
+    ]
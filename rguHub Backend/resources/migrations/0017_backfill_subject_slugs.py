@@ -0,0 +1,59 @@
+"""Give every Subject still without a slug a unique one.
+
+0003 saved historical models, which do not run Subject.save(), so it never
+generated slugs. Slugs are allocated here in one batch: one query for term
+details, one for the existing slugs that could clash, then bulk_update.
+The logic is inlined (historical models only) so later changes to
+resources.slugs cannot change what this migration does.
+"""
+from django.db import migrations
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+def slug_base(program, term_number, code, name):
+    parts = [str(part) for part in (program, term_number) if part is not None]
+    parts.append(code or name)
+    return slugify('-'.join(parts)) or slugify(code or name) or 'subject'
+
+
+def backfill_slugs(apps, schema_editor):
+    Subject = apps.get_model('resources', 'Subject')
+    Term = apps.get_model('resources', 'Term')
+    subjects = list(Subject.objects.filter(slug=''))
+    if not subjects:
+        return
+
+    terms = {
+        term_id: (program, number)
+        for term_id, program, number in Term.objects.filter(
+            pk__in={subject.term_id for subject in subjects}
+        ).values_list('id', 'syllabus__program__short_name', 'term_number')
+    }
+    bases = [
+        slug_base(*terms.get(subject.term_id, (None, None)), subject.code, subject.name)
+        for subject in subjects
+    ]
+    prefixes = Q()
+    for base in set(bases):
+        prefixes |= Q(slug=base) | Q(slug__startswith=f'{base}-')
+    taken = set(Subject.objects.filter(prefixes).values_list('slug', flat=True))
+
+    for subject, base in zip(subjects, bases):
+        slug, counter = base, 2
+        while slug in taken:
+            slug, counter = f'{base}-{counter}', counter + 1
+        taken.add(slug)
+        subject.slug = slug
+    Subject.objects.bulk_update(subjects, ['slug'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0016_staticexportpartition'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slugs, reverse_code=migrations.RunPython.noop),
+    ]
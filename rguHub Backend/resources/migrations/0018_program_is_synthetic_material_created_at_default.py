@@ -0,0 +1,22 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0017_backfill_subject_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='program',
+            name='is_synthetic',
+            field=models.BooleanField(default=False, editable=False, help_text='Generated load-testing data'),
+        ),
+        migrations.AlterField(
+            model_name='subjectmaterial',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Upload timestamp'),
+        ),
+    ]
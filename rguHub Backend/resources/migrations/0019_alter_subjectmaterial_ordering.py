@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0018_program_is_synthetic_material_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='subjectmaterial',
+            options={'ordering': [models.OrderBy(models.F('year'), descending=True, nulls_last=True), '-created_at', 'id']},
+        ),
+    ]
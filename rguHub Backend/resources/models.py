@@ -11,6 +11,9 @@ Models Overview:
 - Subject: Individual subjects within terms
 - MaterialType: Types of study materials (Notes, PYQ, etc.)
 - SubjectMaterial: Actual study material files stored in Cloudinary
+- CatalogSnapshot: Precomputed /catalog/ tree per program
+- Activity: Append-only feed of new materials and job postings
+- StaticExportPartition: Change counters behind the static JSON export
 
 Database Relationships:
 Program -> Syllabus -> Term -> Subject -> SubjectMaterial
@@ -20,9 +23,15 @@ Author: RGU Hub Development Team
 Last Updated: 2025
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Upper
+from django.utils import timezone
 from django.utils.text import slugify
 
+from .indexes import OrderedIndex
+from .slugs import assign_subject_slugs, write_with_slug_retry
+
 
 class Program(models.Model):
     """
@@ -38,20 +47,32 @@ class Program(models.Model):
     - name: Full program name (e.g., "Bachelor of Science in Nursing")
     - short_name: Abbreviated name for URLs/filtering (e.g., "BSCN")
     - duration_years: Program duration in years
+    - is_synthetic: Created by generate_synthetic_data (resources.synthetic),
+      which deletes only flagged programs
     
     Usage in API:
     - GET /subjects/?course=BSCN - Filter subjects by program
     - GET /recruitments/?program=BSCN - Filter jobs by program
+
+    Indexes:
+    - Unique UPPER(short_name) for case-insensitive filters
+      (resources.indexes.short_name_matches); being unique, the planner
+      knows a filter matches one program and can read the joined table's
+      (program, ...) index in order
     """
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=255, unique=True, help_text="Full program name")
     short_name = models.CharField(max_length=50, unique=True, help_text="Short code for API filtering")
     duration_years = models.PositiveSmallIntegerField(help_text="Program duration in years")
+    is_synthetic = models.BooleanField(default=False, editable=False, help_text="Generated load-testing data")
 
     class Meta:
         ordering = ["name"]
         verbose_name = "Academic Program"
         verbose_name_plural = "Academic Programs"
+        constraints = [
+            models.UniqueConstraint(Upper("short_name"), name="program_short_name_upper"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name}"
@@ -113,6 +134,9 @@ class Term(models.Model):
     Usage in API:
     - GET /subjects/?course=BSCN&sem=1 - Get 1st semester subjects
     - GET /subjects/?course=BSCN&year=1 - Get 1st year subjects
+
+    Indexes:
+    - (syllabus, term_type, term_number) for `?sem=` / `?year=` filters
     """
 
     class TermType(models.TextChoices):
@@ -130,12 +154,53 @@ class Term(models.Model):
         ordering = ["syllabus__program__short_name", "syllabus__name", "term_number"]
         verbose_name = "Academic Term"
         verbose_name_plural = "Academic Terms"
+        indexes = [
+            models.Index(fields=["syllabus", "term_type", "term_number"], name="term_syllabus_type_number"),
+        ]
 
     def __str__(self) -> str:
         label = self.name or f"{self.get_term_type_display()} {self.term_number}"
         return f"{self.syllabus} - {label}"
 
 
+class SubjectQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        bulk_create() that fills in missing slugs for the whole batch with
+        one allocation query, and retries on slug conflicts.
+
+        bulk_create() sends no signals, so the created subjects are indexed
+        for search and their programs' catalog snapshots, static export files
+        and cached subject listings are invalidated here.
+        """
+        from .caching import response_cache
+        from .catalog import invalidate_catalog
+        from .search import index_objects
+        from .static_export import mark_stale, materials_key, subjects_key
+
+        objs = list(objs)
+        created = write_with_slug_retry(
+            objs,
+            assign_subject_slugs,
+            lambda: super(SubjectQuerySet, self).bulk_create(objs, *args, **kwargs),
+            using=self.db,
+        )
+        if not created:
+            return created
+        if created[0].pk is not None:
+            index_objects(created)
+        programs = set(Term.objects.filter(pk__in={obj.term_id for obj in created}).values_list(
+            "syllabus__program__short_name", flat=True
+        ))
+        invalidate_catalog(*programs)
+        mark_stale(
+            *(materials_key(obj.pk) for obj in created if obj.pk is not None),
+            *(subjects_key(program) for program in programs),
+        )
+        response_cache.bump(self.model._meta.label_lower)
+        return created
+
+
 class Subject(models.Model):
     """
     Represents an individual subject/course within an academic term.
@@ -153,10 +218,19 @@ class Subject(models.Model):
     - name: Full subject name
     - subject_type: THEORY, PRACTICAL, or CLINICAL
     - slug: URL-friendly identifier (auto-generated)
+    - materials_total: Denormalized count of all linked materials
+    - materials_active: Denormalized count of active linked materials
+
+    The material counters are maintained by SubjectMaterial.save() and the
+    post_delete handler in resources.signals. Use the
+    `rebuild_material_counters` management command to rebuild or check them.
     
     Usage in API:
     - GET /materials/?subject=bn101-anatomy-physiology - Get materials for specific subject
     - GET /subjects/?course=BSCN&sem=1 - Get all 1st semester subjects
+
+    Indexes:
+    - subject_type for `?subject_type=` (resources.filters)
     """
 
     class SubjectType(models.TextChoices):
@@ -170,6 +244,10 @@ class Subject(models.Model):
     name = models.CharField(max_length=255, help_text="Full subject name")
     subject_type = models.CharField(max_length=16, choices=SubjectType.choices)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
+    materials_total = models.PositiveIntegerField(default=0, editable=False, help_text="Number of linked materials")
+    materials_active = models.PositiveIntegerField(default=0, editable=False, help_text="Number of active linked materials")
+
+    objects = SubjectQuerySet.as_manager()
 
     class Meta:
         ordering = [
@@ -179,6 +257,9 @@ class Subject(models.Model):
         "code",]
 
         unique_together = ("term", "code")
+        indexes = [
+            models.Index(fields=["subject_type"], name="subject_type_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.code} - {self.name}"
@@ -189,39 +270,17 @@ class Subject(models.Model):
 
         The slug is built from the program short name, term number and subject code,
         falling back to code and name if needed. If a slug collision occurs,
-        a numeric suffix is appended.
+        a numeric suffix is appended (see resources.slugs). A collision with a
+        concurrent save is retried with a freshly allocated slug.
         """
-        if not self.slug:
-            # Try to build a meaningful base using related Term/Syllabus/Program
-            base_parts = []
-            try:
-                if self.term and self.term.syllabus and self.term.syllabus.program:
-                    prog = self.term.syllabus.program.short_name
-                    base_parts.append(str(prog))
-                if self.term and getattr(self.term, 'term_number', None) is not None:
-                    base_parts.append(str(self.term.term_number))
-            except Exception:
-                # If relations are not available for some reason, ignore and continue
-                pass
-
-            # Prefer using code (short, likely unique per term) then name
-            if self.code:
-                base_parts.append(self.code)
-            elif self.name:
-                base_parts.append(self.name)
-
-            base = slugify("-".join(base_parts)) or slugify(self.code or self.name) or "subject"
-
-            slug_candidate = base
-            counter = 1
-            Model = self.__class__
-            while Model.objects.filter(slug=slug_candidate).exclude(pk=self.pk).exists():
-                counter += 1
-                slug_candidate = f"{base}-{counter}"
-
-            self.slug = slug_candidate
-
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        write_with_slug_retry(
+            [self],
+            assign_subject_slugs,
+            lambda: super(Subject, self).save(*args, **kwargs),
+            using=kwargs.get("using"),
+        )
 
 
 class MaterialType(models.Model):
@@ -271,9 +330,20 @@ class MaterialType(models.Model):
 
 
 from django.db import models
-from cloudinary_storage.storage import MediaCloudinaryStorage
+from .delivery import material_url
+from .storage import material_storage, pop_upload_metadata
 import os
 
+
+def title_from_filename(name):
+    """Derive a human-friendly title from a file name, without the last extension segment."""
+    base_name = os.path.basename(name)
+    if "." in base_name:
+        # remove only the last extension (handles names like "public key (2).pdf")
+        return base_name.rsplit(".", 1)[0]
+    return base_name
+
+
 class SubjectMaterial(models.Model):
     """
     Stores study material files with metadata and Cloudinary integration.
@@ -287,8 +357,10 @@ class SubjectMaterial(models.Model):
     - subject: Foreign key to Subject model
     - material_type: Foreign key to MaterialType (optional)
     - title: Display title (auto-filled from filename)
-    - file: Cloudinary file field
+    - file: Cloudinary file field (its name is the Cloudinary public_id)
     - url: Cloudinary URL (auto-filled)
+    - resource_type: Cloudinary resource type recorded at upload
+    - version: Cloudinary version recorded at upload
     - description: Additional description
     - year: Year for PYQs and time-sensitive materials
     - month: Month for PYQs (July, December, etc.)
@@ -304,47 +376,199 @@ class SubjectMaterial(models.Model):
     Cloudinary Integration:
     - Files are automatically uploaded to Cloudinary
     - URLs are auto-generated for direct download
+    - Delivery URLs are resolved offline from public_id/resource_type/version
+      (see resources.delivery), without per-row SDK calls
     - Supports PDF, DOC, images, and other formats
+
+    Indexes (all in keyset pagination order, see MaterialCursorPagination):
+    - (-year, -created_at, id) for the unfiltered list
+    - (subject, -year, -created_at, id) for `?subject=`
+    - (material_type, -year, -created_at, id) for `?type=`
     """
     id = models.AutoField(primary_key=True)
     subject = models.ForeignKey("Subject", on_delete=models.CASCADE, related_name="materials")
     material_type = models.ForeignKey("MaterialType", on_delete=models.CASCADE, related_name="materials", null=True, blank=True)
     title = models.CharField(max_length=255, help_text="Display title (auto-filled from filename)")
-    file = models.FileField(storage=MediaCloudinaryStorage(), upload_to="materials/")
+    file = models.FileField(storage=material_storage, upload_to="materials/")
     url = models.URLField(blank=True, help_text="Auto-filled Cloudinary URL")
+    resource_type = models.CharField(max_length=16, blank=True, editable=False, help_text="Cloudinary resource type (image/raw/video)")
+    version = models.PositiveBigIntegerField(null=True, blank=True, editable=False, help_text="Cloudinary version of the uploaded file")
     description = models.TextField(blank=True, help_text="Additional description")
     year = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Year for PYQs and time-sensitive materials")
     month = models.CharField(max_length=20, blank=True, null=True, help_text="Month for PYQs (e.g., 'July', 'December')")
     is_active = models.BooleanField(default=True, help_text="Whether material is available")
-    created_at = models.DateTimeField(auto_now_add=True, help_text="Upload timestamp")
+    # A default rather than auto_now_add, so bulk loaders can set the date
+    created_at = models.DateTimeField(default=timezone.now, editable=False, help_text="Upload timestamp")
 
     class Meta:
-        ordering = ["-year", "-created_at"]
+        # `id` breaks ties so keyset pagination has a total order. Undated
+        # materials sort last on every backend (PostgreSQL puts NULLs first
+        # in a plain descending sort), as in MaterialCursorPagination
+        ordering = [F("year").desc(nulls_last=True), "-created_at", "id"]
+        indexes = [
+            OrderedIndex(F("year").desc(nulls_last=True), F("created_at").desc(), "id", name="material_recent"),
+            OrderedIndex(
+                "subject", F("year").desc(nulls_last=True), F("created_at").desc(), "id",
+                name="material_subject_recent",
+            ),
+            OrderedIndex(
+                "material_type", F("year").desc(nulls_last=True), F("created_at").desc(), "id",
+                name="material_type_recent",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         """
         Auto-fill title from filename. Do not persist Cloudinary URL to avoid stale links.
         Always serve `file.url` at serialization time.
+
+        The parent subject's material counters are updated in the same
+        transaction, including `is_active` flips and moves to another subject.
         """
         if self.file:
-            # Derive a human-friendly title from the filename without the last extension segment
-            base_name = os.path.basename(self.file.name)
-            if "." in base_name:
-                # remove only the last extension (handles names like "public key (2).pdf")
-                title_no_ext = base_name.rsplit(".", 1)[0]
-            else:
-                title_no_ext = base_name
-            self.title = title_no_ext
-            # Do not persist URL to avoid stale links when Cloudinary delivery changes
-            try:
-                # Keep url in sync if available, but it's optional and not relied upon
-                self.url = self.file.url
-            except Exception:
-                pass
-        super().save(*args, **kwargs)
+            self.title = title_from_filename(self.file.name)
+            if not self.file._committed:
+                # Upload now (instead of in FileField.pre_save) to capture the
+                # storage metadata needed for offline URL resolution
+                self.file.save(self.file.name, self.file.file, save=False)
+                metadata = pop_upload_metadata(self.file.name)
+                if metadata is not None:
+                    self.resource_type, self.version = metadata
+            # Keep url in sync, but it's optional and not relied upon
+            self.url = material_url(self) or ""
+
+        from .counters import apply_material_transition
+
+        with transaction.atomic(using=kwargs.get("using")):
+            previous = None
+            if not self._state.adding and self.pk is not None:
+                # Lock the stored row so concurrent saves see a consistent before-state
+                previous = (
+                    SubjectMaterial._base_manager.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("subject_id", "is_active")
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            current = (self.subject_id, self.is_active)
+            update_fields = kwargs.get("update_fields")
+            if previous is not None and update_fields is not None:
+                # Fields left out of update_fields keep their stored values
+                update_fields = set(update_fields)
+                current = (
+                    current[0] if update_fields & {"subject", "subject_id"} else previous[0],
+                    current[1] if "is_active" in update_fields else previous[1],
+                )
+            apply_material_transition(previous, current)
 
     def __str__(self) -> str:
         """String representation with year/month info for PYQs."""
         if self.year and self.month:
             return f"{self.subject.code} - {self.title} ({self.month} {self.year})"
-        return f"{self.subject.code} - {self.title}"
\ No newline at end of file
+        return f"{self.subject.code} - {self.title}"
+
+class CatalogSnapshot(models.Model):
+    """
+    Precomputed /catalog/ tree for one program.
+
+    Rows are maintained by resources.catalog: any write to the program's
+    syllabi, terms, subjects or materials increments `revision`, and the next
+    catalog read rebuilds every snapshot whose `built_revision` lags behind.
+
+    Fields:
+    - program: The program this tree describes (also the primary key)
+    - tree: Nested Program -> Syllabus -> Term -> Subject dict, or None
+    - revision: Incremented on every change in the program's hierarchy
+    - built_revision: Revision the stored tree was built at
+    - built_at: When the tree was last rebuilt
+    """
+    program = models.OneToOneField(Program, on_delete=models.CASCADE, primary_key=True, related_name="catalog_snapshot")
+    tree = models.JSONField(null=True, blank=True)
+    revision = models.PositiveBigIntegerField(default=0)
+    built_revision = models.PositiveBigIntegerField(null=True, blank=True)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Catalog Snapshot"
+        verbose_name_plural = "Catalog Snapshots"
+
+    def __str__(self) -> str:
+        return f"Catalog of {self.program_id} (revision {self.revision})"
+
+    @property
+    def is_fresh(self):
+        return self.tree is not None and self.built_revision == self.revision
+
+
+class Activity(models.Model):
+    """
+    Append-only feed of newly published content, behind /latest-updates/.
+
+    One row is written when a study material or a job posting is created
+    (resources.activity), and removed again if that object is deleted.
+    Rows are denormalized (title, program, timestamp) so the feed is a
+    single index range scan, whatever content types it covers.
+
+    Fields:
+    - kind: Content type of the object ("material" or "recruitment")
+    - object_id: Primary key of the material or posting
+    - program: Program the content belongs to
+    - title: Display title at publication time
+    - created_at: Publication time of the object
+
+    Indexes:
+    - (program, -created_at, -id) for `?program=` feeds
+    - (-created_at, -id) for the global feed
+    """
+
+    class Kind(models.TextChoices):
+        MATERIAL = "material", "Material"
+        RECRUITMENT = "recruitment", "Recruitment"
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    object_id = models.PositiveIntegerField()
+    program = models.ForeignKey(Program, on_delete=models.CASCADE, related_name="activities")
+    title = models.CharField(max_length=512)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        verbose_name = "Activity Feed Entry"
+        verbose_name_plural = "Activity Feed"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="activity_unique_object"),
+        ]
+        indexes = [
+            models.Index(fields=["program", "-created_at", "-id"], name="activity_program_recent"),
+            models.Index(fields=["-created_at", "-id"], name="activity_recent"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()}: {self.title}"
+
+
+class StaticExportPartition(models.Model):
+    """
+    Change counter for one group of files in the static JSON export.
+
+    Maintained by resources.static_export: writes to subjects, materials and
+    job postings increment the `revision` of the partitions (files) they
+    affect, and `export_static_api` re-renders the partitions whose revision
+    moved past the one recorded in the export directory's manifest.
+
+    Fields:
+    - key: Partition key, e.g. "materials:12" or "subjects:BSCN"
+    - revision: Incremented on every change affecting the partition
+    - changed_at: When the revision was last incremented
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    revision = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Static Export Partition"
+        verbose_name_plural = "Static Export Partitions"
+
+    def __str__(self) -> str:
+        return f"{self.key} (revision {self.revision})"
@@ -0,0 +1,77 @@
+"""
+RGU Hub Backend - Once-per-transaction Commit Work
+
+Work that writes collect during a transaction and that should run once,
+after the transaction commits, however many writes asked for it (catalog
+snapshot refreshes, static export partition increments).
+
+How it works:
+- Each connection (per database alias, thread and async context) keeps
+  at most one pending batch per CommitBatch subclass; `pending()` returns
+  it, or a new one once the previous batch has run.
+- Every write adds its work to the pending batch and calls `schedule()`,
+  which registers the batch's `run_once` with transaction.on_commit. The
+  first registration to run does the work; the others find the batch
+  done and return.
+- Outside an atomic block on_commit runs immediately, so each write runs
+  its own batch.
+- When a transaction rolls back, Django drops its callbacks and the batch
+  stays pending; the next transaction's writes join it, so its work runs
+  with theirs. Rolled-back work can thus only cause an extra refresh or
+  increment, never a missed one.
+
+Only the public transaction.on_commit API is used; the batches are kept
+here rather than found in Django's internal list of callbacks.
+
+Components Overview:
+- CommitBatch: Base class; subclasses implement `run()`
+- discard_pending: Forget the pending batches of this thread/context
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from asgiref.local import Local
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+_batches = Local()
+
+
+def discard_pending():
+    """
+    Forget the pending batches of this thread (or async context), e.g. those
+    of rolled-back test cases, so their work does not join the next batch.
+    """
+    _batches.pending = {}
+
+
+class CommitBatch:
+    """Work collected during a transaction and run once after it commits."""
+
+    def __init__(self):
+        self.done = False
+
+    @classmethod
+    def pending(cls, using=DEFAULT_DB_ALIAS):
+        """The batch collecting work on the `using` connection."""
+        batches = getattr(_batches, "pending", None)
+        if batches is None:
+            batches = _batches.pending = {}
+        batch = batches.get((cls, using))
+        if batch is None or batch.done:
+            batch = batches[(cls, using)] = cls()
+        return batch
+
+    def schedule(self, using=DEFAULT_DB_ALIAS):
+        """Run the batch once the current transaction commits (call after adding work)."""
+        transaction.on_commit(self.run_once, using=using)
+
+    def run_once(self):
+        if self.done:
+            return
+        # Set first: writes made by run() start a new batch
+        self.done = True
+        self.run()
+
+    def run(self):
+        raise NotImplementedError
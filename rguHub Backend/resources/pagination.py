@@ -0,0 +1,244 @@
+"""
+RGU Hub Backend - Keyset (Cursor) Pagination
+
+This module provides cursor pagination based on keyset comparisons instead of
+OFFSET scans. The cursor stores the sort-key values of the last row on a
+page, and the next page is fetched with a `WHERE (keys) > (cursor)` style
+filter, so every page costs the same regardless of how deep the client is.
+
+Classes Overview:
+- KeysetPagination: Generic keyset paginator for any multi-column ordering
+- MaterialCursorPagination: Follows SubjectMaterial ordering (-year, -created_at, id)
+
+Compatibility:
+While settings.API_PAGINATION_COMPAT is True, requests that send neither
+`cursor` nor `page_size` keep receiving the legacy unpaginated JSON array.
+This lets the frontend migrate endpoint by endpoint.
+
+Response Format (paginated):
+{
+    "next": "http://127.0.0.1:8000/materials/?cursor=eyJwIjpb...",
+    "previous": null,
+    "results": [...]
+}
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a fixed, multi-column keyset ordering.
+
+    `ordering` lists model field names, prefixed with "-" for descending
+    order. The last entry must make the ordering unique (usually the
+    primary key). NULL values always sort after non-NULL values, on every
+    database backend, so nullable keys such as `year` paginate correctly.
+
+    Cursors are opaque URL-safe tokens holding the key values of the
+    boundary row and the paging direction.
+    """
+    ordering = ("-id",)
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        query = self.get_page_query(queryset, request)
+        if query is None:
+            return None
+        return self.set_page(list(query))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() fetching the page with the async ORM (resources.async_views)."""
+        query = self.get_page_query(queryset, request)
+        if query is None:
+            return None
+        return self.set_page([row async for row in query])
+
+    def get_page_query(self, queryset, request):
+        """Return the (unevaluated) queryset of the requested page, or None for legacy requests."""
+        self.request = request
+        if self.is_legacy_request(request):
+            return None
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.fields = [self._field_for(queryset.model, name) for name, _ in self._keys()]
+
+        self.position, self.reverse = self.decode_cursor(request)
+        queryset = queryset.order_by(*self._order_by(self.reverse))
+        if self.position is not None:
+            queryset = queryset.filter(self._after(self.position, self.reverse))
+        # Fetch one extra row to find out whether another page exists
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows):
+        """Turn the rows fetched by get_page_query() into the page and its links."""
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+        self.page = rows
+        return rows
+
+    def is_legacy_request(self, request):
+        """Return True when the request should get the unpaginated response."""
+        if not getattr(settings, "API_PAGINATION_COMPAT", False):
+            return False
+        params = request.query_params
+        return self.cursor_query_param not in params and self.page_size_query_param not in params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Paged past the end; step back from the requested position
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    # ----------------- Cursor encoding -----------------
+
+    def encode_cursor(self, position, reverse):
+        payload = {"p": [self._dump(value) for value in position]}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        token = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw.decode("utf-8"))
+            values = payload["p"]
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get("r"))
+
+    @staticmethod
+    def _dump(value):
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return value
+
+    # ----------------- Keyset helpers -----------------
+
+    def _keys(self):
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    @staticmethod
+    def _field_for(model, name):
+        return model._meta.get_field(name)
+
+    def _position(self, row):
+        return [getattr(row, field.attname) for field in self.fields]
+
+    def _order_by(self, reverse):
+        order = []
+        for (name, descending), field in zip(self._keys(), self.fields):
+            nulls = {}
+            if field.null:
+                nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+            expression = F(name)
+            order.append(expression.desc(**nulls) if descending != reverse else expression.asc(**nulls))
+        return order
+
+    def _after(self, position, reverse):
+        """
+        Build the keyset predicate for rows strictly after `position`.
+
+        Expands the tuple comparison into the standard OR-of-prefixes form,
+        which every backend can satisfy with a composite index range scan.
+        """
+        condition = Q(pk__in=[])
+        equal_prefix = Q()
+        for (name, descending), field, value in zip(self._keys(), self.fields, position):
+            condition |= equal_prefix & self._beyond(name, descending, field.null, value, reverse)
+            equal_prefix &= Q(**{f"{name}__isnull": True}) if value is None else Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _beyond(name, descending, nullable, value, reverse):
+        """Rows whose `name` strictly follows `value` in the paging direction."""
+        if value is None:
+            # NULLs sort last: nothing follows them going forward,
+            # and every non-NULL value precedes them going backward
+            return Q(**{f"{name}__isnull": False}) if reverse else Q(pk__in=[])
+        lookup = "lt" if descending != reverse else "gt"
+        beyond = Q(**{f"{name}__{lookup}": value})
+        if nullable and not reverse:
+            beyond |= Q(**{f"{name}__isnull": True})
+        return beyond
+
+
+class MaterialCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for /materials/.
+
+    Matches SubjectMaterial.Meta.ordering: newest year first (materials
+    without a year last), then newest upload, with the id as tie-breaker.
+    """
+    ordering = ("-year", "-created_at", "id")
@@ -0,0 +1,161 @@
+"""
+RGU Hub Backend - Alternative Response Renderers
+
+Extra output formats for every API endpoint, chosen by content negotiation
+(`Accept` header) or the `?format=` query parameter. The default JSON
+output is unchanged.
+
+Renderers Overview:
+- ORJSONRenderer (`?format=orjson`): The same JSON, encoded with orjson
+- MessagePackRenderer (`Accept: application/msgpack`, `?format=msgpack`):
+  Binary MessagePack, encoded with the `msgpack` package
+- CompactJSONRenderer (`Accept: application/vnd.rguhub.compact+json`,
+  `?format=compact`): Columnar JSON for lists, see below
+
+Compact format:
+A list of objects (or the `results` of a paginated response) becomes
+
+    {
+        "fields": ["id", "title", "material_type", ...],
+        "values": {"material_type": [{"id": 1, "slug": "notes", ...}, ...]},
+        "rows": [[12, "anatomy_notes.pdf", 0, ...], ...]
+    }
+
+Keys are sent once. Columns listed in the view's `compact_intern_fields`
+are interned: each distinct value is sent once in `values[field]` and rows
+hold its index (null stays null). Anything else (detail objects, errors,
+lists of mixed objects) is rendered as plain JSON.
+
+Optional packages:
+orjson and msgpack are optional. settings.py registers ORJSONRenderer and
+MessagePackRenderer only when the package is installed; used without it,
+they raise ImproperlyConfigured instead of falling back to another encoder.
+
+Caching:
+The same URL yields different bodies per `Accept` header, so every API
+response carries `Vary: Accept` (VaryOnAcceptMixin on the viewsets, cache
+hits and 304s included); shared caches then never hand a MessagePack body
+to a JSON client.
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional, see ORJSONRenderer
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional, see MessagePackRenderer
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON encoded with orjson; same media type as JSONRenderer, selected with `?format=orjson`."""
+    media_type = "application/json"
+    format = "orjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            raise ImproperlyConfigured("ORJSONRenderer requires the orjson package")
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Binary MessagePack encoding of the same data as the JSON output."""
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if msgpack is None:
+            raise ImproperlyConfigured("MessagePackRenderer requires the msgpack package")
+        if data is None:
+            return b""
+        # Dates, decimals, UUIDs, lazy strings: as in the JSON output
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True)
+
+
+def _freeze(value):
+    """Hashable stand-in for an interned value (types kept apart, so 1 != True)."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return ("list",) + tuple(_freeze(item) for item in value)
+    return (type(value), value)
+
+
+def columnar(items, intern_fields=()):
+    """
+    Return the compact form of `items` (a list of objects with the same
+    keys in the same order), or None if the items do not qualify.
+    """
+    if not items:
+        return {"fields": [], "values": {}, "rows": []}
+    if not all(isinstance(item, dict) for item in items):
+        return None
+    fields = list(items[0])
+    if any(list(item) != fields for item in items):
+        return None
+
+    interned = [index for index, name in enumerate(fields) if name in intern_fields]
+    values = {fields[index]: [] for index in interned}
+    slots = {index: {} for index in interned}
+    rows = []
+    for item in items:
+        row = list(item.values())
+        for index in interned:
+            value = row[index]
+            if value is None:
+                continue
+            key = _freeze(value)
+            slot = slots[index].get(key)
+            if slot is None:
+                slot = slots[index][key] = len(values[fields[index]])
+                values[fields[index]].append(value)
+            row[index] = slot
+        rows.append(row)
+    return {"fields": fields, "values": values, "rows": rows}
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """Columnar JSON for lists; other data is rendered as plain JSON."""
+    media_type = "application/vnd.rguhub.compact+json"
+    format = "compact"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        view = (renderer_context or {}).get("view")
+        intern_fields = getattr(view, "compact_intern_fields", ())
+        if isinstance(data, list):
+            data = columnar(data, intern_fields) or data
+        elif isinstance(data, dict) and isinstance(data.get("results"), list):
+            compact = columnar(data["results"], intern_fields)
+            if compact is not None:
+                data = dict(data, results=compact)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def vary_on_accept(response):
+    """Mark a negotiated response as varying with the `Accept` header."""
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+class VaryOnAcceptMixin:
+    """View mixin adding `Vary: Accept` to every response (see module docstring)."""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        return vary_on_accept(super().finalize_response(request, response, *args, **kwargs))
@@ -0,0 +1,137 @@
+"""
+RGU Hub Backend - Structured API Request Logging
+
+One structured log line per (sampled) API request on the "rguhub.api"
+logger, built only from data the view has already computed: no query is
+ever run to produce a log line.
+
+Each request line carries:
+- view: Resolved view name (e.g. "material-list") and HTTP method
+- params: The filter parameters the view declares in `log_params`
+- status: Response status code
+- results: Number of items in the response body (page length for
+  paginated responses), or null when the body was not built here (cache
+  hits, 304s)
+- cache: X-Cache header (HIT/MISS) when the response cache was involved
+- duration_ms: Time spent in the view
+
+Sampling:
+Whether a request is logged is decided once and remembered on the request.
+Debug lines (e.g. generated SQL) are not sampled; they are only built when
+DEBUG logging is enabled for "rguhub.api".
+
+Components Overview:
+- RequestLogMixin: ViewSet mixin writing the per-request line
+- log_event: Write a structured line, building lazy fields only if enabled
+- JsonFormatter: Render records as one JSON object per line
+
+Settings:
+- API_LOG_SAMPLE_RATE: Fraction of requests logged (default 1.0)
+- API_LOG_SAMPLE_RATES: Per view name overrides, e.g. {"material-list": 0.1}
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import datetime
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger("rguhub.api")
+
+
+def sample_rate(view_name):
+    rates = getattr(settings, "API_LOG_SAMPLE_RATES", None) or {}
+    return rates.get(view_name, getattr(settings, "API_LOG_SAMPLE_RATE", 1.0))
+
+
+def is_sampled(request, view_name):
+    """Decide (once per request) whether the request is logged."""
+    sampled = getattr(request, "_api_log_sampled", None)
+    if sampled is None:
+        rate = sample_rate(view_name)
+        sampled = request._api_log_sampled = rate >= 1 or random.random() < rate
+    return sampled
+
+
+def log_event(level, event, **fields):
+    """
+    Log `event` with structured `fields`.
+
+    Callable field values are only called if `level` is enabled, so
+    expensive values (e.g. `lambda: str(queryset.query)`) cost nothing
+    otherwise.
+    """
+    if logger.isEnabledFor(level):
+        fields = {name: value() if callable(value) else value for name, value in fields.items()}
+        logger.log(level, event, extra={"fields": fields})
+
+
+def _params(query_params, names):
+    params = {}
+    for name in names:
+        values = query_params.getlist(name)
+        if values:
+            params[name] = values[0] if len(values) == 1 else values
+    return params
+
+
+def result_size(response):
+    """Number of items in an already-built response body, or None."""
+    data = getattr(response, "data", None)
+    if isinstance(data, dict):
+        data = data.get("results")
+    return len(data) if isinstance(data, list) else None
+
+
+class RequestLogMixin:
+    """
+    Write one structured line per sampled request.
+
+    List it first among a ViewSet's bases, so the line is written after the
+    caching and conditional GET mixins have finished the response. Set
+    `log_params` to the query parameters worth recording.
+    """
+    log_params = ()
+
+    def initial(self, request, *args, **kwargs):
+        self._log_started = time.perf_counter()
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        view_name = f"{self.basename}-{self.action}"
+        if logger.isEnabledFor(logging.INFO) and is_sampled(request, view_name):
+            started = getattr(self, "_log_started", None)
+            log_event(
+                logging.INFO,
+                "api.request",
+                view=view_name,
+                method=request.method,
+                params=_params(request.query_params, self.log_params),
+                status=response.status_code,
+                results=result_size(response),
+                cache=response.get("X-Cache"),
+                duration_ms=round((time.perf_counter() - started) * 1000, 3) if started else None,
+            )
+        return response
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON objects: time, level, logger, event and the structured fields."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
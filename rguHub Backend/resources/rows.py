@@ -0,0 +1,231 @@
+"""
+RGU Hub Backend - Row-based List Serialization
+
+Builds list responses straight from `values_list()` rows instead of model
+instances, for the large read-only listings (/materials/, /recruitments/).
+
+A RowPlan is compiled from a serializer instance (after `?fields=` /
+`?expand=` have been applied): every rendered field becomes a column of a
+single `values_list()` query, related objects become joins, and each
+value is converted by the serializer field's own `to_representation()`.
+No model instances are created and no serializer runs per row, but the
+output is the same, key order and value types included.
+
+Supported fields:
+- Model fields (also across non-null foreign keys, e.g. `subject.code`)
+  rendered by scalar DRF fields (char, choice, numeric, boolean, date/time)
+- Primary key related fields
+- Nested ModelSerializers over a foreign key (None when the key is null)
+- Fields named in `Meta.row_methods`: `{name: method name}`; the method is
+  called with the `Meta.field_dependencies` values of the field, in order
+
+A serializer with any other field compiles to None, and the view falls back
+to regular serialization.
+
+Components Overview:
+- RowPlan: Compiled columns and row builder for one serializer
+- compile_row_plan: Compile a RowPlan (or None) from a serializer instance
+- RowListMixin: ViewSet mixin serving list() through a RowPlan
+
+Settings:
+- API_FAST_LISTS: Use row-based list serialization (default True)
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# DRF fields whose to_representation() accepts the raw column value
+ROW_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+    serializers.TimeField,
+    serializers.UUIDField,
+)
+
+
+class RowPlan:
+    """
+    Columns to select and how to turn a row of them into a response item.
+
+    `paths` are the `values_list()` lookups; rows are fetched as named
+    tuples, so the extra fields (e.g. pagination keys) stay available as
+    attributes for cursors.
+    """
+
+    def __init__(self, paths, build):
+        self.paths = paths
+        self.build = build
+
+    def values(self, queryset):
+        return queryset.values_list(*self.paths, named=True)
+
+    def render(self, rows):
+        build = self.build
+        return [build(row) for row in rows]
+
+
+def _column(paths, path):
+    if path not in paths:
+        paths.append(path)
+    return paths.index(path)
+
+
+def _model_field_path(model, source_attrs):
+    """
+    Resolve `source_attrs` to `(lookup, model field)`, or None if the value
+    does not come straight from a column (properties, methods, reverse or
+    nullable relations, which serializers render differently).
+    """
+    current, lookups = model, []
+    for index, attr in enumerate(source_attrs):
+        try:
+            model_field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        lookups.append(attr)
+        if index + 1 == len(source_attrs):
+            return "__".join(lookups), model_field
+        if not model_field.is_relation or model_field.null:
+            return None
+        current = model_field.related_model
+    return None
+
+
+def _scalar(index, convert):
+    def value(row):
+        raw = row[index]
+        return None if raw is None else convert(raw)
+    return value
+
+
+def _raw(index):
+    def value(row):
+        return row[index]
+    return value
+
+
+def _method(method, indexes):
+    def value(row):
+        return method(*[row[index] for index in indexes])
+    return value
+
+
+def _nested(build, pk_index):
+    if pk_index is None:
+        return build
+
+    def value(row):
+        return None if row[pk_index] is None else build(row)
+    return value
+
+
+def _builder(entries):
+    def build(row):
+        return {name: value(row) for name, value in entries}
+    return build
+
+
+def _compile(serializer, prefix, paths):
+    model = serializer.Meta.model
+    dependencies = getattr(serializer.Meta, "field_dependencies", {})
+    row_methods = getattr(serializer.Meta, "row_methods", {})
+    entries = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in row_methods:
+            indexes = [_column(paths, prefix + path) for path in dependencies[name]]
+            entries.append((name, _method(getattr(serializer, row_methods[name]), indexes)))
+            continue
+
+        if isinstance(field, serializers.BaseSerializer):
+            if not isinstance(field, serializers.ModelSerializer) or len(field.source_attrs) != 1:
+                return None
+            resolved = _model_field_path(model, field.source_attrs)
+            if resolved is None or not resolved[1].many_to_one and not resolved[1].one_to_one:
+                return None
+            relation = resolved[1]
+            nested_prefix = f"{prefix}{relation.name}__"
+            build = _compile(field, nested_prefix, paths)
+            if build is None:
+                return None
+            pk_index = None
+            if relation.null:
+                pk_index = _column(paths, nested_prefix + relation.related_model._meta.pk.name)
+            entries.append((name, _nested(build, pk_index)))
+            continue
+
+        resolved = _model_field_path(model, field.source_attrs)
+        if resolved is None:
+            return None
+        path, model_field = resolved
+        index = _column(paths, prefix + path)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                return None
+            entries.append((name, _raw(index)))
+        elif isinstance(field, ROW_FIELDS) and not model_field.is_relation:
+            entries.append((name, _scalar(index, field.to_representation)))
+        else:
+            return None
+    return _builder(entries)
+
+
+def compile_row_plan(serializer, extra_fields=()):
+    """
+    Compile a RowPlan for `serializer` (an unbound instance with its
+    context), or return None if some field is not supported.
+
+    `extra_fields` are selected as well, e.g. ordering keys for cursors.
+    """
+    paths = []
+    build = _compile(serializer, "", paths)
+    if build is None:
+        return None
+    for name in extra_fields:
+        _column(paths, name)
+    return RowPlan(paths, build)
+
+
+class RowListMixin:
+    """
+    ViewSet mixin serving list() from `values_list()` rows.
+
+    List it after CachedListMixin, so cached responses are still served
+    first. Filtering and pagination work as usual; only the page's rows are
+    fetched and built. Falls back to the serializer when the (sparse)
+    serializer cannot be compiled or API_FAST_LISTS is off.
+    """
+
+    def get_row_plan(self):
+        if not getattr(settings, "API_FAST_LISTS", True):
+            return None
+        ordering = getattr(self.pagination_class, "ordering", ())
+        model = self.queryset.model
+        keys = [model._meta.get_field(name.lstrip("-")).attname for name in ordering]
+        return compile_row_plan(self.get_serializer(), extra_fields=keys)
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_row_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
@@ -0,0 +1,320 @@
+"""
+RGU Hub Backend - Full-Text Search
+
+Inverted-index search over study materials, subjects and job postings.
+
+Index Storage:
+- SQLite: FTS5 virtual table `resources_searchindex(title, body)`, ranked
+  with bm25()
+- PostgreSQL: table `resources_searchindex` with a generated, weighted
+  tsvector column behind a GIN index, ranked with ts_rank_cd()
+
+Both tables are created by migration 0011. Each indexed object is one row
+whose rowid encodes `(kind, object_id)`, so updates and deletes touch a
+single row by primary key. Objects a kind does not serve (inactive
+materials) are kept out of the index.
+
+Other databases have no index: search() then matches every term with
+`icontains` on each kind's `search_fields`. Results are unranked, newest
+first, and every score is 0.
+
+Components Overview:
+- SearchKind: How one model is turned into a search document and serialized
+- register: Register a model for indexing (connects the write signals)
+- index_object / remove_object: Keep the index in sync on write
+- index_objects: Index the results of bulk writes
+- unindex_objects: Remove many objects of one model from the index
+- rebuild_index: Backfill the whole index (see `rebuild_search_index`)
+- search: Run a ranked query across all registered kinds
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import operator
+import re
+from dataclasses import dataclass
+from functools import reduce
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+TABLE = "resources_searchindex"
+KIND_BITS = 4
+
+# Column weights: titles count five times as much as body text
+SQLITE_RANK = f"bm25({TABLE}, 5.0, 1.0)"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchKind:
+    """
+    A model registered for full-text search.
+
+    - name: Result type reported by the API ("material", "subject", ...)
+    - code: Small integer stored in the rowid (1..15, unique per kind)
+    - model: The indexed model
+    - document: Callable returning `(title, body)` for an instance
+    - serializer_class: Serializer used for search results
+    - queryset: Callable returning the queryset of searchable objects, used
+      to rebuild the index and to load results
+    - search_fields: Fields matched with `icontains` on databases without
+      a search index
+    - searchable: Optional predicate; instances failing it are not indexed
+    """
+    name: str
+    code: int
+    model: type
+    document: object
+    serializer_class: type
+    queryset: object
+    search_fields: tuple = ()
+    searchable: object = None
+
+    def rowid(self, object_id):
+        return (int(object_id) << KIND_BITS) | self.code
+
+    def is_searchable(self, instance):
+        return self.searchable is None or self.searchable(instance)
+
+
+_kinds = {}
+
+
+def register(kind):
+    """Register a SearchKind and keep its index rows in sync on write."""
+    _kinds[kind.name] = kind
+    post_save.connect(_object_saved, sender=kind.model, dispatch_uid=f"search.{kind.name}.save")
+    post_delete.connect(_object_deleted, sender=kind.model, dispatch_uid=f"search.{kind.name}.delete")
+    return kind
+
+
+def registered_kinds():
+    return list(_kinds.values())
+
+
+def _kind_for_model(model):
+    for kind in _kinds.values():
+        if kind.model is model:
+            return kind
+    return None
+
+
+def _object_saved(sender, instance, raw=False, **kwargs):
+    if not raw and is_supported():
+        index_object(instance)
+
+
+def _object_deleted(sender, instance, **kwargs):
+    if is_supported():
+        remove_object(instance)
+
+
+def is_supported():
+    """Return True if the default database has a search index implementation."""
+    return connection.vendor in ("sqlite", "postgresql")
+
+
+def _vendor():
+    if connection.vendor not in ("sqlite", "postgresql"):
+        raise NotImplementedError(f"Full-text search is not supported on {connection.vendor}")
+    return connection.vendor
+
+
+def _write_sql():
+    if _vendor() == "sqlite":
+        return f"INSERT OR REPLACE INTO {TABLE} (rowid, title, body) VALUES (%s, %s, %s)"
+    return (
+        f"INSERT INTO {TABLE} (id, title, body) VALUES (%s, %s, %s) "
+        "ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body"
+    )
+
+
+def _delete_sql():
+    column = "rowid" if _vendor() == "sqlite" else "id"
+    return f"DELETE FROM {TABLE} WHERE {column} = %s"
+
+
+def index_object(instance):
+    """Insert or refresh the search document of a registered instance."""
+    kind = _kind_for_model(type(instance))
+    if not kind.is_searchable(instance):
+        remove_object(instance)
+        return
+    title, body = kind.document(instance)
+    with connection.cursor() as cursor:
+        cursor.execute(_write_sql(), [kind.rowid(instance.pk), title or "", body or ""])
+
+
+def index_objects(instances):
+    """
+    Index many instances of registered models with one executemany().
+
+    For writes that bypass the model signals, such as bulk_create().
+    """
+    rows = []
+    for instance in instances:
+        kind = _kind_for_model(type(instance))
+        if not kind.is_searchable(instance):
+            continue
+        title, body = kind.document(instance)
+        rows.append([kind.rowid(instance.pk), title or "", body or ""])
+    if rows and is_supported():
+        with connection.cursor() as cursor:
+            cursor.executemany(_write_sql(), rows)
+
+
+def remove_object(instance):
+    """Remove a registered instance from the search index."""
+    kind = _kind_for_model(type(instance))
+    with connection.cursor() as cursor:
+        cursor.execute(_delete_sql(), [kind.rowid(instance.pk)])
+
+
+def unindex_objects(model, object_ids):
+    """Remove the documents of many `model` objects with one executemany()."""
+    kind = _kind_for_model(model)
+    rows = [[kind.rowid(object_id)] for object_id in object_ids]
+    if rows and is_supported():
+        with connection.cursor() as cursor:
+            cursor.executemany(_delete_sql(), rows)
+
+
+def rebuild_index(batch_size=1000, kinds=None):
+    """
+    Rebuild the index from scratch for the given kinds (default: all).
+
+    Streams rows with .iterator() and writes them with executemany() in
+    batches. Returns a `{kind name: document count}` dict.
+    """
+    counts = {}
+    column = "rowid" if _vendor() == "sqlite" else "id"
+    with transaction.atomic(), connection.cursor() as cursor:
+        for kind in kinds or registered_kinds():
+            # rowid & 15 extracts the kind code
+            cursor.execute(f"DELETE FROM {TABLE} WHERE ({column} & %s) = %s", [(1 << KIND_BITS) - 1, kind.code])
+            batch, counts[kind.name] = [], 0
+            for instance in kind.queryset().iterator(chunk_size=batch_size):
+                title, body = kind.document(instance)
+                batch.append([kind.rowid(instance.pk), title or "", body or ""])
+                if len(batch) >= batch_size:
+                    cursor.executemany(_write_sql(), batch)
+                    counts[kind.name] += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(_write_sql(), batch)
+                counts[kind.name] += len(batch)
+    return counts
+
+
+def _terms(text):
+    """Split user input into word tokens; operators and quotes are dropped."""
+    return _TOKEN.findall(text.lower())[:16]
+
+
+def _ranked_rows(terms, kind_codes, limit):
+    """Return `(rowid, score)` pairs, best match first. Higher score is better."""
+    mask = (1 << KIND_BITS) - 1
+    codes = ", ".join(["%s"] * len(kind_codes))
+    if _vendor() == "sqlite":
+        # Every term must match; the last one may be a prefix ("anat" -> "anatomy")
+        match = " ".join(f'"{term}"' for term in terms[:-1])
+        match = f'{match} "{terms[-1]}"*'.strip()
+        sql = (
+            f"SELECT rowid, -{SQLITE_RANK} AS score FROM {TABLE} "
+            f"WHERE {TABLE} MATCH %s AND (rowid & {mask}) IN ({codes}) "
+            f"ORDER BY {SQLITE_RANK} LIMIT %s"
+        )
+    else:
+        match = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+        sql = (
+            f"SELECT id, ts_rank_cd(document, query) AS score "
+            f"FROM {TABLE}, to_tsquery('simple', %s) AS query "
+            f"WHERE document @@ query AND (id & {mask}) IN ({codes}) "
+            f"ORDER BY score DESC LIMIT %s"
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, *kind_codes, limit])
+        return cursor.fetchall()
+
+
+def _fallback_rows(terms, kinds, limit):
+    """`(rowid, score)` pairs from `icontains` queries, for databases without an index."""
+    rows = []
+    for kind in kinds:
+        if not kind.search_fields:
+            continue
+        condition = Q()
+        for term in terms:
+            condition &= reduce(operator.or_, (Q(**{f"{field}__icontains": term}) for field in kind.search_fields))
+        ids = kind.queryset().filter(condition).order_by("-pk").values_list("pk", flat=True)[:limit]
+        rows.extend((kind.rowid(pk), 0.0) for pk in ids)
+    return rows[:limit]
+
+
+def search(text, kinds=None, limit=20, context=None):
+    """
+    Search all registered kinds (or the named subset) for `text`.
+
+    Returns a list of `{"type", "score", "object"}` dicts ordered by
+    relevance, where `object` is the kind's serializer output. Results are
+    loaded with one query per kind present in the hits.
+    """
+    terms = _terms(text)
+    selected = [kind for kind in registered_kinds() if kinds is None or kind.name in kinds]
+    if not terms or not selected:
+        return []
+
+    by_code = {kind.code: kind for kind in selected}
+    if is_supported():
+        rows = _ranked_rows(terms, list(by_code), limit)
+    else:
+        rows = _fallback_rows(terms, selected, limit)
+
+    wanted = {}
+    for rowid, _ in rows:
+        wanted.setdefault(rowid & ((1 << KIND_BITS) - 1), []).append(rowid >> KIND_BITS)
+    loaded = {}
+    for code, ids in wanted.items():
+        kind = by_code[code]
+        objects = list(kind.queryset().filter(pk__in=ids))
+        data = kind.serializer_class(objects, many=True, context=context or {}).data
+        for obj, item in zip(objects, data):
+            loaded[kind.rowid(obj.pk)] = (kind.name, item)
+
+    results = []
+    for rowid, score in rows:
+        if rowid in loaded:
+            name, item = loaded[rowid]
+            results.append({"type": name, "score": round(float(score), 6), "object": item})
+    return results
+
+
+def register_resource_kinds():
+    """Register the resources app models. Called from ResourcesConfig.ready()."""
+    from .models import Subject, SubjectMaterial
+    from .serializers import SubjectMaterialSerializer, SubjectSerializer
+
+    register(SearchKind(
+        name="material",
+        code=1,
+        model=SubjectMaterial,
+        document=lambda m: (m.title, m.description),
+        serializer_class=SubjectMaterialSerializer,
+        # Like downloads, search only serves active materials
+        queryset=lambda: SubjectMaterial.objects.filter(is_active=True).select_related("subject", "material_type"),
+        search_fields=("title", "description"),
+        searchable=lambda m: m.is_active,
+    ))
+    register(SearchKind(
+        name="subject",
+        code=2,
+        model=Subject,
+        document=lambda s: (f"{s.code} {s.name}", ""),
+        serializer_class=SubjectSerializer,
+        queryset=lambda: Subject.objects.select_related("term"),
+        search_fields=("code", "name"),
+    ))
@@ -5,21 +5,42 @@ This module contains Django REST Framework serializers for converting
 model instances to JSON and handling API data validation.
 
 Serializers Overview:
+- ProgramSerializer / TermSerializer: Compact objects for `?expand=`
 - MaterialTypeSerializer: Serializes MaterialType model
 - SubjectMaterialSerializer: Serializes SubjectMaterial with related data
 - SubjectSerializer: Serializes Subject with material count
+- ActivitySerializer: Serializes activity feed entries for /latest-updates/
 
 Each serializer defines which fields are exposed in the API and how
-related models are represented.
+related models are represented. Material and subject serializers support
+`?fields=` / `?expand=` (resources.fieldsets); SubjectMaterialSerializer
+can also be rendered from values_list() rows (resources.rows).
 
 Author: RGU Hub Development Team
 Last Updated: 2025
 """
 
 from rest_framework import serializers
-from .models import Subject, SubjectMaterial, MaterialType
+from .delivery import material_url, stored_material_url
+from .fieldsets import SparseFieldsetMixin
+from .models import Activity, Program, Subject, SubjectMaterial, MaterialType, Term
 
-class MaterialTypeSerializer(serializers.ModelSerializer):
+
+class ProgramSerializer(serializers.ModelSerializer):
+    """Compact program object, embedded with `?expand=program`."""
+    class Meta:
+        model = Program
+        fields = ["id", "name", "short_name", "duration_years"]
+
+
+class TermSerializer(serializers.ModelSerializer):
+    """Compact term object, embedded with `?expand=term`."""
+    class Meta:
+        model = Term
+        fields = ["id", "term_number", "term_type", "name", "slug"]
+
+
+class MaterialTypeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for MaterialType model.
     
@@ -38,7 +59,7 @@ class MaterialTypeSerializer(serializers.ModelSerializer):
         model = MaterialType
         fields = ["id", "name", "slug", "description", "icon", "color"]
 
-class SubjectMaterialSerializer(serializers.ModelSerializer):
+class SubjectMaterialSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for SubjectMaterial model with expanded related data.
     
@@ -58,6 +79,9 @@ class SubjectMaterialSerializer(serializers.ModelSerializer):
     - month: Month for PYQs
     - is_active: Availability status
     - created_at: Upload timestamp
+
+    Expandable (`?expand=`):
+    - subject: Complete Subject object
     """
     # Flatten subject data for easier frontend consumption
     subject_id = serializers.IntegerField(source="subject.id", read_only=True)
@@ -67,7 +91,7 @@ class SubjectMaterialSerializer(serializers.ModelSerializer):
     # Include complete material type object
     material_type = MaterialTypeSerializer(read_only=True)
 
-    # Always serve the live Cloudinary URL from the file field to avoid stale links
+    # Resolved from the stored public_id/resource_type/version (no SDK call per row)
     url = serializers.SerializerMethodField()
 
     class Meta:
@@ -86,22 +110,30 @@ class SubjectMaterialSerializer(serializers.ModelSerializer):
             "is_active",        # availability status
             "created_at",       # upload timestamp
         ]
+        expandable_fields = {
+            "subject": lambda: SubjectSerializer(read_only=True),
+        }
+        field_dependencies = {
+            "url": ("file", "resource_type", "version", "url"),
+        }
+        row_methods = {
+            "url": "get_url_from_row",
+        }
 
     def get_url(self, obj):
-        try:
-            if obj.file and hasattr(obj.file, 'url') and obj.file.url:
-                return obj.file.url
-        except Exception:
-            pass
-        # Fallback to stored url field if file url is unavailable
-        return getattr(obj, 'url', None)
-
-class SubjectSerializer(serializers.ModelSerializer):
+        return material_url(obj)
+
+    def get_url_from_row(self, file, resource_type, version, url):
+        """`url` for row-based lists (resources.rows)."""
+        storage = SubjectMaterial._meta.get_field("file").storage
+        return stored_material_url(storage, file, resource_type, version, url)
+
+class SubjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Subject model with material count and term information.
     
-    Includes computed material count and flattened term data for easier
-    frontend consumption and better API design.
+    Includes the denormalized material counters and flattened term data for
+    easier frontend consumption and better API design.
     
     Fields:
     - id: Subject primary key
@@ -112,9 +144,14 @@ class SubjectSerializer(serializers.ModelSerializer):
     - term: Term's primary key
     - term_slug: Term's URL-friendly identifier
     - materials_count: Number of materials for this subject
+    - active_materials_count: Number of active materials for this subject
+
+    Expandable (`?expand=`):
+    - term: Term object instead of the term's primary key
     """
-    # Computed field for material count
-    materials_count = serializers.SerializerMethodField()
+    # Read from the counters maintained on Subject (no per-row COUNT query)
+    materials_count = serializers.IntegerField(source="materials_total", read_only=True)
+    active_materials_count = serializers.IntegerField(source="materials_active", read_only=True)
     
     # Flatten term data for easier frontend consumption
     term = serializers.IntegerField(source="term.id", read_only=True)
@@ -123,21 +160,38 @@ class SubjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Subject
         fields = [
-            "id",               # subject primary key
-            "code",             # subject code (BN101, etc.)
-            "name",             # full subject name
-            "subject_type",     # THEORY, PRACTICAL, CLINICAL
-            "slug",             # URL-friendly identifier
-            "term",             # term's primary key
-            "term_slug",        # term's URL-friendly identifier
-            "materials_count",  # number of materials
+            "id",                       # subject primary key
+            "code",                     # subject code (BN101, etc.)
+            "name",                     # full subject name
+            "subject_type",             # THEORY, PRACTICAL, CLINICAL
+            "slug",                     # URL-friendly identifier
+            "term",                     # term's primary key
+            "term_slug",                # term's URL-friendly identifier
+            "materials_count",          # number of materials
+            "active_materials_count",   # number of active materials
         ]
-    
-    def get_materials_count(self, obj):
-        """
-        Compute the number of materials for this subject.
-        
-        Returns the count of active materials linked to this subject.
-        Used for displaying material availability in the frontend.
-        """
-        return obj.materials.count()
\ No newline at end of file
+        expandable_fields = {
+            "term": lambda: TermSerializer(read_only=True),
+        }
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    """
+    Serializer for activity feed entries (/latest-updates/).
+
+    Keeps the original "type"/"title"/"created_at" shape of the homepage
+    feed and adds the object id and program.
+
+    Fields:
+    - type: "Material" or "Recruitment"
+    - title: Material title, or "<position> at <company>"
+    - created_at: Publication time
+    - object_id: Primary key of the material or job posting
+    - program: Program short name
+    """
+    type = serializers.CharField(source="get_kind_display")
+    program = serializers.CharField(source="program.short_name")
+
+    class Meta:
+        model = Activity
+        fields = ["type", "title", "created_at", "object_id", "program"]
@@ -0,0 +1,190 @@
+"""
+RGU Hub Backend - Resources App Signal Handlers
+
+Signal receivers that keep derived data in sync with the core models.
+Connected in ResourcesConfig.ready().
+
+Receivers Overview:
+- material_deleted: Decrement subject material counters on delete
+- catalog_changed: Invalidate cached responses for catalog models
+- remember_material_program / material_changed: Invalidate cached material
+  responses and catalog snapshots globally and for the affected program(s)
+- remember_catalog_program / hierarchy_changed: Mark the catalog snapshots of
+  the program(s) a syllabus, term or subject belongs to as stale
+- material_type_changed: Mark every catalog snapshot as stale
+- subject_exported / export_structure_changed: Mark static export
+  partitions as stale (material writes are handled by material_changed)
+- material_published / material_unpublished: Maintain the activity feed
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import activity, static_export
+from .caching import response_cache, scope
+from .catalog import invalidate_catalog
+from .counters import apply_material_transition
+from .models import Activity, MaterialType, Program, Subject, SubjectMaterial, Syllabus, Term
+
+
+def program_of_subject(subject_id):
+    """Return the program short name a subject belongs to, or None."""
+    if subject_id is None:
+        return None
+    return (
+        Subject.objects.filter(pk=subject_id)
+        .values_list("term__syllabus__program__short_name", flat=True)
+        .first()
+    )
+
+
+@receiver(post_delete, sender=SubjectMaterial, dispatch_uid="resources.material_deleted")
+def material_deleted(sender, instance, **kwargs):
+    """
+    Decrement the parent subject's counters when a material is deleted.
+
+    post_delete is sent inside the deletion transaction, for both
+    instance.delete() and QuerySet.delete(), so counters stay consistent.
+    """
+    apply_material_transition((instance.subject_id, instance.is_active), None)
+
+
+def catalog_changed(sender, **kwargs):
+    """Bump the model's generation so cached responses built from it expire."""
+    response_cache.bump(sender._meta.label_lower)
+
+
+for _model in (Program, Syllabus, Term, Subject, MaterialType):
+    post_save.connect(catalog_changed, sender=_model, dispatch_uid=f"resources.cache.{_model.__name__}.save")
+    post_delete.connect(catalog_changed, sender=_model, dispatch_uid=f"resources.cache.{_model.__name__}.delete")
+
+
+@receiver(pre_save, sender=SubjectMaterial, dispatch_uid="resources.remember_material_program")
+def remember_material_program(sender, instance, **kwargs):
+    """Remember the subject and program a material belonged to before an update."""
+    instance._cached_previous_program = instance._cached_previous_subject = None
+    if instance.pk is not None and not instance._state.adding:
+        instance._cached_previous_subject, instance._cached_previous_program = (
+            SubjectMaterial.objects.filter(pk=instance.pk)
+            .values_list("subject_id", "subject__term__syllabus__program__short_name")
+            .first()
+        ) or (None, None)
+
+
+@receiver(post_save, sender=SubjectMaterial, dispatch_uid="resources.material_saved.cache")
+@receiver(post_delete, sender=SubjectMaterial, dispatch_uid="resources.material_deleted.cache")
+def material_changed(sender, instance, **kwargs):
+    """
+    Invalidate cached material responses.
+
+    Bumps the global material generation plus the program scope of the old
+    and new subject, so moving a material between programs refreshes both
+    programs' subject listings. The same subjects' and programs' static
+    export files (material lists, subject lists with counts) and the feed
+    are marked stale.
+    """
+    label = sender._meta.label_lower
+    programs = {program_of_subject(instance.subject_id), getattr(instance, "_cached_previous_program", None)}
+    response_cache.bump(label, *(scope(label, program) for program in programs if program))
+    invalidate_catalog(*programs)
+    subjects = {instance.subject_id, getattr(instance, "_cached_previous_subject", None)}
+    static_export.mark_stale(
+        static_export.LATEST_UPDATES,
+        *(static_export.materials_key(subject) for subject in subjects if subject),
+        *(static_export.subjects_key(program) for program in programs if program),
+    )
+
+
+# Lookup path from each hierarchy model to its program's short name
+PROGRAM_PATHS = {
+    Syllabus: "program__short_name",
+    Term: "syllabus__program__short_name",
+    Subject: "term__syllabus__program__short_name",
+}
+
+
+def _stored_program(sender, pk):
+    return sender._default_manager.filter(pk=pk).values_list(PROGRAM_PATHS[sender], flat=True).first()
+
+
+def remember_catalog_program(sender, instance, **kwargs):
+    """Remember the program a syllabus/term/subject belongs to before a write."""
+    instance._catalog_previous_program = None
+    if instance.pk is not None and not instance._state.adding:
+        instance._catalog_previous_program = _stored_program(sender, instance.pk)
+
+
+def hierarchy_changed(sender, instance, signal=None, **kwargs):
+    """
+    Invalidate the catalog snapshots affected by a syllabus/term/subject write.
+
+    Both the previous and the current program are invalidated, so moving a
+    node to another program refreshes both trees.
+    """
+    programs = [getattr(instance, "_catalog_previous_program", None)]
+    if signal is post_save:
+        # The row is stored, look up its current program
+        programs.append(_stored_program(sender, instance.pk))
+    invalidate_catalog(*programs)
+
+
+for _model in PROGRAM_PATHS:
+    pre_save.connect(remember_catalog_program, sender=_model, dispatch_uid=f"resources.catalog.{_model.__name__}.pre_save")
+    pre_delete.connect(remember_catalog_program, sender=_model, dispatch_uid=f"resources.catalog.{_model.__name__}.pre_delete")
+    post_save.connect(hierarchy_changed, sender=_model, dispatch_uid=f"resources.catalog.{_model.__name__}.save")
+    post_delete.connect(hierarchy_changed, sender=_model, dispatch_uid=f"resources.catalog.{_model.__name__}.delete")
+
+
+@receiver(post_save, sender=Subject, dispatch_uid="resources.static_export.subject_saved")
+@receiver(post_delete, sender=Subject, dispatch_uid="resources.static_export.subject_deleted")
+def subject_exported(sender, instance, signal=None, **kwargs):
+    """
+    Mark the subject's material lists (which embed its code and name) and
+    the subject lists of its previous and current program as stale.
+    """
+    programs = [getattr(instance, "_catalog_previous_program", None)]
+    if signal is post_save:
+        programs.append(_stored_program(sender, instance.pk))
+    static_export.mark_stale(
+        static_export.materials_key(instance.pk),
+        *(static_export.subjects_key(program) for program in programs if program),
+    )
+
+
+def export_structure_changed(sender, **kwargs):
+    """Program names, terms and type slugs shape every exported file."""
+    static_export.mark_stale(static_export.ALL)
+
+
+for _model in (Program, Syllabus, Term, MaterialType):
+    post_save.connect(export_structure_changed, sender=_model, dispatch_uid=f"resources.static_export.{_model.__name__}.save")
+    post_delete.connect(export_structure_changed, sender=_model, dispatch_uid=f"resources.static_export.{_model.__name__}.delete")
+
+
+@receiver(post_save, sender=Program, dispatch_uid="resources.catalog.program_saved")
+def program_saved(sender, instance, **kwargs):
+    """Names and durations appear in the tree; deletes cascade to the snapshot."""
+    invalidate_catalog(instance.short_name)
+
+
+@receiver(post_save, sender=MaterialType, dispatch_uid="resources.catalog.material_type_saved")
+@receiver(post_delete, sender=MaterialType, dispatch_uid="resources.catalog.material_type_deleted")
+def material_type_changed(sender, **kwargs):
+    """Type slugs key the counts of every tree."""
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=SubjectMaterial, dispatch_uid="resources.activity.material_published")
+def material_published(sender, instance, created=False, raw=False, **kwargs):
+    """Add newly created materials to the activity feed."""
+    if created and not raw:
+        program_id = activity.material_programs([instance]).get(instance.subject_id)
+        activity.record_activities([activity.material_activity(instance, program_id)])
+
+
+@receiver(post_delete, sender=SubjectMaterial, dispatch_uid="resources.activity.material_unpublished")
+def material_unpublished(sender, instance, **kwargs):
+    activity.remove_activity(Activity.Kind.MATERIAL, instance.pk)
@@ -0,0 +1,120 @@
+"""
+RGU Hub Backend - Slug Allocation
+
+Allocates unique slugs for a whole batch of objects with one query.
+
+How it works:
+- Each object gets a base slug (for subjects: program, term number and code)
+- One query fetches every stored slug equal to a base or starting with
+  `<base>-`
+- Free slugs are picked in memory: the base itself, else `<base>-2`,
+  `<base>-3`, ... (also unique within the batch)
+- Writes run in a savepoint; if a concurrent writer takes one of the slugs
+  first, the unique constraint fails and the slugs are allocated again
+
+Functions work on any model with a `slug` field. Data migrations inline
+their own copy instead of importing this module (see
+migrations/0017_backfill_subject_slugs.py).
+
+Functions Overview:
+- allocate_slugs: Unique slugs for a list of base slugs
+- assign_subject_slugs: Fill in missing Subject slugs
+- write_with_slug_retry: Run a write, re-allocating slugs on conflicts
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+SLUG_ATTEMPTS = 3
+
+
+def allocate_slugs(model, bases, field="slug"):
+    """
+    Return one unique slug per entry of `bases`, in order.
+
+    Runs a single query against `model` covering every distinct base.
+    """
+    distinct = sorted(set(bases))
+    if not distinct:
+        return []
+    prefixes = Q()
+    for base in distinct:
+        prefixes |= Q(**{field: base}) | Q(**{f"{field}__startswith": f"{base}-"})
+    taken = set(model._default_manager.filter(prefixes).values_list(field, flat=True))
+
+    next_suffix = {}
+    slugs = []
+    for base in bases:
+        candidate = base
+        if candidate in taken:
+            counter = next_suffix.get(base, 2)
+            while f"{base}-{counter}" in taken:
+                counter += 1
+            candidate = f"{base}-{counter}"
+            next_suffix[base] = counter + 1
+        taken.add(candidate)
+        slugs.append(candidate)
+    return slugs
+
+
+def subject_slug_base(program, term_number, code, name):
+    """Base slug for a subject: program short name, term number, then code (or name)."""
+    parts = [str(part) for part in (program, term_number) if part is not None]
+    parts.append(code or name)
+    return slugify("-".join(parts)) or slugify(code or name) or "subject"
+
+
+def assign_subject_slugs(subjects, model=None):
+    """
+    Set a unique slug on every subject in `subjects` that has none.
+
+    Term details are read with one query for all subjects, and slugs are
+    allocated with one more. `model` defaults to the subjects' class.
+    """
+    pending = [subject for subject in subjects if not subject.slug]
+    if not pending:
+        return
+    model = model or type(pending[0])
+    term_model = model._meta.get_field("term").related_model
+    terms = {
+        term_id: (program, number)
+        for term_id, program, number in term_model._default_manager.filter(
+            pk__in={subject.term_id for subject in pending}
+        ).values_list("id", "syllabus__program__short_name", "term_number")
+    }
+    bases = [
+        subject_slug_base(*terms.get(subject.term_id, (None, None)), subject.code, subject.name)
+        for subject in pending
+    ]
+    for subject, slug in zip(pending, allocate_slugs(model, bases)):
+        subject.slug = slug
+
+
+def write_with_slug_retry(objects, assign, write, using=None, attempts=SLUG_ATTEMPTS):
+    """
+    Assign slugs with `assign(objects)` and run `write()` in a savepoint.
+
+    If the write fails with an IntegrityError because one of the allocated
+    slugs was taken concurrently, the slugs are allocated again and the
+    write is retried (up to `attempts` times). Other integrity errors are
+    raised straight away. Returns the result of `write()`.
+    """
+    pending = [obj for obj in objects if not obj.slug]
+    for attempt in range(attempts):
+        assign(pending)
+        try:
+            with transaction.atomic(using=using):
+                return write()
+        except IntegrityError:
+            if not pending or attempt + 1 == attempts:
+                raise
+            model = type(pending[0])
+            slugs = [obj.slug for obj in pending]
+            if not model._default_manager.using(using).filter(slug__in=slugs).exists():
+                raise
+            for obj in pending:
+                obj.slug = ""
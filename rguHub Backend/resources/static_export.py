@@ -0,0 +1,292 @@
+"""
+RGU Hub Backend - Static JSON Export
+
+Renders the public read endpoints into static JSON files that a CDN or
+edge server can serve without reaching Django. Almost every request is an
+anonymous read of data that only changes when an admin uploads something.
+
+Files:
+Each URL is rendered through its real view (bypassing the response
+cache), so a file holds exactly the body the API returns for that URL.
+The directory tree mirrors the URLs:
+- /material-types/                     -> material-types/index.json
+- /latest-updates/                     -> latest-updates/index.json
+- /recruitments/                       -> recruitments/index.json
+- /recruitments/?program=P             -> recruitments/program=P.json
+- /subjects/?course=X                  -> subjects/course=X.json
+- /subjects/?course=X&sem=N (or year=N) -> subjects/course=X&sem=N.json
+- /materials/?subject=S                -> materials/subject=S.json
+- /materials/?subject=S&type=T         -> materials/subject=S&type=T.json
+Query parameters are sorted and URL-encoded (static_path()). Course codes
+use the stored program short names. The edge should rewrite a request
+with exactly these parameters, in sorted order, to its file, and send
+everything else (other parameters, cursors, formats, writes) to the origin.
+
+Incremental regeneration:
+- Files are grouped into partitions: the material lists of one subject,
+  the subject lists of one program, the postings of one program, and one
+  partition for each of the remaining files.
+- Writes to subjects, materials and job postings mark the partitions they
+  affect stale (see resources.signals and recruitment.signals). Once the
+  write commits, the partitions' revisions are incremented
+  (StaticExportPartition), outside the writer's transaction and once per
+  transaction. Writes to programs, syllabi, terms and material types mark
+  the whole export stale.
+- The export directory keeps a manifest (MANIFEST_NAME) with the revision
+  and file hashes each partition was built at. An export re-renders only
+  the partitions whose revision moved, writes only files whose bytes
+  changed (atomically, through a temporary file) and deletes the files a
+  partition no longer has (deleted subjects, renamed slugs).
+The repo's bulk writers (ingest_materials, Subject bulk_create, synthetic
+data) mark partitions themselves. Other writes that bypass signals
+(QuerySet.update(), raw SQL) need a full export (`--full`).
+
+Functions Overview:
+- mark_stale: Increment partition revisions after the write commits
+- static_path: File path of a URL and its query parameters
+- export_static_api: Write or refresh an export directory
+
+Settings:
+- STATIC_EXPORT_HOST: Host name used for absolute links in rendered
+  responses (default: "localhost")
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db.models import F
+from django.urls import resolve
+from django.utils import timezone
+
+from .models import MaterialType, Program, StaticExportPartition, Subject, Term
+from .on_commit import CommitBatch
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Incremented by writes that change every file (programs, terms, types)
+ALL = "all"
+MATERIAL_TYPES = "material-types"
+LATEST_UPDATES = "latest-updates"
+RECRUITMENTS = "recruitments"
+
+
+def materials_key(subject_id):
+    return f"materials:{subject_id}"
+
+
+def subjects_key(program):
+    return f"subjects:{program}"
+
+
+def recruitments_key(program):
+    return f"{RECRUITMENTS}:{program}"
+
+
+class _MarkStale(CommitBatch):
+    """Increment of the partitions marked by one transaction."""
+
+    def __init__(self):
+        super().__init__()
+        self.keys = set()
+
+    def run(self):
+        StaticExportPartition.objects.bulk_create(
+            [StaticExportPartition(key=key) for key in self.keys], ignore_conflicts=True
+        )
+        # Increment after the commit, so an export that reads the new
+        # revision renders the committed write
+        StaticExportPartition.objects.filter(key__in=self.keys).update(
+            revision=F("revision") + 1, changed_at=timezone.now()
+        )
+
+
+def mark_stale(*keys):
+    """
+    Increment the revision of the given partitions once the current
+    transaction commits.
+
+    Empty keys are ignored. All marks of one transaction share a single
+    increment (resources.on_commit). A rolled-back write marks nothing on
+    its own; its partitions are marked along with the next committed mark.
+    """
+    keys = {key for key in keys if key}
+    if not keys:
+        return
+    mark = _MarkStale.pending()
+    mark.keys.update(keys)
+    mark.schedule()
+
+
+# ----------------- Partitions -----------------
+
+def all_partitions():
+    """Keys of every partition the current data produces."""
+    keys = {MATERIAL_TYPES, LATEST_UPDATES, RECRUITMENTS}
+    for program in Program.objects.values_list("short_name", flat=True):
+        keys.update((subjects_key(program), recruitments_key(program)))
+    keys.update(materials_key(pk) for pk in Subject.objects.values_list("pk", flat=True))
+    return keys
+
+
+def partition_urls(key):
+    """
+    Return the `(path, params)` URLs of a partition.
+
+    A partition whose program or subject no longer exists has no URLs.
+    """
+    kind, _, value = key.partition(":")
+    if not value:
+        return [(f"/{kind}/", {})]
+    if kind == RECRUITMENTS:
+        if not Program.objects.filter(short_name=value).exists():
+            return []
+        return [("/recruitments/", {"program": value})]
+    if kind == "subjects":
+        if not Program.objects.filter(short_name=value).exists():
+            return []
+        terms = (
+            Term.objects.filter(syllabus__program__short_name=value)
+            .order_by("term_type", "term_number")
+            .values_list("term_type", "term_number")
+            .distinct()
+        )
+        urls = [("/subjects/", {"course": value})]
+        for term_type, number in terms:
+            param = "sem" if term_type == Term.TermType.SEMESTER else "year"
+            urls.append(("/subjects/", {"course": value, param: number}))
+        return urls
+    if kind == "materials":
+        slug = Subject.objects.filter(pk=value).values_list("slug", flat=True).first()
+        if slug is None:
+            return []
+        urls = [("/materials/", {"subject": slug})]
+        for type_slug in MaterialType.objects.order_by("slug").values_list("slug", flat=True):
+            urls.append(("/materials/", {"subject": slug, "type": type_slug}))
+        return urls
+    raise ValueError(f"Unknown static export partition: {key!r}")
+
+
+def static_path(path, params):
+    """Relative file path of a URL (see the module docstring)."""
+    directory = path.strip("/")
+    if not params:
+        return f"{directory}/index.json"
+    return f"{directory}/{urlencode(sorted(params.items()))}.json"
+
+
+# ----------------- Rendering -----------------
+
+def render(path, params):
+    """Render a GET request through its view; return (status code, body)."""
+    request = WSGIRequest({
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": urlencode(params),
+        "SERVER_NAME": getattr(settings, "STATIC_EXPORT_HOST", "localhost"),
+        "SERVER_PORT": "443",
+        "HTTP_ACCEPT": "application/json",
+        "wsgi.url_scheme": "https",
+        "wsgi.input": BytesIO(),
+    })
+    # Export renders would only evict the entries real clients hit
+    request.bypass_response_cache = True
+    match = resolve(path)
+    view = match.func
+    if iscoroutinefunction(view):
+        # List routes are async views when API_ASYNC_VIEWS is on
+        view = async_to_sync(view)
+    response = view(request, *match.args, **match.kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response.status_code, response.content
+
+
+def _write(target, content):
+    """Replace `target` with `content` atomically."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=target.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            stream.write(content)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, target)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load_manifest(directory):
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def export_static_api(directory, full=False):
+    """
+    Write or refresh the static export in `directory`.
+
+    Re-renders every partition when `full` is set, when the directory has no
+    (current) manifest or when the whole export was marked stale; otherwise
+    only the partitions changed since the last export. Returns counts of
+    rendered partitions and of written, unchanged and deleted files, plus
+    the URLs that did not return 200 (not written).
+    """
+    directory = Path(directory)
+    revisions = dict(StaticExportPartition.objects.values_list("key", "revision"))
+    manifest = load_manifest(directory)
+    if manifest is None or manifest["revision"] != revisions.get(ALL, 0):
+        full = True
+    built = manifest["partitions"] if manifest is not None else {}
+
+    current = all_partitions()
+    stale = sorted(
+        key for key in current | set(built)
+        if full or key not in built or built[key]["revision"] != revisions.get(key, 0)
+    )
+    result = {"full": full, "partitions": len(stale), "written": 0, "unchanged": 0, "deleted": 0, "failed": []}
+    removed = set()
+    for key in stale:
+        previous = built.pop(key, {"files": {}})["files"]
+        files = {}
+        for path, params in partition_urls(key):
+            name = static_path(path, params)
+            status, content = render(path, params)
+            if status != 200:
+                result["failed"].append({"path": path, "params": params, "status": status})
+                continue
+            digest = hashlib.sha256(content).hexdigest()
+            files[name] = digest
+            if previous.get(name) == digest and (directory / name).exists():
+                result["unchanged"] += 1
+            else:
+                _write(directory / name, content)
+                result["written"] += 1
+        removed.update(previous.keys() - files.keys())
+        if files:
+            built[key] = {"revision": revisions.get(key, 0), "files": files}
+
+    # After all writes: a file dropped by one partition may belong to another
+    # now (e.g. a new subject reusing a deleted subject's slug)
+    for name in removed.difference(*(entry["files"] for entry in built.values())):
+        (directory / name).unlink(missing_ok=True)
+        result["deleted"] += 1
+
+    manifest = {"version": MANIFEST_VERSION, "revision": revisions.get(ALL, 0), "partitions": built}
+    _write(directory / MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True).encode())
+    return result
@@ -0,0 +1,126 @@
+"""
+RGU Hub Backend - Material File Storage
+
+Storage backends for SubjectMaterial files.
+
+Both backends record the metadata of each upload (public_id, resource_type,
+version) so it can be stored on the material, and both can build delivery
+URLs from that metadata without calling the storage SDK.
+
+Classes Overview:
+- MaterialCloudinaryStorage: Cloudinary media storage (production)
+- LocalMaterialStorage: Local filesystem stand-in for tests and offline work
+
+Functions Overview:
+- material_storage: Storage callable used by SubjectMaterial.file, selected
+  with settings.MATERIAL_STORAGE
+- pop_upload_metadata: Retrieve the metadata recorded for an upload
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import re
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import unquote
+
+import cloudinary
+from cloudinary_storage.storage import MediaCloudinaryStorage
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from django.utils.module_loading import import_string
+
+_uploads = threading.local()
+
+
+def _remember_upload(public_id, resource_type, version):
+    if not hasattr(_uploads, "metadata"):
+        _uploads.metadata = {}
+    _uploads.metadata[public_id] = (resource_type or "", version)
+
+
+def pop_upload_metadata(public_id):
+    """
+    Return `(resource_type, version)` recorded when `public_id` was uploaded
+    by this thread, or None if it was not uploaded here.
+    """
+    return getattr(_uploads, "metadata", {}).pop(public_id, None)
+
+
+# Same escaping as cloudinary.utils.smart_escape: keep [a-zA-Z0-9_.-/:]
+_UNSAFE = re.compile(rb"([^a-zA-Z0-9_.\-/:]+)")
+
+
+def _escape(source):
+    def pack(match):
+        return "".join("%%%02X" % byte for byte in match.group(1)).encode("ascii")
+
+    return _UNSAFE.sub(pack, source.encode("utf-8")).decode("ascii")
+
+
+@deconstructible
+class MaterialCloudinaryStorage(MediaCloudinaryStorage):
+    """
+    Cloudinary media storage with offline delivery-URL resolution.
+
+    `delivery_url()` produces the same URL as `url()` (which goes through
+    cloudinary.utils.cloudinary_url) for plain uploads, but with simple
+    string formatting and no SDK option processing.
+    """
+
+    def _upload(self, name, content):
+        response = super()._upload(name, content)
+        _remember_upload(response["public_id"], response.get("resource_type"), response.get("version"))
+        return response
+
+    def delivery_url(self, public_id, resource_type=None, version=None):
+        config = cloudinary.config()
+        scheme = "https" if config.secure else "http"
+        source = _escape(unquote(re.sub(r"([^:])/+", r"\1/", self._prepend_prefix(public_id))))
+        if not version and "/" in source and not re.match(r"^v[0-9]+", source):
+            version = 1
+        parts = [
+            f"{scheme}://res.cloudinary.com/{config.cloud_name}",
+            resource_type or self._get_resource_type(public_id),
+            "upload",
+        ]
+        if version:
+            parts.append(f"v{version}")
+        parts.append(source)
+        return "/".join(parts)
+
+
+@deconstructible
+class LocalMaterialStorage(FileSystemStorage):
+    """
+    Local filesystem stand-in for MaterialCloudinaryStorage.
+
+    Stores files under `location` (MEDIA_ROOT by default) and reports the
+    same upload metadata as the Cloudinary backend, so uploads, ingestion
+    and URL resolution can be exercised without network access.
+    """
+    resource_type = "raw"
+
+    def _save(self, name, content):
+        name = super()._save(name, content)
+        _remember_upload(name, self.resource_type, int(time.time()))
+        return name
+
+    def delivery_url(self, public_id, resource_type=None, version=None):
+        return self.url(public_id)
+
+
+@lru_cache(maxsize=None)
+def _configured_storage(path):
+    return import_string(path)()
+
+
+def material_storage():
+    """Return the storage instance configured by settings.MATERIAL_STORAGE."""
+    return _configured_storage(
+        getattr(settings, "MATERIAL_STORAGE", "resources.storage.MaterialCloudinaryStorage")
+    )
+
@@ -0,0 +1,148 @@
+"""
+RGU Hub Backend - Streaming JSON Exports
+
+Streams whole list exports (`?stream=1`) as one JSON array without holding
+the queryset or the rendered body in memory.
+
+How it works:
+- The opening "[" is sent before the query runs
+- Rows are read with `QuerySet.iterator(chunk_size=...)` and rendered one
+  chunk at a time, so memory stays bounded by the chunk size
+- Rows come from resources.rows plans when the serializer compiles, else
+  every instance is serialized on its own
+
+The body is byte-for-byte the unpaginated JSON response: chunks are rendered
+by the same JSONRenderer and joined with ",". Streamed responses ignore
+pagination and are never stored in the response cache; conditional GET
+(ETag / 304) still applies.
+
+Under ASGI:
+Django consumes a synchronous streaming body under ASGI by reading it
+whole into memory first. ASGI requests therefore get an async iterator
+(AsyncChunks) that advances the same generator one chunk at a time in the
+request's sync thread, where its database connection lives. WSGI requests
+keep the plain generator.
+
+Components Overview:
+- StreamingListMixin: ViewSet mixin adding `?stream=1` to list()
+- stream_json_array: Render chunks of items as one JSON array, lazily
+- AsyncChunks / stream_body: Streaming bodies that stay lazy under ASGI
+  (also used by resources.downloads)
+
+Settings:
+- API_STREAM_CHUNK_SIZE: Rows fetched and rendered per chunk (default 2000)
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+STREAM_VALUES = ("1", "true", "yes")
+
+_DONE = object()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_json_array(chunks, renderer=None):
+    """Yield the JSON array of all items in `chunks` (lists of items), piece by piece."""
+    renderer = renderer or JSONRenderer()
+    yield b"["
+    separator = b""
+    for chunk in chunks:
+        # Render "[a,b,...]" and drop the brackets
+        yield separator + renderer.render(chunk)[1:-1]
+        separator = b","
+    yield b"]"
+
+
+class AsyncChunks:
+    """
+    Async iterator over a synchronous iterable, advanced one item at a time
+    in the request's sync thread. Closing it closes the iterable.
+    """
+
+    def __init__(self, iterable):
+        self.iterable = iterable
+
+    def __aiter__(self):
+        return self._items()
+
+    async def _items(self):
+        advance = sync_to_async(next, thread_sensitive=True)
+        iterator = iter(self.iterable)
+        while True:
+            item = await advance(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def close(self):
+        close = getattr(self.iterable, "close", None)
+        if close is not None:
+            close()
+
+
+def stream_body(request, iterable):
+    """
+    Return `iterable` as a StreamingHttpResponse body for `request` (Django
+    or DRF request): wrapped in AsyncChunks under ASGI, unchanged otherwise.
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        return AsyncChunks(iterable)
+    return iterable
+
+
+class StreamingListMixin:
+    """
+    Serve `?stream=1` list requests as a streamed JSON array of every row.
+
+    List it before CachedListMixin, so exports bypass the response cache.
+    Only the JSON format is streamed; other formats are rendered as usual.
+    """
+    stream_query_param = "stream"
+
+    def wants_stream(self, request):
+        value = request.query_params.get(self.stream_query_param, "").lower()
+        return value in STREAM_VALUES and request.accepted_renderer.format == "json"
+
+    def get_stream_chunk_size(self):
+        return max(getattr(settings, "API_STREAM_CHUNK_SIZE", 2000), 1)
+
+    def list(self, request, *args, **kwargs):
+        if not self.wants_stream(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # Bind the routed database now: the body is read after the view returns
+        queryset = queryset.using(queryset.db)
+        chunk_size = self.get_stream_chunk_size()
+        get_row_plan = getattr(self, "get_row_plan", None)
+        plan = get_row_plan() if get_row_plan is not None else None
+        if plan is not None:
+            rows = plan.values(queryset).iterator(chunk_size=chunk_size)
+            chunks = (plan.render(chunk) for chunk in _chunks(rows, chunk_size))
+        else:
+            serializer = self.get_serializer()
+            instances = queryset.iterator(chunk_size=chunk_size)
+            chunks = ([serializer.to_representation(instance) for instance in chunk]
+                      for chunk in _chunks(instances, chunk_size))
+
+        response = StreamingHttpResponse(stream_body(request, stream_json_array(chunks)), content_type="application/json")
+        # Let reverse proxies pass chunks through instead of buffering the export
+        response["X-Accel-Buffering"] = "no"
+        return response
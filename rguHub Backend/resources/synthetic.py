@@ -0,0 +1,345 @@
+"""
+RGU Hub Backend - Synthetic Dataset Generator
+
+Generates realistic catalog data at a configurable scale, for the
+`generate_synthetic_data` and `benchmark_endpoints` management commands.
+
+What is generated:
+- Programs with syllabi, semester terms and subjects (theory, practical and
+  clinical, with subject codes and names from a nursing/physiotherapy
+  vocabulary)
+- Materials spread unevenly over subjects (a few popular subjects hold most
+  files), typed with the existing MaterialTypes, PYQs with exam year/month,
+  a few inactive, with upload dates spread over three years
+- Job postings across programs, companies, locations and job types
+
+All rows are written with bulk_create() in batches; derived data (subject
+counters, search index, activity feed, catalog snapshots, static export
+and cached responses) is brought up to date the same way ingest_materials does. Files
+are not uploaded: materials point at made-up Cloudinary public_ids.
+
+Synthetic programs are flagged with Program.is_synthetic, which is how
+`remove_synthetic_data` finds them again (their short names start with
+`syn-`, but that is only a naming convention). The same seed always
+produces the same dataset.
+
+Components Overview:
+- Scale: Row counts of a dataset; SCALES holds the named presets
+- generate: Create a dataset
+- remove_synthetic_data: Delete every synthetic program and its rows
+- dataset_counts: Row counts of the current database
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import datetime
+import random
+import time
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .activity import material_activity, recruitment_activity, record_activities
+from .caching import response_cache
+from .catalog import invalidate_catalog
+from .counters import rebuild_material_counters
+from .delivery import material_url
+from .models import (
+    Activity, CatalogSnapshot, MaterialType, Program, Subject, SubjectMaterial, Syllabus, Term, title_from_filename,
+)
+from .search import index_objects, unindex_objects
+from .static_export import ALL, mark_stale
+
+PREFIX = "syn-"
+HISTORY_DAYS = 3 * 365
+
+DEFAULT_TYPES = ("Notes", "PYQ", "Question Bank", "Syllabus", "Practical")
+
+SUBJECT_NAMES = (
+    "Anatomy", "Physiology", "Biochemistry", "Microbiology", "Pharmacology", "Pathology", "Nutrition",
+    "Psychology", "Sociology", "Genetics", "Community Health Nursing", "Medical Surgical Nursing",
+    "Child Health Nursing", "Mental Health Nursing", "Midwifery", "Nursing Research", "Kinesiology",
+    "Biomechanics", "Electrotherapy", "Exercise Therapy", "Orthopaedics", "Neurology", "Cardiorespiratory Care",
+    "Sports Physiotherapy", "Health Education", "Clinical Nursing", "First Aid", "Radiology",
+)
+TOPICS = (
+    "Unit", "Chapter", "Module", "Lecture", "Revision", "Case Study", "Summary", "Lab Manual", "Handout",
+)
+COMPANIES = (
+    "Apollo Hospitals", "Manipal Hospitals", "Fortis Healthcare", "Narayana Health", "Aster DM Healthcare",
+    "Columbia Asia", "Sakra World Hospital", "Ramaiah Medical College", "St. John's Medical College",
+    "Max Healthcare", "Cloudnine Hospitals", "HealthCare Global",
+)
+POSITIONS = (
+    "Staff Nurse", "Nursing Officer", "ICU Nurse", "Clinical Instructor", "Physiotherapist",
+    "Sports Physiotherapist", "Rehabilitation Therapist", "Community Health Officer", "Nursing Intern",
+    "Physiotherapy Intern", "Ward Supervisor", "Home Care Nurse",
+)
+LOCATIONS = (
+    "Bengaluru", "Mysuru", "Mangaluru", "Hubballi", "Belagavi", "Chennai", "Hyderabad", "Kochi", "Pune", "Mumbai",
+)
+EXAM_MONTHS = ("July", "December")
+ROMAN = ("I", "II", "III", "IV")
+
+
+@dataclass(frozen=True)
+class Scale:
+    """
+    Row counts of a synthetic dataset.
+
+    `syllabi`, `terms` and `subjects` are per program, syllabus and term.
+    """
+    programs: int
+    syllabi: int
+    terms: int
+    subjects: int
+    materials: int
+    recruitments: int
+
+    @property
+    def subject_total(self):
+        return self.programs * self.syllabi * self.terms * self.subjects
+
+
+SCALES = {
+    "tiny": Scale(programs=2, syllabi=1, terms=4, subjects=4, materials=500, recruitments=100),
+    "small": Scale(programs=4, syllabi=2, terms=8, subjects=8, materials=10_000, recruitments=5_000),
+    "medium": Scale(programs=6, syllabi=2, terms=8, subjects=10, materials=100_000, recruitments=50_000),
+    "large": Scale(programs=8, syllabi=3, terms=8, subjects=12, materials=1_000_000, recruitments=100_000),
+}
+
+
+def synthetic_programs():
+    return Program.objects.filter(is_synthetic=True)
+
+
+def _recruitment_model():
+    # resources does not import the recruitment app at module level
+    return apps.get_model("recruitment", "Recruitment")
+
+
+def _material_types():
+    types = list(MaterialType.objects.all())
+    if not types:
+        for name in DEFAULT_TYPES:
+            MaterialType.objects.create(name=name)
+        types = list(MaterialType.objects.all())
+    return types
+
+
+def _spread(rng, now):
+    """A creation time within the last HISTORY_DAYS, biased towards recent dates."""
+    age = HISTORY_DAYS * 86400 * rng.random() ** 2
+    return now - datetime.timedelta(seconds=age)
+
+
+def _hierarchy(scale, rng, now):
+    """Create programs, syllabi, terms and subjects; return the subjects."""
+    programs = Program.objects.bulk_create([
+        Program(
+            name=f"Synthetic Program {number:02d}",
+            short_name=f"{PREFIX}{number:02d}",
+            duration_years=max(scale.terms // 2, 1),
+            is_synthetic=True,
+        )
+        for number in range(1, scale.programs + 1)
+    ])
+    first_year = now.year - 2 * scale.syllabi
+    syllabi = Syllabus.objects.bulk_create([
+        Syllabus(
+            program=program,
+            name=f"Regulation {first_year + 2 * index}",
+            effective_from=datetime.date(first_year + 2 * index, 6, 1),
+        )
+        for program in programs
+        for index in range(scale.syllabi)
+    ])
+    terms = Term.objects.bulk_create([
+        Term(
+            syllabus=syllabus,
+            term_number=number,
+            term_type=Term.TermType.SEMESTER,
+            name=f"Semester {number}",
+            slug=f"{syllabus.program.short_name}-{slugify(syllabus.name)}-semester-{number}",
+        )
+        for syllabus in syllabi
+        for number in range(1, scale.terms + 1)
+    ])
+    subject_types = [choice for choice, _ in Subject.SubjectType.choices]
+    subjects = []
+    for term in terms:
+        program_number = term.syllabus.program.short_name[len(PREFIX):]
+        for index in range(scale.subjects):
+            subject_name = SUBJECT_NAMES[(term.term_number * 7 + index) % len(SUBJECT_NAMES)]
+            subjects.append(Subject(
+                term=term,
+                code=f"S{program_number}{term.term_number:02d}{index + 1:02d}",
+                name=f"{subject_name} {ROMAN[(term.term_number - 1) // 2 % len(ROMAN)]}",
+                subject_type=rng.choices(subject_types, weights=(6, 3, 1))[0],
+            ))
+    # SubjectQuerySet.bulk_create allocates slugs and indexes the subjects
+    return Subject.objects.bulk_create(subjects)
+
+
+def _popularity(subjects, rng):
+    """Return `(subjects, cumulative weights)` with Zipf-like popularity in random order."""
+    ranked = list(subjects)
+    rng.shuffle(ranked)
+    cumulative, total = [], 0.0
+    for rank in range(len(ranked)):
+        total += 1 / (rank + 1) ** 0.8
+        cumulative.append(total)
+    return ranked, cumulative
+
+
+def _materials(popularity, types, count, rng, now, start):
+    """Build `count` unsaved materials, numbered from `start`."""
+    ranked, cumulative = popularity
+    pyq = next((material_type for material_type in types if material_type.slug == "pyq"), None)
+    materials = []
+    for number, subject in enumerate(rng.choices(ranked, cum_weights=cumulative, k=count), start):
+        material_type = rng.choice(types)
+        if material_type == pyq:
+            label = f"{subject.code} Question Paper"
+            year, month = rng.randint(now.year - 8, now.year), rng.choice(EXAM_MONTHS)
+        else:
+            label = f"{subject.name} {rng.choice(TOPICS)} {rng.randint(1, 12)}"
+            year, month = (rng.randint(now.year - 5, now.year) if rng.random() < 0.3 else None), None
+        material = SubjectMaterial(
+            subject=subject,
+            material_type=material_type,
+            file=f"materials/{label}_{number}.pdf",
+            resource_type="raw",
+            version=1_600_000_000 + number,
+            description=f"{material_type.name} for {subject.name}" if rng.random() < 0.5 else "",
+            year=year,
+            month=month,
+            is_active=rng.random() >= 0.05,
+        )
+        material.title = title_from_filename(material.file.name)
+        material.url = material_url(material) or ""
+        material.created_at = _spread(rng, now)
+        materials.append(material)
+    return materials
+
+
+def _recruitments(programs, count, rng, now):
+    Recruitment = _recruitment_model()
+    postings = []
+    job_types = [code for code, _ in Recruitment.JOB_TYPES]
+    for _ in range(count):
+        position = rng.choice(POSITIONS)
+        company = rng.choice(COMPANIES)
+        posted_on = _spread(rng, now)
+        postings.append(Recruitment(
+            program=rng.choice(programs),
+            company_name=company,
+            position=position,
+            location=rng.choice(LOCATIONS),
+            job_type=rng.choices(job_types, weights=(6, 2, 2))[0],
+            description=f"{company} is hiring a {position} for its {rng.choice(LOCATIONS)} centre.",
+            requirements="Registered with the state council. Freshers may apply.",
+            salary=f"{rng.randint(2, 9) * 10000} INR / month" if rng.random() < 0.6 else None,
+            deadline=(posted_on + datetime.timedelta(days=rng.randint(14, 60))).date(),
+            apply_link=f"https://careers.example.com/{slugify(company)}/{rng.randint(1000, 999999)}",
+            posted_on=posted_on,
+        ))
+    return postings
+
+
+def generate(scale, seed=0, batch_size=5000, on_progress=None):
+    """
+    Create a synthetic dataset of the given Scale.
+
+    Materials and postings are written in transactions of `batch_size`
+    rows; `on_progress(label, done, total)` is called after each one.
+    Returns the generation time in seconds.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    started = time.monotonic()
+    Recruitment = _recruitment_model()
+
+    with transaction.atomic():
+        types = _material_types()
+        subjects = _hierarchy(scale, rng, now)
+    programs = list(synthetic_programs())
+    program_ids = {subject.pk: subject.term.syllabus.program_id for subject in subjects}
+    # A few popular subjects get most of the files
+    popularity = _popularity(subjects, rng)
+
+    for start in range(0, scale.materials, batch_size):
+        materials = _materials(popularity, types, min(batch_size, scale.materials - start), rng, now, start)
+        with transaction.atomic():
+            SubjectMaterial.objects.bulk_create(materials)
+            index_objects(materials)
+            record_activities(material_activity(material, program_ids[material.subject_id]) for material in materials)
+        if on_progress is not None:
+            on_progress("materials", start + len(materials), scale.materials)
+
+    for start in range(0, scale.recruitments, batch_size):
+        postings = _recruitments(programs, min(batch_size, scale.recruitments - start), rng, now)
+        with transaction.atomic():
+            Recruitment.objects.bulk_create(postings)
+            index_objects(postings)
+            record_activities(recruitment_activity(posting) for posting in postings)
+        if on_progress is not None:
+            on_progress("recruitments", start + len(postings), scale.recruitments)
+
+    with transaction.atomic():
+        # Counters are rebuilt once at the end instead of after every batch
+        rebuild_material_counters([subject.pk for subject in subjects])
+        invalidate_catalog(*(program.short_name for program in programs))
+        _bump_all()
+    return time.monotonic() - started
+
+
+def _bump_all():
+    response_cache.bump(*(
+        model._meta.label_lower
+        for model in (Program, Syllabus, Term, Subject, SubjectMaterial, Activity, _recruitment_model())
+    ))
+    # Whole programs come and go: the next static export is a full one
+    mark_stale(ALL)
+
+
+def remove_synthetic_data():
+    """
+    Delete every synthetic program with its rows. Returns the number of
+    programs removed.
+
+    Rows are deleted with one statement per table instead of the per-object
+    deletes (and signals) of QuerySet.delete(); the search index, feed,
+    caches and static export are cleaned up here instead.
+    """
+    program_ids = list(synthetic_programs().values_list("pk", flat=True))
+    if not program_ids:
+        return 0
+    Recruitment = _recruitment_model()
+    querysets = [
+        SubjectMaterial.objects.filter(subject__term__syllabus__program_id__in=program_ids),
+        Recruitment.objects.filter(program_id__in=program_ids),
+        Activity.objects.filter(program_id__in=program_ids),
+        Subject.objects.filter(term__syllabus__program_id__in=program_ids),
+        Term.objects.filter(syllabus__program_id__in=program_ids),
+        Syllabus.objects.filter(program_id__in=program_ids),
+        CatalogSnapshot.objects.filter(program_id__in=program_ids),
+        Program.objects.filter(pk__in=program_ids),
+    ]
+    with transaction.atomic():
+        for queryset in querysets:
+            if queryset.model in (SubjectMaterial, Recruitment, Subject):
+                unindex_objects(queryset.model, list(queryset.values_list("pk", flat=True)))
+            queryset._raw_delete(queryset.db)
+        _bump_all()
+    return len(program_ids)
+
+
+def dataset_counts():
+    """Return the row count of every model the API serves."""
+    models = (Program, Syllabus, Term, Subject, MaterialType, SubjectMaterial, _recruitment_model(), Activity)
+    return {model._meta.label_lower: model.objects.count() for model in models}
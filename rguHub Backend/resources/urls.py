@@ -9,6 +9,12 @@ URL Patterns:
 - /materials/ - SubjectMaterialViewSet endpoints
 - /subjects/ - SubjectViewSet endpoints  
 - /material-types/ - MaterialTypeViewSet endpoints
+- /catalog/ - CatalogViewSet navigation tree
+- /search/ - SearchViewSet full-text search
+- /cache-stats/ - Response cache statistics
+
+With API_ASYNC_VIEWS (off by default), GET /materials/ and GET /subjects/
+are served by async views (resources.async_views).
 
 Generated Endpoints:
 - GET /materials/ - List all materials
@@ -20,14 +26,18 @@ Generated Endpoints:
 - GET /subjects/{id}/ - Get specific subject
 - GET /material-types/ - List all material types
 - GET /material-types/{id}/ - Get specific material type
+- GET /catalog/ - Program/Syllabus/Term/Subject tree with material counts
+- GET /search/?q=text - Ranked full-text search
 
 Author: RGU Hub Development Team
 Last Updated: 2025
 """
 
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import SubjectMaterialViewSet, SubjectViewSet, MaterialTypeViewSet
+from .async_views import async_list_urls
+from .views import SubjectMaterialViewSet, SubjectViewSet, MaterialTypeViewSet, CatalogViewSet, SearchViewSet, cache_stats
 
 # Create router instance
 router = DefaultRouter()
@@ -36,9 +46,17 @@ router = DefaultRouter()
 router.register(r"materials", SubjectMaterialViewSet, basename="material")
 router.register(r'subjects', SubjectViewSet)
 router.register(r'material-types', MaterialTypeViewSet)
+router.register(r"catalog", CatalogViewSet, basename="catalog")
+router.register(r"search", SearchViewSet, basename="search")
 
 # URL patterns
 urlpatterns = [
+    path("cache-stats/", cache_stats, name="cache-stats"),
+]
+if settings.API_ASYNC_VIEWS:
+    # List routes served by async views (resources.async_views)
+    urlpatterns += async_list_urls(router)
+urlpatterns += [
     path("", include(router.urls)),
 ]
 
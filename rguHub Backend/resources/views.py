@@ -8,29 +8,64 @@ ViewSets Overview:
 - MaterialTypeViewSet: Read-only access to material types
 - SubjectMaterialViewSet: CRUD operations for study materials with filtering
 - SubjectViewSet: Read-only access to subjects with course/year/semester filtering
+- CatalogViewSet: Program/Syllabus/Term/Subject navigation tree with material counts
+- SearchViewSet: Full-text search across materials, subjects and job postings
+- cache_stats: Response cache hit/miss statistics (staff or METRICS_TOKEN)
 
 API Endpoints:
 - GET /material-types/ - List all material types
 - GET /materials/ - List all materials
 - GET /materials/?subject=slug - Filter by subject slug
 - GET /materials/?type=slug - Filter by material type slug
+- GET /materials/?stream=1 - Stream every matching material as one JSON array
+- GET /materials/{id}/download/ - Stream the file (supports Range requests)
 - GET /subjects/ - List all subjects
 - GET /subjects/?course=BSCN - Filter by program
 - GET /subjects/?course=BSCN&sem=1 - Filter by program and semester
 - GET /subjects/?course=BSCN&year=1 - Filter by program and year
+- GET /catalog/ - Navigation tree with material counts
+- GET /search/?q=anatomy - Full-text search
+- GET /cache-stats/ - Response cache statistics (staff or METRICS_TOKEN)
+
+List responses are served from the versioned response cache in
+resources.caching; see that module for invalidation details. All read
+endpoints answer If-None-Match with 304 Not Modified
+(resources.conditional). Every request is logged as one structured,
+sampled line (resources.request_log). Besides JSON, every endpoint can
+answer in the formats of resources.renderers (orjson, MessagePack,
+columnar "compact" JSON); `compact_intern_fields` names the columns whose
+repeated values the compact format sends once. Under ASGI, /materials/
+and /subjects/ lists are served by async views (resources.async_views).
 
 Author: RGU Hub Development Team
 Last Updated: 2025
 """
 
 from rest_framework import viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.response import Response
+from rguHub.metrics import has_metrics_token
+from .async_views import AsyncListMixin
+from .caching import CachedListMixin, response_cache, scope
+from .catalog import get_catalog
+from .conditional import ConditionalGetMixin
+from .downloads import download_response
+from .fieldsets import SparseFieldsetViewMixin
+from .filters import SubjectFilter, SubjectMaterialFilter
+from .indexes import short_name_matches
 from .models import SubjectMaterial, Subject, MaterialType
+from .pagination import MaterialCursorPagination
+from .renderers import VaryOnAcceptMixin, vary_on_accept
+from .request_log import RequestLogMixin, log_event
+from .rows import RowListMixin
+from .streaming import StreamingListMixin
+from .search import registered_kinds, search
 from .serializers import SubjectMaterialSerializer, SubjectSerializer, MaterialTypeSerializer
 import logging
 
-logger = logging.getLogger(__name__)
-
-class MaterialTypeViewSet(viewsets.ReadOnlyModelViewSet):
+class MaterialTypeViewSet(VaryOnAcceptMixin, RequestLogMixin, ConditionalGetMixin, CachedListMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only ViewSet for MaterialType model.
     
@@ -53,8 +88,9 @@ class MaterialTypeViewSet(viewsets.ReadOnlyModelViewSet):
     """
     queryset = MaterialType.objects.all()
     serializer_class = MaterialTypeSerializer
+    cache_scopes = ("resources.materialtype",)
 
-class SubjectMaterialViewSet(viewsets.ModelViewSet):
+class SubjectMaterialViewSet(AsyncListMixin, VaryOnAcceptMixin, RequestLogMixin, SparseFieldsetViewMixin, ConditionalGetMixin, StreamingListMixin, CachedListMixin, RowListMixin, viewsets.ModelViewSet):
     """
     CRUD ViewSet for SubjectMaterial model with advanced filtering.
     
@@ -66,6 +102,7 @@ class SubjectMaterialViewSet(viewsets.ModelViewSet):
     - GET /materials/?subject=bn101-anatomy-physiology - Filter by subject
     - GET /materials/?type=notes - Filter by material type
     - GET /materials/?subject=bn101&type=pyq - Combined filtering
+    - GET /materials/?program=BSCN&term_number=1&year_min=2022 - Catalog and year filters
     - POST /materials/ - Create new material
     - PUT/PATCH /materials/{id}/ - Update material
     - DELETE /materials/{id}/ - Delete material
@@ -73,6 +110,18 @@ class SubjectMaterialViewSet(viewsets.ModelViewSet):
     Query Parameters:
     - subject: Subject slug (e.g., "bn101-anatomy-physiology")
     - type: Material type slug (e.g., "notes", "pyq", "question-bank")
+    - program, program_id, syllabus_id, term_id, term_number, term_type,
+      subject_id, subject_type, material_type_id, year, year_min, year_max,
+      month, is_active: See resources.filters.SubjectMaterialFilter
+    - cursor: Opaque cursor from a previous page's next/previous link
+    - page_size: Number of materials per page (max 200)
+    - stream: "1" streams every matching material as one JSON array
+      (resources.streaming), ignoring pagination
+
+    Pagination:
+    Cursor (keyset) pagination ordered by (-year, -created_at, id). While
+    API_PAGINATION_COMPAT is enabled, requests without cursor/page_size get
+    the legacy unpaginated array.
     
     Response Format:
     {
@@ -96,36 +145,48 @@ class SubjectMaterialViewSet(viewsets.ModelViewSet):
     """
     queryset = SubjectMaterial.objects.all()
     serializer_class = SubjectMaterialSerializer
+    pagination_class = MaterialCursorPagination
+    filterset_class = SubjectMaterialFilter
+    cache_scopes = ("resources.subjectmaterial", "resources.subject", "resources.materialtype")
+    log_params = ("subject", "type", "page_size", "stream") + tuple(SubjectMaterialFilter.base_filters)
+    compact_intern_fields = ("subject_id", "subject_code", "subject_name", "material_type")
 
-    def list(self, request, *args, **kwargs):
+    def get_queryset(self):
         """
-        Override list method to add custom filtering logic.
+        Override get_queryset to add custom filtering logic.
         
         Filters materials by:
         1. Subject slug (if provided)
         2. Material type slug (if provided)
-        
-        Logs filtering operations for debugging.
+
+        Filters and result sizes are logged by RequestLogMixin, without
+        extra queries.
         """
-        subject_slug = request.query_params.get("subject")
-        material_type = request.query_params.get("type")
-        
-        logger.info(f"[SubjectMaterialViewSet] Request received with subject slug: {subject_slug}, material type: {material_type}")
-        
-        qs = self.queryset
+        subject_slug = self.request.query_params.get("subject")
+        material_type = self.request.query_params.get("type")
+
+        qs = super().get_queryset()
         if subject_slug:
             qs = qs.filter(subject__slug=subject_slug)
-            logger.info(f"[SubjectMaterialViewSet] After subject filter: {qs.count()} materials")
-            
         if material_type:
             qs = qs.filter(material_type__slug=material_type)
-            logger.info(f"[SubjectMaterialViewSet] After material type filter: {qs.count()} materials")
-            
-        logger.info(f"[SubjectMaterialViewSet] Final queryset count: {qs.count()}")
-        self.queryset = qs
-        return super().list(request, *args, **kwargs)
+        return qs
 
-class SubjectViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """
+        Stream the material file as an attachment.
+
+        Honors Range/If-Range (206 Partial Content) so downloads can resume
+        and PDF viewers can seek, and If-None-Match/If-Modified-Since (304).
+        Inactive materials are not downloadable.
+        """
+        material = self.get_object()
+        if not material.is_active or not material.file:
+            raise NotFound("This material is not available for download.")
+        return download_response(request._request, material)
+
+class SubjectViewSet(AsyncListMixin, VaryOnAcceptMixin, RequestLogMixin, SparseFieldsetViewMixin, ConditionalGetMixin, CachedListMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only ViewSet for Subject model with course and term filtering.
     
@@ -137,12 +198,15 @@ class SubjectViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /subjects/?course=BSCN - Filter by program short name
     - GET /subjects/?course=BSCN&sem=1 - Filter by program and semester
     - GET /subjects/?course=BSCN&year=1 - Filter by program and year
+    - GET /subjects/?program_id=1&subject_type=PRACTICAL - Catalog filters
     - GET /subjects/{id}/ - Get specific subject
     
     Query Parameters:
     - course: Program short name (case-insensitive, e.g., "BSCN", "BPT")
     - sem: Semester number (e.g., 1, 2, 3, 4)
     - year: Year number (e.g., 1, 2, 3, 4)
+    - program, program_id, syllabus_id, term_id, term_number, term_type,
+      subject_type, code: See resources.filters.SubjectFilter
     
     Response Format:
     {
@@ -153,13 +217,23 @@ class SubjectViewSet(viewsets.ReadOnlyModelViewSet):
         "slug": "bscn-1-bn101-anatomy-physiology",
         "term": 1,
         "term_slug": "bscn-cbcs-2022-semester-1",
-        "materials_count": 5
+        "materials_count": 5,
+        "active_materials_count": 4
     }
     """
     queryset = Subject.objects.select_related(
         "term", "term__syllabus", "term__syllabus__program"
     )
     serializer_class = SubjectSerializer
+    filterset_class = SubjectFilter
+    cache_scopes = ("resources.subject", "resources.term", "resources.syllabus", "resources.program")
+    log_params = ("course", "sem", "year") + tuple(SubjectFilter.base_filters)
+    compact_intern_fields = ("subject_type", "term", "term_slug")
+
+    def get_cache_scopes(self, request):
+        """Material counts only depend on the requested program's materials."""
+        course = request.query_params.get("course") or None
+        return super().get_cache_scopes(request) + [scope("resources.subjectmaterial", course)]
 
     def get_queryset(self):
         """
@@ -180,8 +254,8 @@ class SubjectViewSet(viewsets.ReadOnlyModelViewSet):
         if not course:
             return qs  # no course provided, return all
 
-        # make course case-insensitive
-        qs = qs.filter(term__syllabus__program__short_name__iexact=course)
+        # make course case-insensitive (UPPER() match, served by program_short_name_upper)
+        qs = qs.filter(short_name_matches("term__syllabus__program__short_name", course))
 
         if sem:
             try:
@@ -195,7 +269,150 @@ class SubjectViewSet(viewsets.ReadOnlyModelViewSet):
                 qs = qs.filter(term__term_type="YEAR", term__term_number=year)
             except (TypeError, ValueError):
                 return qs.none()  # invalid year
-        print(qs.query)
+        log_event(logging.DEBUG, "subjects.queryset", sql=lambda: str(qs.query))
 
         return qs
 
+
+class CatalogViewSet(VaryOnAcceptMixin, RequestLogMixin, ConditionalGetMixin, viewsets.ViewSet):
+    """
+    Whole Program -> Syllabus -> Term -> Subject tree for navigation.
+
+    Served from per-program snapshots (resources.catalog): a fresh catalog
+    costs one query, and a write only causes the affected program's tree to
+    be rebuilt.
+
+    Endpoints:
+    - GET /catalog/ - Tree for every program
+    - GET /catalog/?program=BSCN - Tree for one program (case-insensitive)
+
+    Every node carries `materials`: the number of active materials below it,
+    in total and by material type slug.
+
+    Response Format:
+    [
+        {
+            "id": 1,
+            "name": "Bachelor of Science in Nursing",
+            "short_name": "BSCN",
+            "duration_years": 4,
+            "materials": {"total": 12, "by_type": {"notes": 9, "pyq": 3}},
+            "syllabi": [
+                {
+                    "id": 1, "name": "CBCS 2022", "effective_from": null, "effective_to": null,
+                    "materials": {...},
+                    "terms": [
+                        {
+                            "id": 1, "term_number": 1, "term_type": "SEMESTER", "name": "",
+                            "slug": "bscn-cbcs-2022-semester-1",
+                            "materials": {...},
+                            "subjects": [
+                                {"id": 1, "code": "BN101", "name": "Anatomy", "subject_type": "THEORY",
+                                 "slug": "bscn-1-bn101", "materials": {...}}
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+    ]
+    """
+    cache_scopes = (
+        "resources.program",
+        "resources.syllabus",
+        "resources.term",
+        "resources.subject",
+        "resources.materialtype",
+    )
+    log_params = ("program",)
+
+    def get_cache_scopes(self, request):
+        program = request.query_params.get("program") or None
+        return super().get_cache_scopes(request) + [scope("resources.subjectmaterial", program)]
+
+    def list(self, request):
+        return Response(get_catalog(request.query_params.get("program") or None))
+
+
+class SearchViewSet(VaryOnAcceptMixin, RequestLogMixin, viewsets.ViewSet):
+    """
+    Full-text search across materials, subjects and job postings.
+
+    Backed by the inverted index in resources.search (SQLite FTS5 or
+    PostgreSQL tsvector/GIN), ranked by relevance with titles weighted
+    above descriptions.
+
+    Endpoints:
+    - GET /search/?q=anatomy - Search everything
+    - GET /search/?q=anat&type=material - Search one kind (prefix match on the last word)
+    - GET /search/?q=staff nurse&type=recruitment&limit=5
+
+    Query Parameters:
+    - q: Search text (required)
+    - type: material, subject or recruitment (may be repeated)
+    - limit: Maximum number of results (default 20, max 100)
+
+    Response Format:
+    [
+        {
+            "type": "material",
+            "score": 3.271,
+            "object": { ...SubjectMaterialSerializer fields... }
+        },
+        {
+            "type": "subject",
+            "score": 1.902,
+            "object": { ...SubjectSerializer fields... }
+        }
+    ]
+    """
+    default_limit = 20
+    max_limit = 100
+    # Not "q": search text is user input and may contain personal data
+    log_params = ("type", "limit")
+
+    def list(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "This query parameter is required."})
+
+        kinds = request.query_params.getlist("type") or None
+        known = {kind.name for kind in registered_kinds()}
+        if kinds and not set(kinds) <= known:
+            raise ValidationError({"type": f"Choose from: {', '.join(sorted(known))}."})
+
+        try:
+            limit = min(int(request.query_params.get("limit", self.default_limit)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+
+        return Response(search(text, kinds=kinds, limit=max(limit, 1), context={"request": request}))
+
+
+class HasMetricsToken(BasePermission):
+    """Allows operator tooling that sends the /metrics token (rguHub.metrics)."""
+
+    def has_permission(self, request, view):
+        return has_metrics_token(request)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser | HasMetricsToken])
+def cache_stats(request):
+    """
+    Report response cache statistics for this worker process.
+
+    Endpoint:
+    - GET /cache-stats/ (staff users, or `Authorization: Bearer <METRICS_TOKEN>`)
+
+    Response Format:
+    {
+        "hits": 120,
+        "misses": 14,
+        "stores": 14,
+        "skipped": 0,
+        "invalidations": 3,
+        "hit_ratio": 0.8955
+    }
+    """
+    return vary_on_accept(Response(response_cache.stats()))
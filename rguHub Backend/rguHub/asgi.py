@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rguHub.settings')
+# The async list views (resources/async_views.py) stay opt-in: set
+# API_ASYNC_VIEWS=1 only where `manage.py benchmark_asgi` shows a gain
 
 application = get_asgi_application()
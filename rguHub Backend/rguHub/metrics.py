@@ -0,0 +1,378 @@
+"""
+RGU Hub Backend - Request Metrics
+
+Per-endpoint request metrics, exposed in Prometheus text format at /metrics.
+
+Recorded per resolved view name (e.g. "material-list") and HTTP method:
+- rguhub_http_requests_total: Requests by status code (counter)
+- rguhub_http_request_duration_seconds: Time until the response is returned
+  (histogram; for streaming responses this is time to first byte)
+- rguhub_http_request_db_queries: Database queries per request (histogram)
+- rguhub_http_request_db_duration_seconds: Database time per request (histogram)
+- rguhub_http_response_size_bytes: Response body size (histogram; streaming
+  responses are counted when they declare a Content-Length)
+
+Overhead:
+Each request does a few perf_counter() calls, one context variable lookup
+per query and one locked dict update. Nothing is written to the database
+or the network.
+
+Sync and async requests:
+MetricsMiddleware works in both WSGI and ASGI stacks without a thread hop.
+Queries are timed by an execute_wrapper installed on every database
+connection when it opens; it reports to the timer of the request in the
+current context, which sync_to_async carries into the threads that run
+the ORM for async views (resources.async_views).
+
+Multiple worker processes:
+When settings.METRICS_DIR is set, every process writes its totals to its own
+file in that directory (atomically, at most every METRICS_FLUSH_INTERVAL
+seconds and at exit), and /metrics sums all files plus the live totals of
+the serving process. Counters and histograms are cumulative, so totals of
+exited workers keep counting. Without METRICS_DIR, /metrics reports the
+serving process only.
+
+Components Overview:
+- MetricsRegistry: Thread-safe counters and histograms
+- MetricsMiddleware: Records request metrics (add it first in MIDDLEWARE)
+- metrics_view: Prometheus text exposition (/metrics)
+- has_metrics_token: Whether a request carries METRICS_TOKEN
+
+Settings:
+- METRICS_ENABLED: Turn recording on/off (default True)
+- METRICS_DIR: Shared directory for multi-process aggregation (optional)
+- METRICS_FLUSH_INTERVAL: Seconds between per-process flushes (default 5)
+- METRICS_TOKEN: Token scrapers send as `Authorization: Bearer <token>`;
+  /metrics answers 403 to every request until it is set
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+PREFIX = "rguhub_http_"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = {
+    "requests_total": ("counter", "Requests by view, method and status code", None),
+    "request_duration_seconds": ("histogram", "Request latency in seconds", DURATION_BUCKETS),
+    "request_db_queries": ("histogram", "Database queries per request", QUERY_BUCKETS),
+    "request_db_duration_seconds": ("histogram", "Database time per request in seconds", DURATION_BUCKETS),
+    "response_size_bytes": ("histogram", "Response body size in bytes", SIZE_BUCKETS),
+}
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms keyed by `(metric, labels)`.
+
+    `labels` is a tuple of `(name, value)` pairs. Histogram values are
+    `[per-bucket counts (+Inf last), sum, count]`; bucket counts are not
+    cumulative until exposition.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        index = bisect.bisect_left(buckets, value)
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def snapshot(self):
+        """Return a JSON-serializable copy of all values."""
+        with self._lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [
+                    [name, list(labels), list(counts), total, count]
+                    for (name, labels), (counts, total, count) in self._histograms.items()
+                ],
+            }
+
+
+def merge_snapshots(snapshots):
+    """Sum several snapshots into `(counters, histograms)` dicts."""
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get("counters", ()):
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, counts, total, count in snapshot.get("histograms", ()):
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [[0] * len(counts), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus(counters, histograms):
+    """Render merged values in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric, (kind, help_text, buckets) in METRICS.items():
+        full_name = PREFIX + metric
+        source = counters if kind == "counter" else histograms
+        series = sorted((labels, value) for (name, labels), value in source.items() if name == metric)
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        for labels, value in series:
+            if kind == "counter":
+                lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f"{full_name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{full_name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{full_name}_count{_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+class ProcessStore:
+    """Per-process snapshot files in METRICS_DIR, for multi-worker aggregation."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.pid = os.getpid()
+        # pid alone could be reused by a later worker and overwrite its totals
+        self.path = self.directory / f"metrics-{self.pid}-{uuid.uuid4().hex[:8]}.json"
+        self.last_flush = 0.0
+
+    def flush(self, registry):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(registry.snapshot()))
+        os.replace(tmp, self.path)
+        self.last_flush = time.monotonic()
+
+    def flush_if_due(self, registry, interval):
+        if time.monotonic() - self.last_flush >= interval:
+            self.flush(registry)
+
+    def other_snapshots(self):
+        for path in self.directory.glob("metrics-*.json"):
+            if path == self.path:
+                continue
+            try:
+                yield json.loads(path.read_text())
+            except (OSError, ValueError):
+                # Vanished or half-written by a crashed process
+                continue
+
+
+registry = MetricsRegistry()
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return this process's ProcessStore, or None without METRICS_DIR."""
+    global _store
+    directory = getattr(settings, "METRICS_DIR", None)
+    if not directory:
+        return None
+    with _store_lock:
+        if _store is None or _store.pid != os.getpid() or _store.directory != Path(directory):
+            if _store is not None and _store.pid != os.getpid():
+                # Forked worker: the parent's totals are already in the parent's file
+                registry.reset()
+            _store = ProcessStore(directory)
+    return _store
+
+
+@atexit.register
+def _flush_at_exit():
+    store = _store
+    if store is not None and store.pid == os.getpid():
+        try:
+            store.flush(registry)
+        except OSError:
+            pass
+
+
+class _QueryTimer:
+    """execute_wrapper counting queries and their total time."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+_request_timer = ContextVar("rguhub_query_timer", default=None)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    timer = _request_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(connection):
+    """Time `connection`'s queries for the request being measured, if any."""
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+def _install_on_connect(sender, connection, **kwargs):
+    install_query_timer(connection)
+
+
+connection_created.connect(_install_on_connect, dispatch_uid="rguhub.metrics.install_query_timer")
+
+
+class MetricsMiddleware:
+    """
+    Record latency, database and response metrics per view and method.
+
+    Place it first in MIDDLEWARE so the measured time covers the whole
+    middleware stack. Runs natively in sync (WSGI) and async (ASGI) stacks.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "METRICS_ENABLED", True)
+        self.flush_interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported
+        for alias in connections:
+            install_query_timer(connections[alias])
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        timer = _QueryTimer()
+        token = _request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        timer = _QueryTimer()
+        token = _request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    def record(self, request, response, duration, timer):
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name or match.route) if match else "<unresolved>"
+        labels = (("view", view), ("method", request.method))
+        registry.inc("requests_total", labels + (("status", str(response.status_code)),))
+        registry.observe("request_duration_seconds", labels, duration)
+        registry.observe("request_db_queries", labels, timer.count)
+        registry.observe("request_db_duration_seconds", labels, timer.seconds)
+        if not response.streaming:
+            registry.observe("response_size_bytes", labels, len(response.content))
+        elif response.has_header("Content-Length"):
+            registry.observe("response_size_bytes", labels, int(response["Content-Length"]))
+
+        store = get_store()
+        if store is not None:
+            store.flush_if_due(registry, self.flush_interval)
+
+
+def has_metrics_token(request):
+    """Whether the request sends `Authorization: Bearer <METRICS_TOKEN>` (never without a token)."""
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if not token:
+        return False
+    return constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint: totals of all worker processes."""
+    if not has_metrics_token(request):
+        return HttpResponseForbidden("Invalid or unconfigured metrics token (METRICS_TOKEN)")
+
+    snapshots = [registry.snapshot()]
+    store = get_store()
+    if store is not None:
+        snapshots.extend(store.other_snapshots())
+    counters, histograms = merge_snapshots(snapshots)
+    return HttpResponse(
+        render_prometheus(counters, histograms),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -12,11 +12,15 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 
+from .db import api_cache_from_env, databases_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -57,10 +61,54 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',    
     ],
-    
+    # Alternative formats (resources.renderers): ?format=compact, plus
+    # ?format=orjson and msgpack when those (optional) packages are installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        *(['resources.renderers.ORJSONRenderer'] if find_spec('orjson') else []),
+        *(['resources.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+        'resources.renderers.CompactJSONRenderer',
+    ],
 }
 
+# Keep serving unpaginated arrays to clients that send neither `cursor` nor
+# `page_size` on cursor-paginated endpoints (/materials/, /recruitments/).
+# Set to False once the frontend consumes paginated responses everywhere.
+API_PAGINATION_COMPAT = True
+
+# Build /materials/ and /recruitments/ list responses from values_list() rows
+# instead of model instances (resources.rows). The output is identical.
+API_FAST_LISTS = True
+
+# Rows fetched and rendered per chunk for streamed exports (`?stream=1`)
+API_STREAM_CHUNK_SIZE = 2000
+
+# Serve the /materials/, /subjects/, /recruitments/ and /latest-updates/ lists
+# from async views with the async ORM (resources/async_views.py). Off by default,
+# also under ASGI (rguHub/asgi.py): set API_ASYNC_VIEWS=1 only where
+# `manage.py benchmark_asgi` shows a gain. WSGI deployments keep the sync viewsets.
+API_ASYNC_VIEWS = os.environ.get('API_ASYNC_VIEWS', '').lower() in ('1', 'true', 'yes', 'on')
+
+# gzip/Brotli response compression (resources.compression). Bodies below the
+# first size are sent uncompressed; larger bodies use lower levels to save CPU.
+# Brotli is used when the `brotli` package is installed.
+API_COMPRESSION_ENABLED = True
+API_COMPRESSION_LEVELS = [
+    # (minimum body size in bytes, gzip level, brotli quality)
+    (1024, 6, 5),
+    (256 * 1024, 5, 4),
+    (4 * 1024 * 1024, 4, 3),
+]
+API_COMPRESSION_VIEW_LEVELS = {}  # per view name, e.g. {'material-list': [(512, 6, 5)]}
+
 MIDDLEWARE = [
+    # First, so request metrics cover the whole middleware stack
+    'rguHub.metrics.MetricsMiddleware',
+    # Before anything that reads or changes the body (resources.compression)
+    'resources.compression.CompressionMiddleware',
+    # Replica selection and read-after-write pinning (rguHub/db.py)
+    'rguHub.db.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -95,14 +143,93 @@ WSGI_APPLICATION = 'rguHub.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
-
-DATABASES = {
+# SQLite by default. Set DATABASE_URL (and optionally DATABASE_REPLICA_URLS)
+# for PostgreSQL with persistent connections and read replicas; see
+# rguHub/db.py for every variable.
+
+DATABASES = databases_from_env(os.environ, BASE_DIR)
+DATABASE_ROUTERS = ['rguHub.db.PrimaryReplicaRouter']
+
+# Reads stay on the primary this long after a write (replica lag budget)
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DATABASE_REPLICA_PIN_SECONDS', '5'))
+DATABASE_PRIMARY_COOKIE = 'rguhub_primary'
+
+# SQLite mode for single-node deployments: WAL journaling, synchronous=NORMAL,
+# busy timeouts and a larger page cache on every connection. Set SQLITE_PRAGMAS
+# to override rguHub.db.SQLITE_TUNED_PRAGMAS. Write transactions begin with
+# BEGIN IMMEDIATE (rguHub/sqlite/base.py) unless SQLITE_IMMEDIATE_TRANSACTIONS is off.
+DATABASE_SQLITE_TUNED = os.environ.get('DATABASE_SQLITE_TUNED', '').lower() in ('1', 'true', 'yes', 'on')
+SQLITE_PRAGMAS = None
+SQLITE_IMMEDIATE_TRANSACTIONS = True
+
+
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The "api" cache holds rendered list responses and their generation counters
+# (see resources/caching.py). Several worker processes need a shared backend
+# so invalidations reach every worker: set API_CACHE_URL (redis://... or
+# memcached://...), which the DATABASE_URL profile requires; see rguHub/db.py.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': api_cache_from_env(os.environ),
+}
+
+API_CACHE_ENABLED = True
+API_CACHE_ALIAS = 'api'
+API_CACHE_TIMEOUT = 3600
+API_CACHE_MAX_BODY_BYTES = 2 * 1024 * 1024
+
+
+# Static JSON export of the public API for CDN/edge serving
+# (`python manage.py export_static_api <directory>`, resources/static_export.py).
+# Host name used for absolute links in the exported responses.
+STATIC_EXPORT_HOST = os.environ.get('STATIC_EXPORT_HOST', 'localhost')
+
+
+# Request metrics, exposed in Prometheus format at /metrics (rguHub/metrics.py).
+# With several worker processes, point METRICS_DIR at a directory shared by
+# all of them (e.g. a tmpfs) so /metrics reports the totals of every worker.
+# Scrapers authenticate with `Authorization: Bearer $METRICS_TOKEN`; without a
+# token /metrics is closed.
+
+METRICS_ENABLED = True
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
+
+# Structured API request logs (resources/request_log.py): one line per sampled
+# request on the "rguhub.api" logger, at INFO (the default API_LOG_LEVEL). Set
+# API_LOG_LEVEL=WARNING to turn them off, or API_LOG_LEVEL=DEBUG to also log the
+# generated SQL of filtered subject listings. Test runs (TEST_RUNNER) switch the
+# request lines off unless API_LOG_LEVEL is set.
+
+API_LOG_SAMPLE_RATE = float(os.environ.get('API_LOG_SAMPLE_RATE', '1.0'))
+API_LOG_SAMPLE_RATES = {}  # per view name, e.g. {'material-list': 0.1}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'resources.request_log.JsonFormatter'},
+    },
+    'handlers': {
+        'api': {'class': 'logging.StreamHandler', 'formatter': 'json'},
+    },
+    'loggers': {
+        'rguhub.api': {
+            'handlers': ['api'],
+            'level': os.environ.get('API_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
 }
 
+TEST_RUNNER = 'rguHub.test_runner.QuietApiLogRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -152,6 +279,13 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
+# Storage for SubjectMaterial files. Use 'resources.storage.LocalMaterialStorage'
+# to keep uploads on the local filesystem (offline development and tests).
+MATERIAL_STORAGE = 'resources.storage.MaterialCloudinaryStorage'
+
+# Number of resolved material delivery URLs memoized per process
+MATERIAL_URL_CACHE_SIZE = 4096
+
 CLOUDINARY_STORAGE = {
     "CLOUD_NAME": "dny4c1xm1",
     "API_KEY": "197496735553518",
@@ -0,0 +1,45 @@
+"""
+RGU Hub Backend - SQLite Database Backend
+
+django.db.backends.sqlite3 with write transactions that take SQLite's write
+lock when they begin (BEGIN IMMEDIATE) in the SQLite mode (rguHub.db).
+
+Why:
+Django begins transactions with a plain (DEFERRED) BEGIN. A transaction
+that reads before it writes, like an admin save or a model save() that
+checks related rows first, then has to upgrade its read lock when it
+writes. If another connection committed in between (WAL) or holds the
+write lock, SQLite fails the upgrade with SQLITE_BUSY ("database is
+locked") straight away: waiting could deadlock, so busy_timeout does not
+apply. BEGIN IMMEDIATE takes the write lock up front, where waiting is
+safe, so concurrent writers queue for busy_timeout instead of failing.
+
+Django runs in autocommit mode, so only atomic blocks start transactions;
+reads outside them are unaffected. Transactions begin with a plain BEGIN,
+as in Django, when DATABASE_SQLITE_TUNED or SQLITE_IMMEDIATE_TRANSACTIONS
+is off. Compare both with `python manage.py benchmark_sqlite_concurrency`.
+
+Settings:
+- SQLITE_IMMEDIATE_TRANSACTIONS: Begin with BEGIN IMMEDIATE in the SQLite
+  mode (default True)
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+def immediate_transactions():
+    return getattr(settings, "DATABASE_SQLITE_TUNED", False) and getattr(
+        settings, "SQLITE_IMMEDIATE_TRANSACTIONS", True
+    )
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        if immediate_transactions():
+            self.cursor().execute("BEGIN IMMEDIATE")
+        else:
+            super()._start_transaction_under_autocommit()
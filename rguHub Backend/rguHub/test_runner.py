@@ -0,0 +1,23 @@
+"""
+RGU Hub Backend - Test Runner
+
+Django's test runner with the per-request API log lines switched off, so a
+test run does not print one JSON line per request. Tests that check the
+logs use assertLogs(), which enables the logger for its block. Set
+API_LOG_LEVEL to keep the configured level while testing.
+
+Author: RGU Hub Development Team
+Last Updated: 2025
+"""
+
+import logging
+import os
+
+from django.test.runner import DiscoverRunner
+
+
+class QuietApiLogRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        if "API_LOG_LEVEL" not in os.environ:
+            logging.getLogger("rguhub.api").setLevel(logging.WARNING)
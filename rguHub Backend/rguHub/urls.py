@@ -6,8 +6,9 @@ It includes URL patterns from all Django apps and the admin interface.
 
 URL Patterns:
 - /admin/ - Django admin interface
-- / - Resources app URLs (materials, subjects, material-types)
+- / - Resources app URLs (materials, subjects, material-types, catalog, search)
 - / - Recruitment app URLs (recruitments, latest-updates)
+- /metrics - Prometheus request metrics (see rguHub/metrics.py)
 
 Complete API Endpoints:
 - GET /materials/ - List all study materials
@@ -17,9 +18,12 @@ Complete API Endpoints:
 - GET /subjects/?course=BSCN - Filter subjects by program
 - GET /subjects/?course=BSCN&sem=1 - Filter by program and semester
 - GET /material-types/ - List all material types
+- GET /catalog/ - Program/Syllabus/Term/Subject tree with material counts
+- GET /search/?q=anatomy - Full-text search across materials, subjects and jobs
 - GET /recruitments/ - List all job postings
 - GET /recruitments/?program=BSCN - Filter jobs by program
 - GET /latest-updates/ - Get recent materials and jobs
+- GET /metrics - Per-endpoint latency, query count and response size metrics
 
 Admin Interface:
 - /admin/ - Django admin for managing data
@@ -31,9 +35,14 @@ Last Updated: 2025
 from django.contrib import admin
 from django.urls import path, include
 
+from .metrics import metrics_view
+
 urlpatterns = [
     # Django admin interface
     path('admin/', admin.site.urls),
+
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
     
     # Resources app URLs (materials, subjects, material-types)
     path('', include('resources.urls')),      